@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Throughput of queue.Queue against RingBuffer, one consumer thread draining N producer threads.
+
+    python benchmarks/bench_channel.py [n_messages] [n_producers]
+"""
+from queue import Queue, Empty
+import threading
+import time
+import sys
+
+from jtrader.core.common.channel import RingBuffer
+
+
+def _run(put, consume, n_messages, n_producers):
+    per_producer = n_messages // n_producers
+
+    def produce():
+        for i in range(per_producer):
+            put(i)
+
+    producers = [threading.Thread(target=produce) for _ in range(n_producers)]
+    consumer = threading.Thread(target=consume, args=(per_producer * n_producers,))
+    start = time.perf_counter()
+    consumer.start()
+    for thread in producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    consumer.join()
+    return per_producer * n_producers / (time.perf_counter() - start)
+
+
+def bench_queue(n_messages, n_producers):
+    queue = Queue()
+
+    def consume(total):
+        for _ in range(total):
+            queue.get()
+
+    return _run(queue.put, consume, n_messages, n_producers)
+
+
+def bench_queue_batched(n_messages, n_producers):
+    # the way Mailbox drains a Queue: block for one message, then get_nowait
+    queue = Queue()
+
+    def consume(total):
+        received = 0
+        while received < total:
+            queue.get()
+            received += 1
+            try:
+                while True:
+                    queue.get_nowait()
+                    received += 1
+            except Empty:
+                pass
+
+    return _run(queue.put, consume, n_messages, n_producers)
+
+
+def bench_ring(n_messages, n_producers, batch_size, **kwargs):
+    channel = RingBuffer(multi_producer=n_producers > 1, **kwargs)
+
+    def consume(total):
+        received = 0
+        while received < total:
+            received += len(channel.get_many(batch_size))
+
+    return _run(channel.put, consume, n_messages, n_producers)
+
+
+def bench_ring_put_many(n_messages, n_producers, batch_size, **kwargs):
+    channel = RingBuffer(multi_producer=n_producers > 1, **kwargs)
+    chunk = list(range(batch_size))
+
+    def put(i):
+        if i % batch_size == 0:
+            channel.put_many(chunk)
+
+    def consume(total):
+        received = 0
+        while received < total:
+            received += len(channel.get_many(batch_size))
+
+    return _run(put, consume, n_messages, n_producers)
+
+
+def main(n_messages=500000, n_producers=1):
+    cases = [
+        ('queue.Queue get', lambda: bench_queue(n_messages, n_producers)),
+        ('queue.Queue batched', lambda: bench_queue_batched(n_messages, n_producers)),
+        ('RingBuffer block', lambda: bench_ring(n_messages, n_producers, 64, wait_strategy='block')),
+        ('RingBuffer spin', lambda: bench_ring(n_messages, n_producers, 64, wait_strategy='spin')),
+        ('RingBuffer put_many', lambda: bench_ring_put_many(n_messages, n_producers, 64)),
+    ]
+    print('{} messages, {} producer(s)'.format(n_messages, n_producers))
+    for name, case in cases:
+        print('{:<24}{:>14,.0f} msgs/sec'.format(name, case()))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
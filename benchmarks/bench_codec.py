@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Binary codec against pickle on a batch of events: encode, decode into objects, and decode_array which
+views the buffer as a numpy structured array. Decoded objects are checked against the encoded ones first,
+depth books included with a non-default depth.
+
+    python benchmarks/bench_codec.py [n_objects]
+"""
+import pickle
+import time
+import sys
+
+import numpy as np
+
+from jtrader.datatype import BarData, OrderData, ArrayDepthData, EnumOrderDirection, CODEC
+
+
+def best_time(func, repeat=3):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def depth(i, n_depth=10):
+    data = ArrayDepthData.with_depth(n_depth, symbol='BTCUSDT.BNC')
+    data.book[:] = i + np.arange(4 * n_depth).reshape(2, 2, n_depth)
+    return data
+
+
+def check(data_list):
+    for data, decoded in zip(data_list, CODEC.decode_many(CODEC.encode_many(data_list))):
+        for name in CODEC.schema(type(data)).field_names:
+            value, other = getattr(data, name), getattr(decoded, name)
+            if isinstance(value, np.ndarray):
+                assert value.shape == other.shape and np.array_equal(value, other), name
+            else:
+                assert value == other, name
+
+
+def main(n_objects=100000):
+    sample_dict = {
+        BarData: [BarData(symbol='BTCUSDT.BNC', frequency='1m', open=i, high=i, low=i, close=i, volume=i)
+                  for i in range(n_objects)],
+        OrderData: [OrderData(symbol='BTCUSDT.BNC', price=i, volume=1.0, direction=EnumOrderDirection.SELL)
+                    for i in range(n_objects)],
+        ArrayDepthData: [depth(i) for i in range(n_objects)],
+    }
+    check([data_list[0] for data_list in sample_dict.values()] + [depth(0, 5), depth(0, 1)])
+    print('{:<16}{:>8}{:>12}{:>12}{:>12}{:>14}'.format(
+        'class', 'format', 'bytes/obj', 'encode s', 'decode s', 'as array s'))
+    for cls, data_list in sample_dict.items():
+        pickled = pickle.dumps(data_list, protocol=pickle.HIGHEST_PROTOCOL)
+        print('{:<16}{:>8}{:>12.0f}{:>12.3f}{:>12.3f}{:>14}'.format(
+            cls.__name__, 'pickle', len(pickled) / n_objects,
+            best_time(lambda: pickle.dumps(data_list, protocol=pickle.HIGHEST_PROTOCOL)),
+            best_time(lambda: pickle.loads(pickled)), '-'))
+        encoded = CODEC.encode_many(data_list)
+        print('{:<16}{:>8}{:>12.0f}{:>12.3f}{:>12.3f}{:>14.6f}'.format(
+            cls.__name__, 'codec', len(encoded) / n_objects,
+            best_time(lambda: CODEC.encode_many(data_list)),
+            best_time(lambda: CODEC.decode_many(encoded)),
+            best_time(lambda: CODEC.decode_array(encoded, cls))))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
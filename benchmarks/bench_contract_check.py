@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compiled contract rules against the per order check they replace (a new OrderData per check_notional,
+pd.isna in floor/round and f-strings for the debug logs of rejected orders).
+
+per order: check_notional of every order of the basket, legacy or through ContractRule.validate_values.
+basket: CONTRACTS.check_orders over the whole basket, as FactorStrategy rebalances do.
+
+    python benchmarks/bench_contract_check.py [n_contracts] [basket_size]
+"""
+import logging
+import time
+import sys
+
+import numpy as np
+import pandas as pd
+
+from jtrader.core.common import logger
+from jtrader.datatype import ContractData, OrderData, CONTRACTS
+
+
+def best_time(func, repeat=5):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def legacy_contract_check(order):
+    contract = order.contract
+    volume = order.volume = OrderData.floor(order.volume, contract.lot_size)
+    price = order.price = OrderData.round(order.price, contract.tick_size)
+    notional = abs(volume) * price if contract.contract_type == 'spot' else abs(volume)
+    if abs(volume) < contract.min_quantity:
+        logger.debug(f'Order volume {volume} not reach the min requirement {contract.min_quantity}')
+        return False
+    if notional < contract.min_notional:
+        logger.debug(f'Order notional {notional} not reach the min requirement {contract.min_notional}')
+        return False
+    if abs(volume) > contract.max_quantity:
+        logger.debug(f'Order volume {volume} break the max requirement {contract.max_quantity}')
+        return False
+    if notional > contract.max_notional:
+        logger.debug(f'Order notional {notional} break the max requirement {contract.max_notional}')
+        return False
+    if price < contract.min_price:
+        logger.debug(f'Order price {price} not reach the min requirement {contract.min_price}')
+        return False
+    return True
+
+
+def legacy_check_notional(symbol, price, volume):
+    order = OrderData()
+    order.symbol = symbol
+    order.price = price
+    order.volume = volume
+    return legacy_contract_check(order)
+
+
+def compiled_check_notional(symbol, price, volume):
+    return not CONTRACTS.rule(symbol).validate_values(price, volume)
+
+
+def main(n_contracts=3000, basket_size=50):
+    logger.setLevel(logging.INFO)
+    ContractData.reset_contracts(pd.DataFrame({
+        'symbol': ['S%dUSDT.BNC' % i for i in range(n_contracts)], 'exchange': 'BNC', 'contract_type': 'spot',
+        'lot_size': 0.001, 'tick_size': 0.01, 'min_notional': 10.0, 'asset_quote': 'USDT.BNC',
+    }))
+    rng = np.random.default_rng(0)
+    n_orders = 100000
+    symbols = ['S%dUSDT.BNC' % i for i in rng.integers(0, n_contracts, n_orders)]
+    prices = rng.uniform(1, 100, n_orders).tolist()
+    # about half of the orders rejected for their notional
+    volumes = rng.uniform(0, 0.5, n_orders).tolist()
+
+    legacy = [legacy_check_notional(*values) for values in zip(symbols, prices, volumes)]
+    compiled = [compiled_check_notional(*values) for values in zip(symbols, prices, volumes)]
+    basket = CONTRACTS.check_orders(symbols, prices, volumes).mask.tolist()
+    print('rejected {:.0%}, orders checked differently: compiled {}, basket {}'.format(
+        1 - np.mean(compiled), sum(a != b for a, b in zip(legacy, compiled)),
+        sum(a != b for a, b in zip(compiled, basket))))
+
+    def per_order(check):
+        def run():
+            for values in zip(symbols, prices, volumes):
+                check(*values)
+        return run
+
+    def baskets():
+        for start in range(0, n_orders, basket_size):
+            end = start + basket_size
+            CONTRACTS.check_orders(symbols[start:end], prices[start:end], volumes[start:end])
+
+    print()
+    print('{:<26}{:>12}'.format('check', 'ns/order'))
+    for name, func in (('legacy check_notional', per_order(legacy_check_notional)),
+                       ('compiled check_notional', per_order(compiled_check_notional)),
+                       ('basket of %d' % basket_size, baskets),
+                       ('basket of %d' % n_orders, lambda: CONTRACTS.check_orders(symbols, prices, volumes))):
+        print('{:<26}{:>12.1f}'.format(name, best_time(func) * 1e9 / n_orders))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
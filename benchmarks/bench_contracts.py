@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Contract loading at startup and bulk order rounding, the contract registry against what it replaces.
+
+startup: rows (read_csv, a dict per row, from_dict per contract, as ContractData.reset_contracts did), csv
+(read_csv then the columnar from_df) and cache (the binary cache written by CONTRACTS.save), each filling
+the registry.
+
+rounding: OrderData.round/floor per order against CONTRACTS.round_prices/floor_volumes over symbol ids.
+
+    python benchmarks/bench_contracts.py [n_contracts] [n_orders]
+"""
+import tempfile
+import time
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+from jtrader.datatype import ContractData, OrderData, CONTRACTS
+
+
+def best_time(func, repeat=3):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def load_rows(csv_path):
+    contract_list = [ContractData.from_dict(doc) for doc in pd.read_csv(csv_path, index_col=False).to_dict('records')]
+    CONTRACTS.update(contract_list)
+
+
+def main(n_contracts=3000, n_orders=100000):
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'contracts.csv')
+        cache_path = os.path.join(directory, 'contracts.bin')
+        pd.DataFrame({
+            'symbol': ['S%dUSDT.BNC' % i for i in range(n_contracts)], 'exchange': 'BNC', 'contract_type': 'spot',
+            'lot_size': 0.001, 'tick_size': 0.01, 'min_notional': 10.0, 'asset_quote': 'USDT.BNC',
+        }).to_csv(csv_path, index=False)
+        CONTRACTS.configure({'csv_path': csv_path, 'cache_path': cache_path})
+        CONTRACTS.load(force_csv=True)
+
+        print('{:<10}{:>12}'.format('startup', 'ms'))
+        for name, func in (('rows', lambda: load_rows(csv_path)),
+                           ('csv', CONTRACTS.load_csv),
+                           ('cache', CONTRACTS.load_cache)):
+            def run():
+                CONTRACTS.clear()
+                func()
+                assert len(CONTRACTS) == n_contracts
+            print('{:<10}{:>12.2f}'.format(name, best_time(run) * 1e3))
+        print('cache file {:.0f} KB'.format(os.path.getsize(cache_path) / 1024))
+
+    rng = np.random.default_rng(0)
+    symbols = ['S%dUSDT.BNC' % i for i in rng.integers(0, n_contracts, n_orders)]
+    prices = rng.uniform(1, 100, n_orders)
+    volumes = rng.uniform(0, 10, n_orders)
+
+    def per_order():
+        get_contract = ContractData.get_contract
+        for symbol, price, volume in zip(symbols, prices.tolist(), volumes.tolist()):
+            contract = get_contract(symbol)
+            OrderData.round(price, contract.tick_size)
+            OrderData.floor(volume, contract.lot_size)
+
+    symbol_ids = CONTRACTS.symbol_ids(symbols)
+
+    def vectorized():
+        CONTRACTS.round_prices(symbol_ids, prices)
+        CONTRACTS.floor_volumes(symbol_ids, volumes)
+
+    print()
+    print('{:<22}{:>12}'.format('rounding', 'ns/order'))
+    for name, func in (('per order', per_order),
+                       ('vectorized', vectorized),
+                       ('vectorized + ids', lambda: (CONTRACTS.symbol_ids(symbols), vectorized()))):
+        print('{:<22}{:>12.1f}'.format(name, best_time(func) * 1e9 / n_orders))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
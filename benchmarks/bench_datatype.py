@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Memory and construction/copy time of the slotted event dataclasses against __dict__ based replicas,
+built from the same fields with the standard dataclass decorator (the layout before slots).
+
+    python benchmarks/bench_datatype.py [n_objects]
+"""
+import dataclasses
+import tracemalloc
+import timeit
+import copy
+import sys
+
+from jtrader.datatype import BarData, DepthData, OrderData, TradeData
+
+
+def dict_replica(cls):
+    field_list = []
+    for f in dataclasses.fields(cls):
+        if f.default_factory is not dataclasses.MISSING:
+            field_list.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            field_list.append((f.name, f.type, dataclasses.field(default=f.default)))
+    return dataclasses.make_dataclass(cls.__name__, field_list)
+
+
+def memory_per_object(cls, n_objects):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [cls() for _ in range(n_objects)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del objects
+    return size / n_objects
+
+
+def time_per_call(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+
+def main(n_objects=100000):
+    print('{:<12}{:>8}{:>14}{:>14}{:>14}'.format('class', 'layout', 'bytes/object', 'new ns', 'copy ns'))
+    for cls in (BarData, DepthData, OrderData, TradeData):
+        for layout, klass in (('dict', dict_replica(cls)), ('slots', cls)):
+            instance = klass()
+            print('{:<12}{:>8}{:>14.0f}{:>14.0f}{:>14.0f}'.format(
+                cls.__name__, layout,
+                memory_per_object(klass, n_objects),
+                time_per_call(klass, n_objects),
+                time_per_call(lambda: copy.copy(instance), n_objects),
+            ))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Fixed point prices and volumes against the float arithmetic they replace.
+
+drift: values already on the grid of their tick or lot size that floor/round do not give back unchanged, the
+float division of the former OrderData.floor/round against FixedPoint.
+matching: CrossMatcher.on_bar over resting limit orders that do not cross, float prices against integer ticks.
+
+    python benchmarks/bench_fixed_point.py [n_values] [n_orders]
+"""
+import random
+import time
+import sys
+
+import pandas as pd
+
+from jtrader.core.common import logger
+from jtrader.datatype import BarData, ContractData, OrderData, EnumOrderDirection
+from jtrader.broker.gateway.simulate_gateway.matcher import CrossMatcher
+
+
+def best_time(func, repeat=5):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def legacy_floor(value, decimal_size):
+    return int(value / decimal_size) * decimal_size
+
+
+def legacy_round(value, decimal_size):
+    return int((value + decimal_size / 2.0) / decimal_size) * decimal_size
+
+
+def main(n_values=100000, n_orders=1000):
+    rng = random.Random(0)
+    values = []
+    for _ in range(n_values):
+        decimals = rng.choice([1, 2, 3, 4, 5, 8])
+        values.append((round(rng.uniform(0, 1000), decimals), 10.0 ** -decimals))
+
+    print('{:<10}{:>12}{:>12}{:>12}'.format('drift', 'values', 'float', 'fixed'))
+    for name, legacy, fixed in (('floor', legacy_floor, OrderData.floor), ('round', legacy_round, OrderData.round)):
+        print('{:<10}{:>12}{:>12}{:>12}'.format(
+            name, n_values, sum(legacy(value, size) != value for value, size in values),
+            sum(fixed(value, size) != value for value, size in values)))
+
+    logger.setLevel('INFO')
+    ContractData.reset_contracts(pd.DataFrame({
+        'symbol': ['BTCUSDT.BNC'], 'exchange': 'BNC', 'contract_type': 'spot', 'lot_size': 0.001,
+        'tick_size': 0.01, 'asset_quote': 'USDT.BNC',
+    }))
+    bar = BarData(symbol='BTCUSDT.BNC', frequency='1m', open=100.0, high=101.0, low=99.0, close=100.0)
+
+    print()
+    print('{:<10}{:>12}'.format('matching', 'ns/order'))
+    for fixed_point in (False, True):
+        matcher = CrossMatcher()
+        matcher.configure({'fixed_point': fixed_point})
+        matcher.callback = lambda data: None
+        for i in range(n_orders):
+            buy = i % 2 == 0
+            # resting buys under the low, sells above the high
+            price = round(rng.uniform(90, 98.99) if buy else rng.uniform(101.01, 110), 2)
+            direction = EnumOrderDirection.BUY if buy else EnumOrderDirection.SELL
+            matcher.match_order(OrderData(symbol='BTCUSDT.BNC', price=price, volume=1.0, direction=direction))
+
+        def run():
+            for _ in range(100):
+                matcher.on_bar(bar)
+        print('{:<10}{:>12.1f}'.format('fixed' if fixed_point else 'float', best_time(run) * 1e9 / n_orders / 100))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
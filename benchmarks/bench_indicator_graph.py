@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Indicator DAG computed by IndicatorGraph against the recursive notify/update calls it replaces, per tick.
+
+The DAG: SMA and EMA of the close, their spread, an SMA and a StdDev of the spread, MACD of the close and ATR
+of high, low and close appended together. computes is the number of _perform_computations calls per tick.
+
+    python benchmarks/bench_indicator_graph.py [n_ticks]
+"""
+import time
+import sys
+
+import numpy as np
+
+from jtrader.server.feed.line import Line
+from jtrader.server.feed.indicator import *
+
+
+def best_time(func, repeat=3):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+class Spread(StreamingIndicator):
+    def __init__(self, line, other, period=10):
+        super(Spread, self).__init__([line, other], 1, period)
+
+    def _on_values(self, value, other):
+        return value - other
+
+
+def build():
+    high, low, close = Line(100), Line(100), Line(100)
+    spread = Spread(SMA(close, 10), EMA(close, 20))
+    outputs = [StdDev(SMA(spread, 5), 20), MACD(close), ATR(high, low, close, 14)]
+    return (high, low, close), outputs
+
+
+def main(n_ticks=20000):
+    rng = np.random.default_rng(0)
+    close = (100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_ticks)))).tolist()
+    ticks = [(i, value * 1.005, value * 0.995, value) for i, value in enumerate(close)]
+    n_computes = [0]
+    perform = StreamingIndicator._perform_computations
+
+    def counted(self):
+        n_computes[0] += 1
+        perform(self)
+
+    def run_with(use_graph):
+        def run():
+            (high, low, close_line), outputs = build()
+            if use_graph:
+                graph = IndicatorGraph(outputs)
+                for i, h, l, c in ticks:
+                    with graph.batch():
+                        high.append((i, h))
+                        low.append((i, l))
+                        close_line.append((i, c))
+            else:
+                for i, h, l, c in ticks:
+                    high.append((i, h))
+                    low.append((i, l))
+                    close_line.append((i, c))
+        return run
+
+    print('{:<12}{:>12}{:>12}'.format('runtime', 'ns/tick', 'computes'))
+    for name, use_graph in (('notify', False), ('graph', True)):
+        elapsed = best_time(run_with(use_graph))
+        StreamingIndicator._perform_computations = counted
+        n_computes[0] = 0
+        run_with(use_graph)()
+        StreamingIndicator._perform_computations = perform
+        print('{:<12}{:>12.1f}{:>12.2f}'.format(name, elapsed * 1e9 / n_ticks, n_computes[0] / n_ticks))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
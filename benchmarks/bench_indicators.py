@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Streaming indicators against the batch recomputation they replace, per new value of the input line.
+
+batch: the former SMA (np.mean of the deque turned into a list) and MaxDrawback (np.fmax.accumulate over the
+window), recomputed on every value.
+streaming: each indicator of jtrader.server.feed.indicator alone on a line, O(1) per value.
+
+    python benchmarks/bench_indicators.py [n_values] [time_window]
+"""
+import time
+import sys
+
+import numpy as np
+
+from jtrader.server.feed.line import Line
+from jtrader.server.feed.indicator import *
+
+
+def best_time(func, repeat=3):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+class BatchSMA(Indicator):
+    def __init__(self, line: Line, time_window: int, period=10):
+        super(BatchSMA, self).__init__(period)
+        self._line = line
+        self._time_window = time_window
+        self.add_lines([line])
+
+    def update(self):
+        super(BatchSMA, self).update()
+        self._perform_computations()
+
+    def _perform_computations(self):
+        if len(self._line) >= self._time_window:
+            ma = np.mean(list(self._line.values)[-self._time_window:])
+            self.append((self._line.times[-1], ma))
+
+
+class BatchMaxDrawback(BatchSMA):
+    def _perform_computations(self):
+        if len(self._line) >= self._time_window:
+            array = np.array(self._line.values)[-self._time_window:]
+            max_array = np.fmax.accumulate(array)
+            md = min((array - max_array) / max_array)
+            self.append((self._line.times[-1], md))
+
+
+def main(n_values=20000, time_window=200):
+    rng = np.random.default_rng(0)
+    close = (100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_values)))).tolist()
+    high = [value * 1.005 for value in close]
+    low = [value * 0.995 for value in close]
+
+    def run_with(factory, n_lines=1):
+        def run():
+            lines = [Line(time_window * 2) for _ in range(n_lines)]
+            factory(*lines)
+            for i, values in enumerate(zip(high, low, close)):
+                for line, value in zip(lines, values[-n_lines:]):
+                    line.append((i, value))
+        return run
+
+    base = best_time(run_with(lambda line: None))
+    print('{:<16}{:>14}'.format('indicator', 'ns/value'))
+    for name, factory, n_lines in (
+            ('batch SMA', lambda line: BatchSMA(line, time_window), 1),
+            ('batch drawback', lambda line: BatchMaxDrawback(line, time_window), 1),
+            ('SMA', lambda line: SMA(line, time_window), 1),
+            ('EMA', lambda line: EMA(line, time_window), 1),
+            ('StdDev', lambda line: StdDev(line, time_window), 1),
+            ('RSI', lambda line: RSI(line, time_window), 1),
+            ('ATR', lambda high_line, low_line, close_line: ATR(high_line, low_line, close_line, time_window), 3),
+            ('MACD', lambda line: MACD(line), 1),
+            ('RollingMax', lambda line: RollingMax(line, time_window), 1),
+            ('MaxDrawback', lambda line: MaxDrawback(line, time_window), 1),
+    ):
+        # the appends to the input lines alone are left out
+        elapsed = best_time(run_with(factory, n_lines)) - base * n_lines
+        print('{:<16}{:>14.1f}'.format(name, elapsed * 1e9 / n_values))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
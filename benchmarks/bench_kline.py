@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+KLineManager ring buffers against the shifting arrays they replace (five numpy arrays shifted left by one
+element per bar, a deque of times), one manager per symbol as the FeedServer keeps them.
+
+on_bar: a bar for every symbol, per bar.
+read: the close view of every symbol and the mean of its last 20 closes, per symbol.
+to_df: the frame of every symbol after a new bar, then read again before the next bar, per symbol (the
+shifting manager refills one frame column by column on every call, as KLineManager.to_df did). read_only
+is the ring manager handing out read-only views instead of copies.
+
+    python benchmarks/bench_kline.py [size] [n_symbols] [n_rounds]
+"""
+from collections import deque
+import time
+import sys
+
+import numpy as np
+import pandas as pd
+
+from jtrader.datatype import BarData, NS_PER_MINUTE
+from jtrader.server.feed.line import KLineManager
+
+
+def best_time(func, repeat=3):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+class ShiftingKLineManager(object):
+
+    def __init__(self, size=100):
+        self.size = size
+        self._open_array = np.zeros(size)
+        self._high_array = np.zeros(size)
+        self._low_array = np.zeros(size)
+        self._close_array = np.zeros(size)
+        self._volume_array = np.zeros(size)
+        self._time_deque = deque(maxlen=size)
+        self._bar_df = pd.DataFrame(
+            0.0,
+            index=pd.date_range('2010-01-01', periods=size),
+            columns=['open', 'high', 'low', 'close', 'volume']
+        )
+
+    def on_bar(self, bar: BarData):
+        timestamp = bar.timestamp
+        if len(self._time_deque) > 0 and timestamp <= self._time_deque[-1]:
+            return
+
+        self._time_deque.append(timestamp)
+
+        self._open_array[:-1] = self._open_array[1:]
+        self._high_array[:-1] = self._high_array[1:]
+        self._low_array[:-1] = self._low_array[1:]
+        self._close_array[:-1] = self._close_array[1:]
+        self._volume_array[:-1] = self._volume_array[1:]
+
+        self._open_array[-1] = bar.open
+        self._high_array[-1] = bar.high
+        self._low_array[-1] = bar.low
+        self._close_array[-1] = bar.close
+        self._volume_array[-1] = bar.volume
+
+    @property
+    def close(self):
+        return self._close_array
+
+    @property
+    def time(self):
+        return self._time_deque
+
+    def fill(self, timestamps):
+        # full without shifting size times
+        self._time_deque.extend(timestamps)
+
+    def to_df(self):
+        self._bar_df['open'] = self._open_array
+        self._bar_df['high'] = self._high_array
+        self._bar_df['low'] = self._low_array
+        self._bar_df['close'] = self._close_array
+        self._bar_df['volume'] = self._volume_array
+        self._bar_df.index = pd.DatetimeIndex(
+            np.fromiter(self._time_deque, dtype=np.int64, count=len(self._time_deque)).view('datetime64[ns]'))
+        return self._bar_df
+
+
+def main(size=10000, n_symbols=500, n_rounds=20):
+    print('{:<12}{:>14}{:>14}{:>14}{:>14}'.format('kline', 'on_bar ns', 'read ns', 'to_df ns', 'again ns'))
+    for name, cls, kwargs in (('shifting', ShiftingKLineManager, {}), ('ring', KLineManager, {}),
+                              ('read_only', KLineManager, {'read_only': True})):
+        klines = [cls(size, **kwargs) for _ in range(n_symbols)]
+        bars = [BarData(symbol='S%d' % i, frequency='1m', open=1.0, high=1.0, low=1.0, close=1.0, volume=1.0)
+                for i in range(n_symbols)]
+        timestamp = [0]
+
+        def on_bar():
+            for _ in range(n_rounds):
+                timestamp[0] += NS_PER_MINUTE
+                for kline, bar in zip(klines, bars):
+                    bar.timestamp = timestamp[0]
+                    kline.on_bar(bar)
+
+        def read():
+            for kline in klines:
+                kline.close[-20:].mean()
+
+        def to_df():
+            if len(klines[0].time) < size:
+                for kline, bar in zip(klines, bars):
+                    if isinstance(kline, ShiftingKLineManager):
+                        kline.fill(range(timestamp[0] + NS_PER_MINUTE, timestamp[0] + NS_PER_MINUTE * (size + 1),
+                                         NS_PER_MINUTE))
+                    else:
+                        for i in range(1, size + 1):
+                            bar.timestamp = timestamp[0] + NS_PER_MINUTE * i
+                            kline.on_bar(bar)
+                timestamp[0] += NS_PER_MINUTE * size
+            timestamp[0] += NS_PER_MINUTE
+            for kline, bar in zip(klines, bars):
+                bar.timestamp = timestamp[0]
+                kline.on_bar(bar)
+            start = time.perf_counter()
+            for kline in klines:
+                kline.to_df()
+            return time.perf_counter() - start
+
+        def again():
+            for kline in klines:
+                kline.to_df()
+
+        print('{:<12}{:>14.1f}{:>14.1f}{:>14.1f}{:>14.1f}'.format(
+            name, best_time(on_bar) * 1e9 / n_rounds / n_symbols, best_time(read) * 1e9 / n_symbols,
+            min(to_df() for _ in range(3)) * 1e9 / n_symbols, best_time(again) * 1e9 / n_symbols))
+        del klines
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Line numpy ring buffers against the deques they replace.
+
+append: a new item, per item.
+to_array: the values of a full line as an array, a copy of the deque against a view of the buffer.
+tail: the last 20 values, the deque turned into a list then sliced against a view of the buffer.
+
+    python benchmarks/bench_line.py [period] [n_items]
+"""
+from collections import deque
+import time
+import sys
+
+import numpy as np
+
+from jtrader.core.common.template import LazyObject
+from jtrader.server.feed.line import Line
+
+
+def best_time(func, repeat=5):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+class DequeLine(LazyObject):
+
+    def __init__(self, period=None):
+        super(DequeLine, self).__init__()
+        self._values = deque(maxlen=period)
+        self._times = deque(maxlen=period)
+
+    def append(self, item):
+        t, v = item
+        if len(self._times) and t == self._times[-1]:
+            self._times[-1] = t
+            self._values[-1] = v
+        else:
+            self._times.append(t)
+            self._values.append(v)
+            self.notify()
+
+    def to_array(self):
+        return np.array(self._values)
+
+    def tail(self, k):
+        return list(self._values)[-k:]
+
+
+def main(period=1000, n_items=100000):
+    items = [(i, float(i)) for i in range(n_items)]
+    print('{:<10}{:>12}{:>12}{:>12}'.format('line', 'append ns', 'to_array ns', 'tail ns'))
+    for name, cls in (('deque', DequeLine), ('ring', Line)):
+        line = cls(period)
+
+        def append():
+            for item in items:
+                line.append(item)
+
+        def to_array():
+            for _ in range(1000):
+                line.to_array()
+
+        def tail():
+            for _ in range(1000):
+                line.tail(20)
+
+        print('{:<10}{:>12.1f}{:>12.1f}{:>12.1f}'.format(
+            name, best_time(append) * 1e9 / n_items, best_time(to_array) * 1e6, best_time(tail) * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Frozen snapshots against copy per hop on the gateway-to-strategy path: allocated blocks and time per event.
+
+market: the gateway parses into one bar per symbol and publishes it to n subscribers keeping the latest bar.
+Before, the gateway copied it and a subscriber keeping it had to copy again as events were mutable; now the
+gateway publishes one snapshot which the broker freezes and every subscriber shares.
+
+order update: before, the exchange stream cloned the local order and copied it again before publishing, and
+the strategy copied orders it did not create; now the clone is published and kept by the data engine and the
+strategy alike.
+
+blocks/event counts the memory blocks still held by subscribers per event.
+
+    python benchmarks/bench_snapshot.py [n_events] [n_subscribers]
+"""
+import copy
+import gc
+import time
+import sys
+
+from jtrader.datatype import BarData, OrderData, EnumOrderStatus
+
+
+def legacy_market(bar, subscribers):
+    event = copy.copy(bar)
+    for keep in subscribers:
+        keep(copy.copy(event))
+
+
+def snapshot_market(bar, subscribers):
+    event = bar.snapshot().freeze()
+    for keep in subscribers:
+        keep(event)
+
+
+def legacy_order_update(order, engine, strategy):
+    update = order.copy()
+    update.status = EnumOrderStatus.PENDING
+    event = copy.copy(update)
+    engine(event)
+    strategy(copy.copy(event))
+
+
+def snapshot_order_update(order, engine, strategy):
+    event = order.evolve(status=EnumOrderStatus.PENDING).freeze()
+    engine(event)
+    strategy(event)
+
+
+def measure(func, args, kept, n_events):
+    # subscribers keep every event, so the blocks left after the run are the objects allocated per event
+    gc.disable()
+    try:
+        n_blocks = sys.getallocatedblocks()
+        for _ in range(n_events):
+            func(*args)
+        blocks_per_event = (sys.getallocatedblocks() - n_blocks) / n_events
+    finally:
+        gc.enable()
+    for event_list in kept:
+        event_list.clear()
+
+    start = time.perf_counter()
+    for _ in range(n_events):
+        func(*args)
+    elapsed = time.perf_counter() - start
+    for event_list in kept:
+        event_list.clear()
+    return blocks_per_event, elapsed * 1e9 / n_events
+
+
+def main(n_events=100000, n_subscribers=4):
+    bar = BarData(symbol='BTCUSDT.BNC', frequency='1m', open=1.0, high=1.0, low=1.0, close=1.0, volume=1.0)
+    order = OrderData(symbol='BTCUSDT.BNC', price=1.0, volume=1.0)
+    kept = [[] for _ in range(n_subscribers)]
+    subscribers = [event_list.append for event_list in kept]
+
+    print('{:<14}{:<10}{:>16}{:>12}'.format('path', 'model', 'blocks/event', 'ns/event'))
+    for path, model, func, args in (
+            ('market', 'copy', legacy_market, (bar, subscribers)),
+            ('market', 'snapshot', snapshot_market, (bar, subscribers)),
+            ('order update', 'copy', legacy_order_update, (order, subscribers[0], subscribers[-1])),
+            ('order update', 'snapshot', snapshot_order_update, (order, subscribers[0], subscribers[-1])),
+    ):
+        blocks_per_event, ns = measure(func, args, kept, n_events)
+        print('{:<14}{:<10}{:>16.2f}{:>12.0f}'.format(path, model, blocks_per_event, ns))
+
+    print()
+    frozen = bar.snapshot()
+    for name, func in (('copy', lambda: copy.copy(bar)), ('snapshot', bar.snapshot),
+                       ('snapshot of frozen', frozen.snapshot), ('evolve', frozen.evolve)):
+        start = time.perf_counter()
+        for _ in range(n_events):
+            func()
+        print('{:<20}{:>10.0f} ns'.format(name, (time.perf_counter() - start) * 1e9 / n_events))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Integer nanosecond timestamps against the datetimes they replace, per event.
+
+stamp: the default time of a new event, datetime.utcnow against now_ns.
+parse: exchange times, pd.to_datetime of ISO strings and utcfromtimestamp of milliseconds against iso_to_ns and
+ms_to_ns.
+compare: the settle time of a bar and the due time checks of the backtest and the algorithms.
+
+    python benchmarks/bench_timestamps.py [n_events]
+"""
+import datetime as dt
+import time
+import sys
+
+import pandas as pd
+
+from jtrader.datatype import BarData, TIME_INTERVAL_MAP, now_ns, iso_to_ns, ms_to_ns, to_ns
+
+
+def best_time(func, repeat=5):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def main(n_events=10000):
+    iso_list = [pd.Timestamp(1609459200123000000 + i * 1000000).isoformat()[:23] + 'Z' for i in range(n_events)]
+    ms_list = [1609459200123 + i for i in range(n_events)]
+    bar = BarData(symbol='BTCUSDT.BNC', frequency='1m', timestamp=ms_to_ns(ms_list[0]))
+    bar_time = bar.datetime
+    interval = TIME_INTERVAL_MAP[bar.frequency]
+    due_time, due_timestamp = bar_time, bar.timestamp
+    assert all(to_ns(pd.to_datetime(text)) == iso_to_ns(text) for text in iso_list[:1000])
+
+    def repeated(func):
+        def run():
+            for _ in range(n_events):
+                func()
+        return run
+
+    def each(func, values):
+        def run():
+            for value in values:
+                func(value)
+        return run
+
+    print('{:<10}{:<26}{:>12}{:>12}{:>10}'.format('op', '', 'datetime ns', 'int ns', 'speedup'))
+    for op, name, legacy, fast in (
+            ('stamp', 'utcnow / now_ns', repeated(dt.datetime.utcnow), repeated(now_ns)),
+            ('parse', 'iso', each(pd.to_datetime, iso_list), each(iso_to_ns, iso_list)),
+            ('parse', 'milliseconds', each(lambda ms: dt.datetime.utcfromtimestamp(ms / 1000.0), ms_list),
+             each(ms_to_ns, ms_list)),
+            ('compare', 'settle time', repeated(lambda: bar_time + interval), repeated(bar.settle_timestamp)),
+            ('compare', 'due time', repeated(lambda: bar_time >= due_time),
+             repeated(lambda: bar.timestamp >= due_timestamp)),
+    ):
+        legacy_time, fast_time = best_time(legacy), best_time(fast)
+        print('{:<10}{:<26}{:>12.1f}{:>12.1f}{:>10.1f}'.format(
+            op, name, legacy_time * 1e9 / n_events, fast_time * 1e9 / n_events, legacy_time / fast_time))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Columnar to_df/from_df against the row based conversion they replace (a dict per object through asdict,
+then a dict per row through DataFrame.to_dict('records')).
+
+    python benchmarks/bench_to_df.py [n_objects]
+"""
+from collections import OrderedDict
+import time
+import sys
+
+import pandas as pd
+
+from jtrader.datatype import BarData, OrderData, EnumOrderDirection, iso_to_ns
+
+
+def rows_to_df(data_list):
+    return pd.DataFrame([data.to_dict(OrderedDict) for data in data_list])
+
+
+def rows_from_df(cls, df):
+    return [cls.from_dict(record) for record in df.to_dict('records')]
+
+
+def best_time(func, repeat=3):
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def main(n_objects=100000):
+    now = iso_to_ns('2021-01-01T00:00:00Z')
+    sample_dict = {
+        BarData: [BarData(symbol='BTC/USDT', timestamp=now, frequency='1m', open=i, high=i, low=i, close=i, volume=i)
+                  for i in range(n_objects)],
+        OrderData: [OrderData(symbol='BTC/USDT', timestamp=now, price=i, volume=1.0,
+                              direction=EnumOrderDirection.BUY if i % 2 else EnumOrderDirection.SELL)
+                    for i in range(n_objects)],
+    }
+    print('{:<12}{:>10}{:>12}{:>12}{:>10}'.format('class', 'op', 'rows s', 'columns s', 'speedup'))
+    for cls, data_list in sample_dict.items():
+        df = cls.to_df(data_list)
+        for op, row_func, column_func in (
+                ('to_df', lambda: rows_to_df(data_list), lambda: cls.to_df(data_list)),
+                ('from_df', lambda: rows_from_df(cls, df), lambda: cls.from_df(df)),
+        ):
+            row_time = best_time(row_func)
+            column_time = best_time(column_func)
+            print('{:<12}{:>10}{:>12.3f}{:>12.3f}{:>9.1f}x'.format(
+                cls.__name__, op, row_time, column_time, row_time / column_time))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from jtrader.core.common import logger, LimitedQueryContext, Registered
+from jtrader.core.common import logger, LimitedQueryContext, Registered, TRACER, TraceStage
 from jtrader.datatype import *
 
 from ccxt.base.exchange import Exchange
@@ -11,7 +11,6 @@ import calendar
 import typing
 import numpy as np
 import pandas as pd
-import copy
 import datetime
 import requests
 from threading import Lock
@@ -34,13 +33,14 @@ class LocalOrderManager(object):
             if cli_id in self._order_dict:
                 self._order_dict[cli_id].on_order(order)
             else:
-                self._order_dict[cli_id] = order
+                # the manager keeps updating its order, it never holds one that is published
+                self._order_dict[cli_id] = order.evolve()
 
     def clone(self, cli_id):
         if cli_id in self._order_dict:
             with self._lock:
                 if cli_id in self._order_dict:
-                    return self._order_dict[cli_id].copy()
+                    return self._order_dict[cli_id].evolve()
 
     def purge(self):
         with self._lock:
@@ -147,7 +147,7 @@ class CcxtApi(Registered):
         exchange = self.FULL_NAME
         api_class = getattr(ccxt, exchange)
         self._exchange = api_class(config)
-        self.fetch_contract()
+        self.load_contracts()
 
         for symbol, contract in self.contracts.items():
             exchange_symbol = contract.symbol_exchange
@@ -158,7 +158,6 @@ class CcxtApi(Registered):
         self.throttle()
         self._local_order_manager.on_order(order)
 
-        order = copy.copy(order)
         contract = self._contracts[order.symbol]
         symbol_root = contract.symbol_root
         if params is None:
@@ -169,6 +168,8 @@ class CcxtApi(Registered):
                 price = None
 
             logger.debug('%s sending order %s', self, order.client_order_id)
+            if TRACER.enabled:
+                TRACER.complete(order, TraceStage.GATEWAY_SEND)
             data = self._exchange.create_order(symbol_root,
                                                self.ORDER_TYPE_MAP[order.order_type],
                                                self.DIRECTION_MAP[order.direction],
@@ -223,6 +224,8 @@ class CcxtApi(Registered):
         symbol_root = contract.symbol_root
         logger.debug('%s cancel order %s', self, order_cancel.client_order_id)
         try:
+            if TRACER.enabled:
+                TRACER.complete(order_cancel, TraceStage.GATEWAY_SEND)
             self._exchange.cancel_order(order_id, symbol_root)
             logger.debug('%s canceled order %s successfully', self, order_cancel.client_order_id)
             order_cancel.status = EnumOrderStatus.CANCELLED
@@ -245,7 +248,7 @@ class CcxtApi(Registered):
         symbol_root = self.contracts[symbol].symbol_root
         order_id = order.order_id
         data = self._exchange.fetch_order(order_id, symbol_root)
-        order_status = copy.copy(order)
+        order_status = order.evolve()
 
         order_status.status = self.STATUS_MAP_REVERSE[data['status']]
         order_status.executed_volume = data['filled']
@@ -273,7 +276,7 @@ class CcxtApi(Registered):
         trade.direction = self.DIRECTION_MAP_RESERVE[data['side']]
         trade.commission = data['fee']['cost']
         trade.commission_asset = '.'.join([data['fee']['currency'], self.TAG])
-        trade.datetime = datetime.datetime.utcfromtimestamp(data['timestamp'] / 1000.0)
+        trade.timestamp = ms_to_ns(data['timestamp'])
         return trade
 
     def fetch_my_trades(self, symbol, since=DEFAULT_START_TIME, params=None):
@@ -326,7 +329,7 @@ class CcxtApi(Registered):
                 order = OrderData()
                 order.order_id = order_id
                 order.symbol = self._root_symbol_dict[data['symbol']]
-                order.datetime = datetime.datetime.utcfromtimestamp(data['timestamp'] / 1000.0)
+                order.timestamp = ms_to_ns(data['timestamp'])
                 order.volume = data['amount']
                 order.executed_volume = data['filled']
                 order.executed_notional = data['cost']
@@ -420,10 +423,7 @@ class CcxtApi(Registered):
             if return_df:
                 return bar_df
 
-            ohlcv_records = bar_df.to_dict('records')
-            for record in ohlcv_records:
-                bar = BarData.from_dict(record)
-                bar_list.append(bar)
+            bar_list = BarData.from_df(bar_df)
         return bar_list
 
     def first_valid_date(self, symbol):
@@ -453,21 +453,30 @@ class CcxtApi(Registered):
         data = self._exchange.fetch_l2_order_book(symbol_root)
         depth = DepthData()
         depth.symbol = symbol
-        for n, bid in enumerate(data['bids'][:DepthData.N_DEPTH]):
-            depth.bid_prices[n] = bid[0]
-            depth.bid_volumes[n] = bid[1]
-
-        for n, ask in enumerate(data['asks'][:DepthData.N_DEPTH]):
-            depth.ask_prices[n] = ask[0]
-            depth.ask_volumes[n] = ask[1]
+        depth.set_levels(data['bids'], data['asks'])
 
         if data['timestamp']:
-            depth.datetime = datetime.datetime.utcfromtimestamp(data['timestamp'] / 1000)
+            depth.timestamp = ms_to_ns(data['timestamp'])
         else:
-            depth.datetime = datetime.datetime.utcnow()
+            depth.timestamp = now_ns()
         return depth
 
     # --------------------- contract information ---------------------
+    def load_contracts(self):
+        """
+        Contracts of the exchange from CONTRACTS while they are fresh, fetched from the exchange otherwise.
+        """
+        if not len(CONTRACTS):
+            CONTRACTS.load()
+        contract_dict = CONTRACTS.exchange_contracts(self.TAG)
+        if contract_dict:
+            self._contracts.update(contract_dict)
+            return
+        self.fetch_contract()
+        if self._contracts:
+            CONTRACTS.update(self._contracts.values())
+            CONTRACTS.save()
+
     def fetch_contract(self, return_df=False):
         # codes are removed
         pass
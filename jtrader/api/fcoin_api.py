@@ -1,6 +1,5 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-import datetime
 import time
 from jtrader.api.ccxt_api import CcxtApi
 from jtrader.datatype import *
@@ -57,7 +56,7 @@ class FCoinApi(CcxtApi):
 
             trade.commission = fee
             trade.commission_asset = fee_asset
-            trade.datetime = datetime.datetime.utcfromtimestamp(data['created_at'] / 1000.0)
+            trade.timestamp = ms_to_ns(data['created_at'])
             trade_list.append(trade)
         return trade_list
 
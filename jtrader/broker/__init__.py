@@ -5,6 +5,7 @@
 from .bt_broker import BackTestBroker
 from .paper_broker import PaperBroker
 from .real_broker import RealBroker
+from .async_broker import AsyncBroker
 from .broker import Broker, BrokerInterface
 
 
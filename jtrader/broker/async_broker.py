@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from collections import deque
+import asyncio
+import time
+
+from jtrader.core.common import logger, EventLoop, TRACER, TraceStage
+from jtrader.datatype import *
+from jtrader.broker.real_broker import RealBroker
+
+
+class AsyncBroker(RealBroker):
+    """
+    RealBroker driven by one asyncio event loop instead of an actor thread, an order executor and a timer thread.
+
+    Events sent from any thread are batched onto the loop and dispatched there, so strategy callbacks stay
+    synchronous and run on a single thread. Blocking REST calls run on the small executor of the loop and
+    gateways supporting it register their websocket reads on the loop.
+    """
+
+    TAG = 'async'
+    # callbacks stay on the loop thread
+    SHARDABLE = False
+
+    # dispatch at most this many events per loop iteration so timers and websocket reads are not starved
+    BATCH_SIZE = 256
+
+    def __init__(self):
+        super(AsyncBroker, self).__init__()
+        self._event_loop = EventLoop()
+        self._pending = deque()
+        self._drain_scheduled = False
+        self._timer_future = None
+
+    @property
+    def event_loop(self):
+        return self._event_loop
+
+    def configure(self, broker_config: dict):
+        loop_config = broker_config.get('event_loop')
+        if loop_config:
+            self._event_loop = EventLoop(**loop_config)
+        super(AsyncBroker, self).configure(broker_config)
+        for _, gateway in self._gateway_dict.items():
+            gateway.set_event_loop(self._event_loop)
+
+    def send(self, msg):
+        if TRACER.enabled:
+            TRACER.attach(msg, TraceStage.ENQUEUE)
+        self._pending.append(msg)
+        # the flag is cleared by _drain before it pops, so a message appended meanwhile is never stranded
+        if not self._drain_scheduled and self._event_loop.is_alive():
+            self._drain_scheduled = True
+            self._event_loop.call_soon(self._drain)
+
+    def _drain(self):
+        self._drain_scheduled = False
+        pending = self._pending
+        record = self._event_loop.record
+        for _ in range(min(len(pending), self.BATCH_SIZE)):
+            msg = pending.popleft()
+            start = time.perf_counter()
+            try:
+                self.handle_message(msg)
+            except Exception:
+                # already logged by dispatch, the loop keeps serving the gateways and the timer
+                pass
+            record('dispatch.' + msg.EVENT_TYPE.name, time.perf_counter() - start)
+        if pending and not self._drain_scheduled:
+            self._drain_scheduled = True
+            self._event_loop.call_soon(self._drain)
+
+    def _send_order_impl(self, order: OrderData):
+        self._event_loop.run_in_executor(self._process_order_request, order)
+
+    async def _run_timer(self):
+        timer = self._timer
+        while True:
+            start = time.perf_counter()
+            timer.run_pending()
+            self._event_loop.record('timer', time.perf_counter() - start)
+            await asyncio.sleep(timer.interval_time)
+
+    def query_mailbox(self):
+        stats = {'queued': len(self._pending)}
+        stats.update(self._event_loop.statistics())
+        return stats
+
+    def start(self):
+        self._event_loop.start()
+        self._drain_scheduled = True
+        self._event_loop.call_soon(self._drain)
+        for _, gateway in self._gateway_dict.items():
+            gateway.start()
+        self._timer_future = self._event_loop.submit(self._run_timer())
+        logger.debug('%s started', self.__class__.__name__)
+
+    def stop(self):
+        for _, gateway in self._gateway_dict.items():
+            gateway.stop()
+        if self._timer_future is not None:
+            self._timer_future.cancel()
+            self._timer_future = None
+        self._event_loop.stop()
+        self._drain_scheduled = False
+        logger.debug('%s stopped', self.__class__.__name__)
@@ -1,11 +1,14 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 from abc import abstractmethod
-import copy
-from jtrader.core.common import Subject, Registered, Actor
+import threading
+import typing
+
+from jtrader.core.common import Subject, Registered, Actor, Mailbox, MailboxFactory, TRACER, TraceStage
 from jtrader.core.common import logger
 from jtrader.datatype import *
 from jtrader.broker.oms import DataEngine
+from jtrader.broker.shard import BrokerShard, ShardTask
 from jtrader.server import DatabaseServer
 
 
@@ -25,6 +28,18 @@ class BrokerInterface(Subject):
 
 
 class Broker(Registered, Actor, BrokerInterface):
+    """
+    Actor dispatching events to the handlers registered for their topics.
+
+    With shards the broker thread still updates the DataEngine and saves the events, the handlers run on
+    shard threads instead: every handler of one subscriber (its ``id_``, the strategy id of a strategy and of
+    its algorithms) on the same shard, so the events of a subscriber keep their order. Events reach every
+    shard with a subscriber for them, heartbeats all of them; handlers without an owner run on shard 0.
+    Subscribers on different shards see events at their own pace.
+    """
+    MAILBOX_TYPE = Mailbox.TAG
+    # handlers may run on several threads, brokers calling the gateways on the dispatch thread can not shard
+    SHARDABLE = False
 
     def __init__(self):
         super(Broker, self).__init__()
@@ -39,6 +54,14 @@ class Broker(Registered, Actor, BrokerInterface):
         }
         self._data_engine = DataEngine()
         self._db_server: DatabaseServer = None
+        self.set_mailbox(self._create_mailbox())
+
+        self._shard_list: typing.List[BrokerShard] = []
+        # subscriber id -> shard index, topic -> (handlers, ((shard index, handlers of the shard), ...))
+        self._shard_dict: typing.Dict[str, int] = {}
+        self._route_dict: typing.Dict[typing.Hashable, tuple] = {}
+        # subscribers register from the shard threads too
+        self._handler_lock = threading.RLock()
 
     def save_data(self, data):
         self._db_server.save(data)
@@ -50,18 +73,33 @@ class Broker(Registered, Actor, BrokerInterface):
         event_type = msg.EVENT_TYPE
         if event_type in self._event_process_map:
             process_func = self._event_process_map[event_type]
+            # market and execution events are published read-only and shared by all subscribers as is,
+            # a handler wanting a modified event derives it with evolve()
+            msg.freeze()
         else:
             process_func = self._process_general_event
+        tracing = TRACER.enabled
+        if tracing:
+            previous_trace = TRACER.activate(msg, TraceStage.DISPATCH)
         try:
             process_func(msg)
         except Exception as e:
             logger.exception(e)
             logger.info(f'Error occurred when handling {msg}')
             raise e
+        finally:
+            if tracing:
+                TRACER.deactivate(previous_trace)
+        # every subscriber has seen the event, it is reused once none of them keeps it
+        POOLS.release(msg)
 
     def send_order(self, order: OrderData):
         logger.debug(f'{self} plan to send {order.pretty_string()}')
-        self._send_order_impl(copy.copy(order))
+        # the gateway owns and updates the order it sends, the caller keeps its own working order
+        order = order.evolve()
+        if TRACER.enabled:
+            TRACER.extend(order, TraceStage.ORDER_SEND)
+        self._send_order_impl(order)
 
     @abstractmethod
     def _send_order_impl(self, order: OrderData):
@@ -77,7 +115,146 @@ class Broker(Registered, Actor, BrokerInterface):
         return self._data_engine.query_data(name, query, columns)
 
     def configure(self, broker_config: dict):
-        pass
+        mailbox_config = broker_config.get('mailbox')
+        if mailbox_config:
+            self.set_mailbox(self._create_mailbox(mailbox_config))
+            logger.info('%s uses mailbox %s', self, self.mailbox)
+
+        contract_config = broker_config.get('contracts')
+        if contract_config:
+            # csv_path, cache_path and ttl (seconds) of the contract registry
+            CONTRACTS.configure(contract_config)
+
+        n_shards = broker_config.get('n_shards')
+        if n_shards:
+            # e.g. 4, with 'shard_assignment' {strategy_id: shard index} pinning some subscribers
+            self.set_shards(n_shards)
+            for id_, index in broker_config.get('shard_assignment', {}).items():
+                self.assign_shard(id_, index)
+            logger.info('%s dispatches to %d shards', self, self.n_shards)
+
+        pool_config = broker_config.get('pools')
+        if pool_config:
+            # e.g. {'DepthData': 1024, 'BarData': 256}, events gateways publish through POOLS.snapshot
+            POOLS.configure(pool_config)
+            logger.info('%s recycles events with %s', self, POOLS)
+
+    def _create_mailbox(self, mailbox_config: dict = None):
+        mailbox_config = dict(mailbox_config or {})
+        mailbox_type = mailbox_config.pop('mailbox_type', self.MAILBOX_TYPE)
+        return MailboxFactory(mailbox_type, **mailbox_config)
+
+    def query_mailbox(self):
+        statistics = self.mailbox.statistics()
+        for shard in self._shard_list:
+            for key, value in shard.mailbox.statistics().items():
+                statistics['%s.%s' % (shard.name, key)] = value
+        return statistics
+
+    # -------------------- shards --------------------------
+    @property
+    def n_shards(self):
+        return len(self._shard_list)
+
+    def set_shards(self, n_shards: int):
+        """
+        Run the handlers on n_shards threads, 0 or 1 runs them on the broker thread.
+        """
+        if self._thread.is_alive():
+            raise RuntimeError('Shards of %s can not be changed while running' % self)
+        if n_shards > 1 and not self.SHARDABLE:
+            raise ValueError('%s can not shard its dispatch' % self)
+        with self._handler_lock:
+            self._shard_list = [BrokerShard(self, index) for index in range(n_shards)] if n_shards > 1 else []
+            self._shard_dict = {'': 0}
+            self._route_dict = {}
+
+    def assign_shard(self, id_: str, index: int):
+        """
+        Pin the handlers of subscriber id_ to a shard, before the broker starts.
+        """
+        if not 0 <= index < len(self._shard_list):
+            raise ValueError('%s has no shard %d' % (self, index))
+        with self._handler_lock:
+            self._shard_dict[id_] = index
+            self._route_dict = {}
+
+    def _shard_of(self, handler) -> int:
+        # bound methods belong to their subscriber, other callables may carry an id_ of their own
+        id_ = getattr(getattr(handler, '__self__', handler), 'id_', '')
+        index = self._shard_dict.get(id_)
+        if index is None:
+            # round robin, in the order subscribers register
+            index = self._shard_dict[id_] = len(self._shard_dict) % len(self._shard_list)
+        return index
+
+    def _shard_routes(self, topic) -> tuple:
+        handlers = self._handler_dict.get(topic)
+        if handlers is None:
+            return ()
+        cached = self._route_dict.get(topic)
+        if cached is not None and cached[0] is handlers:
+            return cached[1]
+        with self._handler_lock:
+            handlers = self._handler_dict.get(topic, ())
+            index_dict = {}
+            for handler in handlers:
+                index_dict.setdefault(self._shard_of(handler), []).append(handler)
+            routes = tuple((index, tuple(shard_handlers)) for index, shard_handlers in index_dict.items())
+            if handlers:
+                self._route_dict[topic] = (handlers, routes)
+        return routes
+
+    def _route(self, topics, msg):
+        task_dict = {}
+        for topic in topics:
+            for index, handlers in self._shard_routes(topic):
+                routes = task_dict.get(index)
+                if routes is None:
+                    task_dict[index] = [(topic, handlers)]
+                else:
+                    routes.append((topic, handlers))
+        if task_dict:
+            trace = TRACER.current() if TRACER.enabled else None
+            shard_list = self._shard_list
+            for index, routes in task_dict.items():
+                shard_list[index].send(ShardTask(msg, routes, None if trace is None else trace.fork()))
+
+    def register(self, topic, handler):
+        with self._handler_lock:
+            super(Broker, self).register(topic, handler)
+            self._route_dict.pop(topic, None)
+
+    def unregister(self, topic, handler):
+        with self._handler_lock:
+            super(Broker, self).unregister(topic, handler)
+            self._route_dict.pop(topic, None)
+
+    def notify(self, topic, msg):
+        if self._shard_list:
+            return self._route((topic,), msg)
+        return super(Broker, self).notify(topic, msg)
+
+    def notify_many(self, topics, msg):
+        if self._shard_list:
+            return self._route(topics, msg)
+        return super(Broker, self).notify_many(topics, msg)
+
+    def start(self):
+        for shard in self._shard_list:
+            shard.start()
+        super(Broker, self).start()
+
+    def stop(self):
+        # the broker hands its queued events to the shards before they exit
+        super(Broker, self).stop()
+        for shard in self._shard_list:
+            shard.stop()
+
+    def send(self, msg):
+        if TRACER.enabled:
+            TRACER.attach(msg, TraceStage.ENQUEUE)
+        super(Broker, self).send(msg)
 
     # -------------------- process event --------------------------
     def _process_general_event(self, event: BaseData):
@@ -85,35 +262,38 @@ class Broker(Registered, Actor, BrokerInterface):
 
     def _process_bar_event(self, bar: BarData):
         self._data_engine.on_bar(bar)
-
-        symbol = bar.symbol
-        self.notify(bar.EVENT_TYPE, bar)
-        self.notify(bar.EVENT_TYPE + symbol, bar)
+        event_type = bar.EVENT_TYPE
+        self.notify_many((event_type, event_type + bar.symbol), bar)
 
     def _process_depth_event(self, depth: DepthData):
         self._data_engine.on_depth(depth)
-        symbol = depth.symbol
-        self.notify(depth.EVENT_TYPE, depth)
-        self.notify(depth.EVENT_TYPE + symbol, depth)
+        event_type = depth.EVENT_TYPE
+        self.notify_many((event_type, event_type + depth.symbol), depth)
 
     def _process_order_event(self, order: OrderData):
         self._data_engine.on_order_status(order)
         self.save_data(order)
-        self.notify(order.EVENT_TYPE, order)
-        self.notify(order.EVENT_TYPE + order.strategy_id, order)  # for strategy
-        self.notify(order.EVENT_TYPE + order.client_order_id, order)  # for algorithm
+        event_type = order.EVENT_TYPE
+        self.notify_many((
+            event_type,
+            event_type + order.strategy_id,  # for strategy
+            event_type.composite(order.client_order_id),  # for algorithm
+        ), order)
 
     def _process_trade_event(self, trade: TradeData):
         if self._data_engine.on_trade(trade):
             self.save_data(trade)
-            self.notify(trade.EVENT_TYPE, trade)
-            self.notify(trade.EVENT_TYPE + trade.strategy_id, trade)  # for strategy
-            self.notify(trade.EVENT_TYPE + trade.client_order_id, trade)  # for algorithm
+            event_type = trade.EVENT_TYPE
+            self.notify_many((
+                event_type,
+                event_type + trade.strategy_id,  # for strategy
+                event_type.composite(trade.client_order_id),  # for algorithm
+            ), trade)
 
     def _process_funding_event(self, funding: FundingData):
         self._data_engine.on_funding(funding)
-        self.notify(funding.EVENT_TYPE, funding)
-        self.notify(funding.EVENT_TYPE + funding.strategy_id, funding)
+        event_type = funding.EVENT_TYPE
+        self.notify_many((event_type, event_type + funding.strategy_id), funding)
 
     def _process_heartbeat_event(self, heartbeat: HeartBeatData):
         self.notify(heartbeat.EVENT_TYPE, heartbeat)
@@ -121,5 +301,5 @@ class Broker(Registered, Actor, BrokerInterface):
             self.notify(heartbeat.EVENT_TYPE + heartbeat.frequency, heartbeat)
 
     def _process_funding_rate_event(self, funding_rate: FundingRateData):
-        self.notify(funding_rate.EVENT_TYPE, funding_rate)
-        self.notify(funding_rate.EVENT_TYPE + funding_rate.symbol, funding_rate)
+        event_type = funding_rate.EVENT_TYPE
+        self.notify_many((event_type, event_type + funding_rate.symbol), funding_rate)
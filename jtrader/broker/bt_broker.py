@@ -1,7 +1,5 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-import datetime
-
 from jtrader.datatype import *
 from jtrader.broker.broker import Broker
 from jtrader.broker.gateway.simulate_gateway import SimulateGateway
@@ -38,28 +36,27 @@ class BackTestBroker(Broker):
         self._gateway.send_order(order)
 
     def start(self):
-        dt = datetime.datetime(1970, 1, 1)
+        timestamp = 0
         frequency = '1m'
         for event in self._event_list:
             if event.EVENT_TYPE == EnumEventType.BAR:
-                event_dt = event.settle_time()
+                event_timestamp = event.settle_timestamp()
                 frequency = event.frequency
             else:
-                event_dt = event.datetime
+                event_timestamp = event.timestamp
 
-            if event_dt > dt:
-                heartbeat = HeartBeatData(datetime=dt)
+            if event_timestamp > timestamp:
+                heartbeat = HeartBeatData(timestamp=timestamp)
                 heartbeat.frequency = frequency
                 self.handle_message(heartbeat)
 
-                dt = event_dt
-                heartbeat = HeartBeatData(datetime=dt)
+                timestamp = event_timestamp
+                heartbeat = HeartBeatData(timestamp=timestamp)
                 heartbeat.frequency = frequency
                 self.handle_message(heartbeat)
 
                 if frequency != '1m':
-                    heartbeat = heartbeat.copy()
-                    heartbeat.frequency = '1m'
+                    heartbeat = heartbeat.evolve(frequency='1m')
                     self.handle_message(heartbeat)
             self.handle_message(event)
 
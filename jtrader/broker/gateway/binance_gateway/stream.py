@@ -5,9 +5,7 @@ from jtrader.core.common import logger
 from binance.client import Client
 from binance.websockets import BinanceSocketManager
 import binance.enums
-import datetime
 import typing
-import copy
 
 STATUS_MAP_REVERSE = dict()
 STATUS_MAP_REVERSE['NEW'] = EnumOrderStatus.PENDING
@@ -20,6 +18,11 @@ STATUS_MAP_REVERSE['EXPIRED'] = EnumOrderStatus.ERROR
 
 class BinanceStream(AggregateWebsocketApi):
     TAG = ExchangeAbbr.BINANCE
+    DEPTH_MAP = {
+        5: binance.enums.WEBSOCKET_DEPTH_5,
+        10: binance.enums.WEBSOCKET_DEPTH_10,
+        20: binance.enums.WEBSOCKET_DEPTH_20,
+    }
 
     def __init__(self, api):
         super(BinanceStream, self).__init__(api)
@@ -31,25 +34,28 @@ class BinanceStream(AggregateWebsocketApi):
 
     def subscribe_depth(self, symbol):
         symbol_exchange = self.api.contracts[symbol].symbol_exchange
+        n_depth = self.get_n_depth(symbol) or DepthData.N_DEPTH
+        # the smallest partial book stream holding the levels subscribed
+        level = min([level for level in self.DEPTH_MAP if level >= n_depth] or [max(self.DEPTH_MAP)])
         self._socket_manager.start_depth_socket(symbol_exchange,
                                                 self._on_depth_impl(symbol),
-                                                binance.enums.WEBSOCKET_DEPTH_5)
+                                                self.DEPTH_MAP[level])
 
     def _on_bar_impl(self, symbol, frequency):
         bar = BarData()
         bar.symbol = symbol
         bar.frequency = frequency
-        bar.datetime = None
+        bar.timestamp = NAT
         self._bar_dict[(symbol, frequency)] = bar
 
         def callback(packet):
-            origin_dt = bar.datetime
+            origin_timestamp = bar.timestamp
             kline = packet['k']
-            dt = datetime.datetime.utcfromtimestamp(kline['t'] / 1000.0)
-            if origin_dt is not None and dt > origin_dt:
-                self.api.on_bar(copy.copy(bar))
+            timestamp = ms_to_ns(kline['t'])
+            if origin_timestamp != NAT and timestamp > origin_timestamp:
+                self.api.on_bar(POOLS.snapshot(bar))
             self._parse_bar(packet, bar)
-            bar.datetime = dt
+            bar.timestamp = timestamp
 
         return callback
 
@@ -62,15 +68,8 @@ class BinanceStream(AggregateWebsocketApi):
         bar.volume = float(kline['v'])
 
     def _parse_depth(self, packet, depth: DepthData):
-        depth.datetime = datetime.datetime.utcnow()
-        bids = packet['bids']
-        for index, (price, volume) in enumerate(bids[:DepthData.N_DEPTH]):
-            depth.bid_prices[index] = float(price)
-            depth.bid_volumes[index] = float(volume)
-        asks = packet['asks']
-        for index, (price, volume) in enumerate(asks[:DepthData.N_DEPTH]):
-            depth.ask_prices[index] = float(price)
-            depth.ask_volumes[index] = float(volume)
+        depth.timestamp = now_ns()
+        depth.set_levels(packet['bids'], packet['asks'])
 
     def start(self):
         self._socket_manager = BinanceSocketManager(Client(self.api.api_key, self.api.api_secret))
@@ -114,7 +113,7 @@ class BinanceStream(AggregateWebsocketApi):
                 trade.volume = float(data['l'])
                 trade.commission = float(data['n'])
                 trade.commission_asset = '.'.join((data['N'], self.TAG))
-                trade.datetime = datetime.datetime.utcfromtimestamp(data['E'] / 1000.0)
+                trade.timestamp = ms_to_ns(data['E'])
                 trade.strategy_id = order.strategy_id
                 trade.client_order_id = order.client_order_id
 
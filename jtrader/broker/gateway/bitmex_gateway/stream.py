@@ -1,10 +1,7 @@
 from jtrader.broker.gateway.websocket_api import AggregateWebsocketApi
-import copy
-import datetime
 import hashlib
 import hmac
 import time
-import pandas as pd
 import typing
 
 from jtrader.core.common.log import logger
@@ -47,9 +44,7 @@ class BitmexStream(AggregateWebsocketApi):
         self.send_packet(req)
 
     def subscribe_depth(self, symbol):
-        depth = DepthData()
-        depth.symbol = symbol
-        self._depth_dict[symbol] = depth
+        self._create_depth(symbol)
 
         symbol_exchange = self.api.contracts[symbol].symbol_exchange
         req = {"op": "subscribe", "args": ["orderBook10:%s" % symbol_exchange]}
@@ -77,29 +72,22 @@ class BitmexStream(AggregateWebsocketApi):
         self.send_packet(req)
 
     def _parse_depth(self, packet, depth: DepthData):
-        depth.datetime = datetime.datetime.utcnow()
-        bids = packet['bids']
-        for index, (price, volume) in enumerate(bids[:DepthData.N_DEPTH]):
-            depth.bid_prices[index] = price
-            depth.bid_volumes[index] = volume
-        asks = packet['asks']
-        for index, (price, volume) in enumerate(asks[:DepthData.N_DEPTH]):
-            depth.ask_prices[index] = price
-            depth.ask_volumes[index] = volume
+        depth.timestamp = now_ns()
+        depth.set_levels(packet['bids'], packet['asks'])
 
     def _on_depth(self, data):
         symbol_exchange = data['symbol']
         symbol = self.api.exchange_symbol_dict[symbol_exchange]
         depth = self._depth_dict[symbol]
         self._parse_depth(data, depth)
-        self.api.on_depth(copy.copy(depth))
+        self.api.on_depth(POOLS.snapshot(depth))
 
     def _on_funding_rate(self, data):
         symbol_exchange = data['symbol']
         symbol = self.api.exchange_symbol_dict[symbol_exchange]
         funding_rate = FundingRateData()
         funding_rate.symbol = symbol
-        funding_rate.datetime = pd.to_datetime(data['timestamp'])
+        funding_rate.timestamp = iso_to_ns(data['timestamp'])
         funding_rate.rate = data['fundingRate']
         self.api._callback(funding_rate)
 
@@ -109,14 +97,15 @@ class BitmexStream(AggregateWebsocketApi):
         bar.low = packet['low']
         bar.close = packet['close']
         bar.volume = packet['volume']
-        bar.datetime = pd.to_datetime(packet['timestamp']).replace(tzinfo=None) - TIME_INTERVAL_MAP[bar.frequency]
+        # bitmex stamps bars with their close time
+        bar.timestamp = iso_to_ns(packet['timestamp']) - INTERVAL_NS_MAP[bar.frequency]
 
     def _on_bar_impl2(self, frequency):
         def callback(data):
             symbol = self.api.exchange_symbol_dict[data['symbol']]
             bar = self._bar_dict[(symbol, frequency)]
             self._parse_bar(data, bar)
-            self.api.on_bar(copy.copy(bar))
+            self.api.on_bar(POOLS.snapshot(bar))
 
         return callback
 
@@ -155,7 +144,7 @@ class BitmexStream(AggregateWebsocketApi):
         trade.trade_id = trade_id
         trade.price = data['lastPx']
         trade.volume = data['lastQty']
-        trade.datetime = pd.to_datetime(data['timestamp'])
+        trade.timestamp = iso_to_ns(data['timestamp'])
         trade.commission = data['commission'] * trade.volume
         trade.commission_asset = self.api.contracts[trade.symbol].asset_quote
         logger.debug('%s receive: %s', self, trade)
@@ -171,13 +160,13 @@ class BitmexStream(AggregateWebsocketApi):
         order = self.api.oms.clone(cli_id)
         if order:
             order.order_id = data['orderID']
-            order.datetime = pd.to_datetime(data['timestamp'])
+            order.timestamp = iso_to_ns(data['timestamp'])
 
             order.executed_volume = data.get('cumQty', order.executed_volume)
             order.status = statusMapReverse.get(data['ordStatus'], EnumOrderType.NONE)
             logger.debug('%s receive: %s', self, order)
 
-            self.api.on_order(copy.copy(order))
+            self.api.on_order(order)
 
     def on_packet(self, data: dict):
         if 'table' in data:
@@ -24,17 +24,24 @@ class CcxtGateway(Gateway):
         symbol_list = gateway_config['symbol']
         frequency_list = gateway_config['frequency']
         depth_flag = gateway_config.get('depth_flag', True)
+        n_depth = gateway_config.get('n_depth')
 
         self.rest_api.set_callback(self.callback)
         self.rest_api.connect(api_key, api_secret)
         if symbol_list:
             if self.agg_ws_api is not None:
-                self.agg_ws_api.init(symbol_list, frequency_list, depth_flag)
+                self.agg_ws_api.init(symbol_list, frequency_list, depth_flag, n_depth)
             else:
-                self.market_ws_api.init(symbol_list, frequency_list, depth_flag)
+                self.market_ws_api.init(symbol_list, frequency_list, depth_flag, n_depth)
         if not api_key:
             self.trade_ws_api = None
 
+    def set_event_loop(self, event_loop):
+        for client in (self.rest_api, self.agg_ws_api, self.market_ws_api, self.trade_ws_api):
+            # ccxt based rest apis are plain blocking clients without loop support
+            if hasattr(client, 'set_event_loop'):
+                client.set_event_loop(event_loop)
+
     def send_order(self, order: OrderData):
         if order.status == EnumOrderStatus.NEW:
             self.rest_api.create_order(order)
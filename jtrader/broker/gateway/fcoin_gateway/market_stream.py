@@ -2,7 +2,6 @@ from jtrader.broker.gateway.websocket_api import MarketWebsocketApi
 from jtrader.datatype import *
 from jtrader.core.common import logger
 
-import datetime
 import time
 import websocket
 
@@ -58,17 +57,12 @@ class FCoinMarketStream(MarketWebsocketApi):
     def _parse_depth(self, packet, depth: DepthData):
         bids = packet['bids']
         asks = packet['asks']
-        depth.datetime = datetime.datetime.utcnow()
-        for index in range(DepthData.N_DEPTH):
-            depth.bid_prices[index] = bids[index * 2]
-            depth.bid_volumes[index] = bids[index * 2 + 1]
-
-            depth.ask_prices[index] = asks[index * 2]
-            depth.ask_volumes[index] = asks[index * 2 + 1]
+        depth.timestamp = now_ns()
+        # levels come flattened as price, volume, price, volume...
+        depth.set_levels(list(zip(bids[0::2], bids[1::2])), list(zip(asks[0::2], asks[1::2])))
 
     def _parse_bar(self, data, bar: BarData):
-        now = datetime.datetime.utcnow()
-        bar.datetime = self.round_dt(now, bar.frequency)
+        bar.timestamp = self.round_timestamp(now_ns(), bar.frequency)
         bar.open = data['open']
         bar.high = data['high']
         bar.low = data['low']
@@ -17,6 +17,12 @@ class Gateway(Registered):
     def configure(self, gateway_config: dict = None):
         pass
 
+    def set_event_loop(self, event_loop):
+        """
+        Hand the event loop of an AsyncBroker to the clients of the gateway, a no-op for thread-based gateways.
+        """
+        pass
+
     def start(self):
         pass
 
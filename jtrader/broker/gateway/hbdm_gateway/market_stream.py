@@ -3,7 +3,6 @@ from jtrader.broker.gateway.hbdm_gateway.base_stream import HBDMStreamMixin
 from jtrader.datatype import *
 from jtrader.core.common import logger
 
-import datetime
 import time
 
 CONTRACT_TYPE_MAP = {
@@ -62,27 +61,16 @@ class HBDMMarketStream(HBDMStreamMixin, MarketWebsocketApi):
         return ws_symbol
 
     def _parse_depth(self, packet, depth: DepthData):
-        dt = datetime.datetime.fromtimestamp(packet["ts"] / 1000)
-        depth.datetime = dt
+        depth.timestamp = ms_to_ns(packet["ts"])
         tick_data = packet["tick"]
         if "bids" not in tick_data or "asks" not in tick_data:
             print(packet)
             return
 
-        bids = tick_data["bids"]
-        for n in range(DepthData.N_DEPTH):
-            price, volume = bids[n]
-            depth.bid_prices[n] = price
-            depth.bid_volumes[n] = volume
-
-        asks = tick_data["asks"]
-        for n in range(DepthData.N_DEPTH):
-            price, volume = asks[n]
-            depth.ask_prices[n] = price
-            depth.ask_volumes[n] = volume
+        depth.set_levels(tick_data["bids"], tick_data["asks"])
 
     def _parse_bar(self, data, bar: BarData):
-        bar.datetime = datetime.datetime.fromtimestamp(data["ts"] / 1000)
+        bar.timestamp = ms_to_ns(data["ts"])
         tick_data = data["tick"]
         bar.open = tick_data['open']
         bar.high = tick_data['high']
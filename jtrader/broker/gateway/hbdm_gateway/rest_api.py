@@ -132,6 +132,7 @@ class HbdmRestApi(RestClient):
     def connect(self, api_key='', api_secret=''):
         self.api_key = api_key
         self.api_secret = api_secret
+        # always fetched, the contract types of symbol_type_map are not part of ContractData
         self.fetch_contract()
 
     def fetch_balance(self):
@@ -220,6 +221,8 @@ class HbdmRestApi(RestClient):
 
             self.symbol_type_map[contract.symbol] = d["contract_type"]
             self.contracts[contract.symbol] = contract
+        CONTRACTS.update(self.contracts.values())
+        CONTRACTS.save()
 
     def on_send_order(self, data, request):
         """"""
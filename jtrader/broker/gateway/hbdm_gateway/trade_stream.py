@@ -2,7 +2,6 @@ from jtrader.broker.gateway.websocket_api import TradeWebsocketApi
 from jtrader.datatype import *
 from jtrader.core.common import logger
 
-import datetime
 import time
 import websocket
 
@@ -35,7 +34,7 @@ class HBDMTradeStream(HBDMStreamMixin, TradeWebsocketApi):
 
     def on_order(self, data: dict):
         """"""
-        dt = datetime.datetime.fromtimestamp(data["created_at"] / 1000)
+        timestamp = ms_to_ns(data["created_at"])
         if data["client_order_id"]:
             client_order_id = data["client_order_id"]
         else:
@@ -43,7 +42,7 @@ class HBDMTradeStream(HBDMStreamMixin, TradeWebsocketApi):
 
         order = self.api.oms.clone(client_order_id)
         order.order_id = data["order_id"]
-        order.datetime = dt
+        order.timestamp = timestamp
         order.executed_volume = data["trade_volume"]
         order.executed_notional = data["trade_turnover"]
         order.status = STATUS_HBDM2VT[data["status"]]
@@ -55,10 +54,10 @@ class HBDMTradeStream(HBDMStreamMixin, TradeWebsocketApi):
             return
 
         for d in trades:
-            dt = datetime.datetime.fromtimestamp(d["created_at"] / 1000)
+            timestamp = ms_to_ns(d["created_at"])
             trade = TradeData.from_order(order)
             trade.trade_id = str(d["trade_id"])
-            trade.datetime = dt
+            trade.timestamp = timestamp
             trade.price = d["trade_price"]
             trade.volume = d["trade_volume"]
             self.api.on_trade(trade)
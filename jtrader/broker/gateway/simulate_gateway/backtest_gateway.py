@@ -18,6 +18,9 @@ class SimulateGateway(Gateway):
         self.slippage = 0.0
 
     def configure(self, gateway_config: dict = None):
+        if 'id_generator' in gateway_config:
+            # e.g. 'counter' so client order ids of a long backtest do not go through uuid1
+            set_id_generator(gateway_config['id_generator'])
         matcher_config = gateway_config['matcher']
         matcher_type = matcher_config['matcher_type']
         self._matcher = MatcherFactory(matcher_type)
@@ -5,7 +5,7 @@ from jtrader.broker.gateway.simulate_gateway.matcher.matcher import Matcher
 from jtrader.datatype import *
 from jtrader.core.common import logger
 
-from collections import defaultdict, OrderedDict
+from collections import OrderedDict
 import typing
 
 
@@ -13,18 +13,26 @@ class OrderContainer(object):
 
     def __init__(self):
         self._order_dict: typing.Dict[str, OrderData] = OrderedDict()
+        # the price each order is matched at, ticks in fixed point mode
+        self._price_dict: typing.Dict[str, typing.Union[float, int]] = {}
         self._count = 0
 
-    def add(self, order: OrderData):
+    def add(self, order: OrderData, price):
         if order.client_order_id not in self._order_dict:
             self._count += 1
             self._order_dict[order.client_order_id] = order
+            self._price_dict[order.client_order_id] = price
             logger.debug('order %s created in matcher', order.client_order_id)
 
     def remove_by_id(self, client_order_id):
         if client_order_id in self._order_dict:
             self._count -= 1
             self._order_dict.pop(client_order_id)
+            self._price_dict.pop(client_order_id)
+
+    def items(self):
+        # both dicts hold the same ids in the same order
+        return zip(self._order_dict.values(), self._price_dict.values())
 
     def is_empty(self):
         return self._count == 0
@@ -39,28 +47,41 @@ class CrossMatcher(Matcher):
 
     def __init__(self):
         super(CrossMatcher, self).__init__()
-        self._order_container_dict: typing.Dict[str, OrderContainer] = defaultdict(OrderContainer)
-
-    def _match_order(self, order: OrderData, buy_cross_price, sell_cross_price, buy_best_price, sell_best_price):
+        # indexed by symbol id
+        self._order_container_table: SymbolTable = SymbolTable(OrderContainer)
+
+    def _market_prices(self, symbol, buy_cross_price, sell_cross_price, buy_best_price, sell_best_price):
+        if self.fixed_point:
+            price_scale = CONTRACTS.rule(symbol).price_scale
+            # off grid cross prices are rounded so that no order fills that would not in float mode
+            return (price_scale.ceil(buy_cross_price), price_scale.floor(sell_cross_price),
+                    price_scale.round(buy_best_price), price_scale.round(sell_best_price))
+        return buy_cross_price, sell_cross_price, buy_best_price, sell_best_price
+
+    def _match_order(self, order: OrderData, price, buy_cross_price, sell_cross_price, buy_best_price,
+                     sell_best_price):
         direction = order.direction
         buy_cross = (direction == EnumOrderDirection.BUY and
-                     order.price >= buy_cross_price)
+                     price >= buy_cross_price)
 
         sell_cross = (direction == EnumOrderDirection.SELL and
-                      order.price <= sell_cross_price)
+                      price <= sell_cross_price)
 
         if buy_cross or sell_cross or order.order_type == EnumOrderType.MARKET:
             order.status = EnumOrderStatus.FILLED
             order.executed_volume = order.volume
-            order.order_id = generate_id()
+            order.order_id = self.id_generator()
 
             trade = TradeData.from_order(order)
-            trade.trade_id = generate_id()
+            trade.trade_id = self.id_generator()
 
             if direction == EnumOrderDirection.BUY:
-                trade.price = min(order.price, buy_best_price)
+                price = min(price, buy_best_price)
             else:
-                trade.price = max(order.price, sell_best_price)
+                price = max(price, sell_best_price)
+            if self.fixed_point:
+                price = CONTRACTS.rule(order.symbol).price_scale.to_float(price)
+            trade.price = price
 
             trade.commission = trade.price * trade.volume * self.fee_rate
             trade.commission_asset = trade.contract.asset_quote
@@ -72,30 +93,34 @@ class CrossMatcher(Matcher):
         return ''
 
     def on_bar(self, bar: BarData):
-        container = self._order_container_dict[bar.symbol]
+        container = self._order_container_table[bar.symbol_id]
         if not container.is_empty():
             buy_cross_price = bar.low  # 若买入方向限价单价格高于该价格，则会成交
             sell_cross_price = bar.high  # 若卖出方向限价单价格低于该价格，则会成交
             buy_best_price = bar.open  # 在当前时间点前发出的买入委托可能的最优成交价
             sell_best_price = bar.open  # 在当前时间点前发出的卖出委托可能的最优成交价
+            prices = self._market_prices(bar.symbol, buy_cross_price, sell_cross_price, buy_best_price,
+                                         sell_best_price)
             matcher_ids = []
-            for order in iter(container):
-                match_id = self._match_order(order, buy_cross_price, sell_cross_price, buy_best_price, sell_best_price)
+            for order, price in container.items():
+                match_id = self._match_order(order, price, *prices)
                 if match_id:
                     matcher_ids.append(match_id)
             for match_id in matcher_ids:
                 container.remove_by_id(match_id)
 
     def on_depth(self, depth: DepthData):
-        container = self._order_container_dict[depth.symbol]
+        container = self._order_container_table[depth.symbol_id]
         if not container.is_empty():
             buy_cross_price = depth.ask_prices[0]
             sell_cross_price = depth.bid_prices[0]
             buy_best_price = depth.ask_prices[0]
             sell_best_price = depth.bid_prices[0]
+            prices = self._market_prices(depth.symbol, buy_cross_price, sell_cross_price, buy_best_price,
+                                         sell_best_price)
             matcher_ids = []
-            for order in container:
-                match_id = self._match_order(order, buy_cross_price, sell_cross_price, buy_best_price, sell_best_price)
+            for order, price in container.items():
+                match_id = self._match_order(order, price, *prices)
                 if match_id:
                     matcher_ids.append(match_id)
             for match_id in matcher_ids:
@@ -103,13 +128,17 @@ class CrossMatcher(Matcher):
 
     def match_order(self, order: OrderData):
         if EnumOrderStatus.NEW == order.status:
-            self._order_container_dict[order.symbol].add(order)
+            price = order.price
+            if self.fixed_point:
+                price = CONTRACTS.rule(order.symbol).price_scale.round(price)
+            self._order_container_table[order.symbol_id].add(order, price)
             order.status = EnumOrderStatus.PENDING
-            order.order_id = generate_id()
-            self.callback(order)
+            order.order_id = self.id_generator()
+            # the container keeps filling its own order, a snapshot is published
+            self.callback(order.snapshot())
 
         elif EnumOrderStatus.CANCELLING == order.status:
-            self._order_container_dict[order.symbol].remove_by_id(order.client_order_id)
+            self._order_container_table[order.symbol_id].remove_by_id(order.client_order_id)
             order.status = EnumOrderStatus.CANCELLED
             self.callback(order)
             logger.debug('order %s cancelled', order.client_order_id)
@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from jtrader.datatype import OrderData, TradeData, EnumEventType, DepthData, BarData
+from jtrader.datatype import OrderData, TradeData, EnumEventType, DepthData, BarData, IdGenerator, IdGeneratorFactory
 from jtrader.core.common import Registered, Subject
 import typing
 
@@ -11,12 +11,18 @@ class Matcher(Registered):
         super(Matcher, self).__init__()
         self.fee_rate = 0.0
         self.slippage = 0.0
+        # match on integer ticks of the contracts instead of float prices
+        self.fixed_point = False
         self.callback: typing.Callable = print
+        # ids of simulated orders and trades only need to be unique within the backtest
+        self.id_generator: IdGenerator = IdGeneratorFactory('counter')
 
     def configure(self, matcher_config: dict):
         for key in matcher_config:
             if hasattr(self, key):
                 setattr(self, key, matcher_config[key])
+        if isinstance(self.id_generator, str):
+            self.id_generator = IdGeneratorFactory(self.id_generator)
             # else:
             #     logger.info("%s has no %s attribute predefined", self, key)
 
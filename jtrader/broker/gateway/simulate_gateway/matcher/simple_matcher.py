@@ -16,10 +16,10 @@ class SimpleMatcher(Matcher):
         if EnumOrderStatus.NEW == order.status:
             order.status = EnumOrderStatus.FILLED
             order.executed_volume = order.volume
-            order.order_id = generate_id()
+            order.order_id = self.id_generator()
 
             trade = TradeData.from_order(order)
-            trade.trade_id = generate_id()
+            trade.trade_id = self.id_generator()
 
             if trade.direction == EnumOrderDirection.BUY:
                 trade.price = trade.price * (1 + self.slippage)
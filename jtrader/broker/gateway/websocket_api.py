@@ -3,11 +3,9 @@
 import re
 import json
 import zlib
-import copy
-import datetime
 from abc import abstractmethod
 import typing
-from jtrader.core.common import logger, Registered
+from jtrader.core.common import logger, Registered, TRACER, TraceStage
 from jtrader.datatype import *
 from jtrader.core.tools.client import WebsocketClient
 from jtrader.api import CcxtApi
@@ -38,11 +36,32 @@ class MarketWebsocketApi(WebsocketBaseApi):
         self._symbol_list = []
         self._frequency_list = []
         self._depth_flag = False
+        self._n_depth = None
 
-    def init(self, symbol_list, frequency_list, depth_flag=False):
+    def init(self, symbol_list, frequency_list, depth_flag=False, n_depth=None):
+        """
+        n_depth, an int or a dict of symbol -> int, subscribes ArrayDepthData books of that many levels
+        instead of the default DepthData.
+        """
         self._symbol_list = symbol_list
         self._frequency_list = frequency_list
         self._depth_flag = depth_flag
+        self._n_depth = n_depth
+
+    def get_n_depth(self, symbol):
+        if isinstance(self._n_depth, dict):
+            return self._n_depth.get(symbol)
+        return self._n_depth
+
+    def _create_depth(self, symbol):
+        n_depth = self.get_n_depth(symbol)
+        if n_depth:
+            depth = ArrayDepthData.with_depth(n_depth)
+        else:
+            depth = DepthData()
+        depth.symbol = symbol
+        self._depth_dict[symbol] = depth
+        return depth
 
     def back_fill(self):
         for frequency in self._frequency_list:
@@ -65,34 +84,35 @@ class MarketWebsocketApi(WebsocketBaseApi):
         pass
 
     @staticmethod
-    def round_dt(dt: datetime.datetime, freq: str):
-        interval = TIME_INTERVAL_MAP[freq].total_seconds()
-        round_dt = datetime.datetime.fromtimestamp(int(dt.timestamp() / interval) * interval)
-        return round_dt # - TIME_INTERVAL_MAP[freq]
+    def round_timestamp(timestamp: int, freq: str):
+        # start of the bar holding timestamp
+        return floor_ns(timestamp, INTERVAL_NS_MAP[freq])
 
     def _on_bar_impl(self, symbol, frequency):
         bar = BarData()
         bar.symbol = symbol
         bar.frequency = frequency
-        bar.datetime = self.round_dt(datetime.datetime.utcnow(), frequency)
+        bar.timestamp = self.round_timestamp(now_ns(), frequency)
         self._bar_dict[(symbol, frequency)] = bar
 
         def callback(bar_data):
-            origin_dt = bar.datetime
+            origin_timestamp = bar.timestamp
             self._parse_bar(bar_data, bar)
-            if bar.datetime > origin_dt:
-                self.api.on_bar(copy.copy(bar))
+            if TRACER.enabled:
+                TRACER.stamp(TraceStage.PARSE)
+            if bar.timestamp > origin_timestamp:
+                self.api.on_bar(POOLS.snapshot(bar))
 
         return callback
 
     def _on_depth_impl(self, symbol):
-        depth = DepthData()
-        depth.symbol = symbol
-        self._depth_dict[symbol] = depth
+        depth = self._create_depth(symbol)
 
         def callback(depth_data):
             self._parse_depth(depth_data, depth)
-            self.api.on_depth(copy.copy(depth))
+            if TRACER.enabled:
+                TRACER.stamp(TraceStage.PARSE)
+            self.api.on_depth(POOLS.snapshot(depth))
 
         return callback
 
@@ -54,7 +54,8 @@ class DataEngine(object):
 
             # order was in active mode
             if not local_order.is_closed():
-                self._order_dict[client_order_id].on_order(order)
+                # orders are immutable snapshots, the latest one replaces the stored one
+                self._order_dict[client_order_id] = order
                 self._portfolio.on_order_status(order)
 
             # order was already closed before
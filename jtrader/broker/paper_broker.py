@@ -7,6 +7,8 @@ from jtrader.broker.gateway.simulate_gateway import SimulateGateway
 
 class PaperBroker(RealBroker):
     TAG = 'paper'
+    # simulated matching runs in the handlers and in send_order, it is not thread safe
+    SHARDABLE = False
 
     def __init__(self):
         super(PaperBroker, self).__init__()
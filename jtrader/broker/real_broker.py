@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from jtrader.core.common import logger
+from jtrader.core.common import logger, PriorityMailbox
 from jtrader.datatype import *
 from jtrader.broker.gateway import Gateway, GatewayFactory
 from jtrader.broker.broker import Broker
@@ -13,6 +13,9 @@ import typing
 class RealBroker(Broker):
 
     TAG = 'real'
+    # execution events overtake heartbeats, which overtake market data
+    MAILBOX_TYPE = PriorityMailbox.TAG
+    SHARDABLE = True
 
     def __init__(self):
         super(RealBroker, self).__init__()
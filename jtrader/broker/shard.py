@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from jtrader.core.common import Actor, TRACER, TraceStage
+from jtrader.core.common import logger
+from jtrader.datatype import *
+
+
+class ShardTask(object):
+    """
+    An event with the handlers of one shard to call, per topic in notification order.
+    """
+    __slots__ = ('msg', 'routes', '_trace')
+
+    def __init__(self, msg: BaseData, routes: list, trace=None):
+        self.msg = msg
+        self.routes = routes
+        self._trace = trace
+
+
+class BrokerShard(Actor):
+    """
+    Worker actor calling the handlers of the subscribers a broker assigned to it, in the order the broker
+    dispatched their events.
+    """
+
+    def __init__(self, broker, index: int):
+        super(BrokerShard, self).__init__()
+        self._broker = broker
+        self._index = index
+
+    def __repr__(self):
+        return '%s(%s, %d)' % (self.__class__.__name__, self._broker, self._index)
+
+    @property
+    def name(self):
+        return 'shard%d' % self._index
+
+    def handle_message(self, task: ShardTask):
+        msg = task.msg
+        broker = self._broker
+        tracing = TRACER.enabled
+        if tracing:
+            # a fork of the broker trace, its dispatch stamp is the time spent in the shard mailbox
+            previous_trace = TRACER.activate(task, TraceStage.DISPATCH)
+        try:
+            if tracing or broker.profiler is not None:
+                for topic, handlers in task.routes:
+                    broker._call_instrumented(topic, handlers, msg)
+            else:
+                for topic, handlers in task.routes:
+                    for handler in handlers:
+                        handler(msg)
+        except Exception as e:
+            logger.exception(e)
+            logger.info(f'Error occurred when {self} handling {msg}')
+            raise e
+        finally:
+            if tracing:
+                TRACER.deactivate(previous_trace)
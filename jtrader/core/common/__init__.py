@@ -6,4 +6,10 @@ from .context import LimitedQueryContext
 from .log import logger, AdvancedRotatingFileHandler, TlsSMTPHandler
 from .meta import Cached, Singleton
 from .template import *
+from .metrics import Histogram, HandlerProfiler
+from .memory import GC_MONITOR, GcMonitor, freeze_heap
+from .trace import TRACER, Trace, Tracer, TraceStage
+from .channel import RingBuffer, ChannelFull, ChannelEmpty
+from .event_loop import EventLoop
+from .mailbox import ConflatingMailbox, PriorityMailbox, RingBufferMailbox, MailboxFactory
 from .wrapper import RetryWrapper
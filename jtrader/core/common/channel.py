@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+__all__ = [
+    'RingBuffer',
+    'ChannelFull',
+    'ChannelEmpty',
+]
+
+
+class ChannelFull(Exception):
+    pass
+
+
+class ChannelEmpty(Exception):
+    pass
+
+
+class RingBuffer(object):
+    """
+    Bounded channel backed by a preallocated list of power-of-two capacity, single consumer.
+
+    The consumer owns ``_head`` and the producers own ``_tail``, a slot is written before ``_tail`` is
+    published, so the fast path takes no lock on the consumer side and at most one uncontended lock on the
+    producer side (only when ``multi_producer`` is set). Events are touched only when one side is waiting.
+
+    wait_strategy:
+        'block': wait on an event as soon as the channel is empty (full)
+        'spin': yield the GIL ``spin_count`` times before falling back to 'block'
+    backpressure, applied by ``put`` when the channel is full:
+        'block': wait until the consumer frees a slot, the consumer putting into its own full channel gets
+            ChannelFull instead, it would wait for itself forever
+        'drop': discard the message and count it in ``n_dropped``
+        'raise': raise ChannelFull
+    """
+    WAIT_STRATEGIES = ('block', 'spin')
+    BACKPRESSURE_POLICIES = ('block', 'drop', 'raise')
+
+    def __init__(self, capacity=65536, multi_producer=True, wait_strategy='spin', backpressure='block',
+                 spin_count=64):
+        super(RingBuffer, self).__init__()
+        if capacity < 1:
+            raise ValueError('Capacity should be positive, got {}'.format(capacity))
+        if wait_strategy not in self.WAIT_STRATEGIES:
+            raise ValueError('Unknown wait strategy "{}", expected one of {}'.format(
+                wait_strategy, self.WAIT_STRATEGIES))
+        if backpressure not in self.BACKPRESSURE_POLICIES:
+            raise ValueError('Unknown backpressure policy "{}", expected one of {}'.format(
+                backpressure, self.BACKPRESSURE_POLICIES))
+
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._capacity = size
+        self._mask = size - 1
+        self._buffer = [None] * size
+
+        self._head = 0
+        self._tail = 0
+        self._producer_lock = threading.Lock() if multi_producer else None
+        self._spin_count = spin_count if wait_strategy == 'spin' else 0
+        self.wait_strategy = wait_strategy
+        self.backpressure = backpressure
+
+        self._not_empty = threading.Event()
+        self._not_full = threading.Event()
+        self._consumer_waiting = False
+        self._producer_waiting = False
+        # thread of the last get, a put from it must not block
+        self._consumer_ident = None
+        self.n_dropped = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def qsize(self):
+        return self._tail - self._head
+
+    def empty(self):
+        return self._tail == self._head
+
+    def full(self):
+        return self._tail - self._head >= self._capacity
+
+    def _wait(self, ready, event, flag, timeout):
+        # spin first, then publish the waiting flag and re-check before sleeping so no wake-up is lost
+        for _ in range(self._spin_count):
+            if ready():
+                return True
+            time.sleep(0)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not ready():
+            event.clear()
+            setattr(self, flag, True)
+            try:
+                if ready():
+                    return True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                event.wait(remaining)
+            finally:
+                setattr(self, flag, False)
+        return True
+
+    def _wait_not_full(self, timeout=None):
+        return self._wait(lambda: self._tail - self._head < self._capacity,
+                          self._not_full, '_producer_waiting', timeout)
+
+    def _wait_not_empty(self, timeout=None):
+        return self._wait(lambda: self._tail != self._head, self._not_empty, '_consumer_waiting', timeout)
+
+    def _publish(self, msg_list, block):
+        # write as many messages as fit, return the number written
+        count = 0
+        n_msg = len(msg_list)
+        buffer = self._buffer
+        mask = self._mask
+        while count < n_msg:
+            tail = self._tail
+            free = self._capacity - (tail - self._head)
+            if free <= 0:
+                if not block or threading.get_ident() == self._consumer_ident:
+                    break
+                self._wait_not_full()
+                continue
+            for msg in msg_list[count:count + free]:
+                buffer[tail & mask] = msg
+                tail += 1
+            count += tail - self._tail
+            self._tail = tail
+            if self._consumer_waiting:
+                self._not_empty.set()
+        return count
+
+    def put_many(self, msg_list, block=None) -> int:
+        """
+        Append messages in order, ``block`` overrides the backpressure policy, returns the number accepted.
+        """
+        if block is None:
+            block = self.backpressure == 'block'
+        lock = self._producer_lock
+        if lock is None:
+            count = self._publish(msg_list, block)
+        else:
+            with lock:
+                count = self._publish(msg_list, block)
+        n_rejected = len(msg_list) - count
+        if n_rejected:
+            # a blocking put is only rejected when it comes from the consumer
+            if block or self.backpressure == 'raise':
+                raise ChannelFull('{} message(s) rejected by a full channel of capacity {}'.format(
+                    n_rejected, self._capacity))
+            self.n_dropped += n_rejected
+        return count
+
+    def put(self, msg, block=None) -> bool:
+        return self.put_many((msg,), block) == 1
+
+    def get_many(self, max_count=None, block=True, timeout=None) -> list:
+        self._consumer_ident = threading.get_ident()
+        head = self._head
+        available = self._tail - head
+        if not available:
+            if not block or not self._wait_not_empty(timeout):
+                return []
+            available = self._tail - head
+        if max_count is not None and max_count < available:
+            available = max_count
+
+        buffer = self._buffer
+        start = head & self._mask
+        stop = start + available
+        if stop <= self._capacity:
+            msg_list = buffer[start:stop]
+            buffer[start:stop] = [None] * available
+        else:
+            stop -= self._capacity
+            msg_list = buffer[start:] + buffer[:stop]
+            buffer[start:] = [None] * (self._capacity - start)
+            buffer[:stop] = [None] * stop
+        self._head = head + available
+        if self._producer_waiting:
+            self._not_full.set()
+        return msg_list
+
+    def get(self, block=True, timeout=None):
+        msg_list = self.get_many(1, block, timeout)
+        if not msg_list:
+            raise ChannelEmpty()
+        return msg_list[0]
+
+    def drain(self) -> list:
+        return self.get_many(block=False)
+
+    def statistics(self) -> dict:
+        return {'queued': self.qsize(), 'capacity': self._capacity, 'dropped': self.n_dropped}
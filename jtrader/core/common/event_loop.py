@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import asyncio
+import time
+
+from jtrader.core.common.log import logger
+
+__all__ = [
+    'EventLoop',
+]
+
+
+class _CallbackStatistics(object):
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def on_called(self, elapsed):
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+
+class EventLoop(object):
+    """
+    asyncio event loop running in a dedicated thread, with a small executor for blocking calls.
+
+    Every method except ``statistics`` may be called from any thread. Lag is measured by a probe sleeping
+    ``lag_interval`` seconds and comparing the actual wake-up time, time spent in callbacks is recorded by
+    ``record`` under a name so the statistics show where the loop time goes.
+    """
+
+    def __init__(self, max_workers=4, lag_interval=0.5):
+        super(EventLoop, self).__init__()
+        self.max_workers = max_workers
+        self.lag_interval = lag_interval
+        self._loop: asyncio.AbstractEventLoop = None
+        self._thread = threading.Thread()
+        self._executor: ThreadPoolExecutor = None
+
+        self._n_lag = 0
+        self._total_lag = 0.0
+        self._max_lag = 0.0
+        self._last_lag = 0.0
+        self._callback_statistics = {}
+
+    def __repr__(self):
+        return '{}(max_workers={}, lag_interval={})'.format(self.__class__.__name__, self.max_workers,
+                                                           self.lag_interval)
+
+    @property
+    def loop(self):
+        return self._loop
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def in_loop_thread(self):
+        return self._thread is threading.current_thread()
+
+    def start(self):
+        if self.is_alive():
+            return
+        self._loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(self.max_workers)
+        self._loop.set_default_executor(self._executor)
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name='EventLoop')
+        self._thread.daemon = True
+        self._thread.start()
+        ready.wait()
+        logger.debug('%s started', self)
+
+    def stop(self):
+        if not self.is_alive():
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._executor.shutdown()
+        logger.debug('%s stopped', self)
+
+    def _run(self, ready: threading.Event):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        probe = loop.create_task(self._probe_lag())
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            probe.cancel()
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+
+    async def _probe_lag(self):
+        loop = self._loop
+        interval = self.lag_interval
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            lag = max(loop.time() - start - interval, 0.0)
+            self._n_lag += 1
+            self._total_lag += lag
+            self._last_lag = lag
+            if lag > self._max_lag:
+                self._max_lag = lag
+
+    # -------------------- scheduling --------------------------
+    def call_soon(self, callback, *args):
+        if self.in_loop_thread():
+            return self._loop.call_soon(callback, *args)
+        return self._loop.call_soon_threadsafe(callback, *args)
+
+    def submit(self, coroutine):
+        """
+        Schedule a coroutine on the loop, returns a concurrent.futures.Future.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def run_in_executor(self, func, *args):
+        """
+        Run a blocking function on the executor of the loop, returns a concurrent.futures.Future.
+        """
+        return self._executor.submit(self._timed_call, 'executor.' + getattr(func, '__name__', 'call'), func, *args)
+
+    def _timed_call(self, name, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    # -------------------- statistics --------------------------
+    def record(self, name, elapsed):
+        try:
+            callback_stats = self._callback_statistics[name]
+        except KeyError:
+            callback_stats = self._callback_statistics[name] = _CallbackStatistics()
+        callback_stats.on_called(elapsed)
+
+    def statistics(self) -> dict:
+        stats = {
+            'lag_last': self._last_lag,
+            'lag_mean': self._total_lag / self._n_lag if self._n_lag else 0.0,
+            'lag_max': self._max_lag,
+        }
+        for name, callback_stats in sorted(self._callback_statistics.items()):
+            stats['%s_count' % name] = callback_stats.count
+            stats['%s_total_time' % name] = callback_stats.total_time
+            stats['%s_max_time' % name] = callback_stats.max_time
+        return stats
@@ -2,11 +2,11 @@
 # -*- coding: utf-8 -*-
 import logging.handlers
 import logging
-from queue import Queue
 import threading
 import os
 import datetime
 
+from jtrader.core.common.channel import RingBuffer
 from jtrader.core.common.context import LimitedQueryContext
 
 _email_context = LimitedQueryContext(10, '1h')
@@ -15,7 +15,8 @@ _email_context = LimitedQueryContext(10, '1h')
 class AsyncHandlerMixin(object):
     def __init__(self, *args, **kwargs):
         super(AsyncHandlerMixin, self).__init__(*args, **kwargs)
-        self.__queue = Queue()
+        # records are formatted in batches, producers only block once 64k records are pending
+        self.__queue = RingBuffer(wait_strategy='block')
         self.__thread = threading.Thread(target=self.__loop)
         self.__thread.daemon = True
         self.__thread.start()
@@ -25,11 +26,11 @@ class AsyncHandlerMixin(object):
 
     def __loop(self):
         while True:
-            record = self.__queue.get()
-            try:
-                super(AsyncHandlerMixin, self).emit(record)
-            except:
-                pass
+            for record in self.__queue.get_many():
+                try:
+                    super(AsyncHandlerMixin, self).emit(record)
+                except:
+                    pass
 
 
 class AsyncRotatingFileHandler(AsyncHandlerMixin, logging.handlers.RotatingFileHandler):
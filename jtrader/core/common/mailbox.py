@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from collections import Counter, deque
+import threading
+import time
+
+from jtrader.core.common.channel import RingBuffer
+from jtrader.core.common.template import Mailbox
+
+__all__ = [
+    'ConflatingMailbox',
+    'PriorityMailbox',
+    'RingBufferMailbox',
+    'MailboxFactory',
+]
+
+
+class ConflatingMailbox(Mailbox):
+    """
+    Mailbox draining messages in batches and keeping only the latest update per conflation key.
+
+    A message takes part in conflation when it provides a ``conflation_key()`` method returning a
+    hashable tuple led by its event type. Messages without a key (orders, trades, fundings, control
+    messages) are never dropped, and surviving messages keep their relative order.
+    """
+    TAG = 'conflate'
+
+    def __init__(self, batch_size=1024):
+        super(ConflatingMailbox, self).__init__(batch_size)
+        self._conflated_counter = Counter()
+
+    @property
+    def n_conflated(self):
+        return sum(self._conflated_counter.values())
+
+    def get_many(self, max_count=None) -> list:
+        msg_list = super(ConflatingMailbox, self).get_many(max_count)
+        if len(msg_list) < 2:
+            return msg_list
+
+        key_list = [None] * len(msg_list)
+        latest_index_dict = {}
+        for index, msg in enumerate(msg_list):
+            key_func = getattr(msg, 'conflation_key', None)
+            if key_func is not None:
+                key = key_func()
+                if key is not None:
+                    key_list[index] = key
+                    latest_index_dict[key] = index
+
+        n_keyed = len(msg_list) - key_list.count(None)
+        if n_keyed == len(latest_index_dict):
+            return msg_list
+
+        conflated_list = []
+        for index, msg in enumerate(msg_list):
+            key = key_list[index]
+            if key is None or latest_index_dict[key] == index:
+                conflated_list.append(msg)
+            else:
+                self._conflated_counter[key[0]] += 1
+        return conflated_list
+
+    def statistics(self) -> dict:
+        stats = super(ConflatingMailbox, self).statistics()
+        stats['conflated'] = self.n_conflated
+        for event_type, count in self._conflated_counter.items():
+            stats['conflated_%s' % getattr(event_type, 'name', event_type)] = count
+        return stats
+
+
+class _LaneStatistics(object):
+
+    def __init__(self):
+        self.served = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def on_served(self, wait):
+        self.served += 1
+        self.total_wait += wait
+        if wait > self.max_wait:
+            self.max_wait = wait
+
+    @property
+    def mean_wait(self):
+        return self.total_wait / self.served if self.served else 0.0
+
+
+class PriorityMailbox(Mailbox):
+    """
+    Mailbox with one FIFO lane per priority level.
+
+    Messages are assigned to lanes by the name of their EVENT_TYPE, everything not listed in ``lanes``
+    (market data) goes to the market lane. A non-empty lower lane is served once it has been skipped
+    ``starvation_limits[i - 1]`` times in a row. Control messages without EVENT_TYPE, like the exit sentinel
+    of an Actor, go to a control lane and are served as soon as every message queued before them was, so an
+    actor stopping still handles the orders already in its mailbox.
+    """
+    TAG = 'priority'
+
+    DEFAULT_LANES = (('ORDER', 'TRADE', 'FUNDING'), ('HEARTBEAT', ))
+    DEFAULT_STARVATION_LIMITS = (64, 256)
+
+    def __init__(self, batch_size=64, lanes=DEFAULT_LANES, starvation_limits=DEFAULT_STARVATION_LIMITS):
+        super(PriorityMailbox, self).__init__(batch_size)
+        if len(starvation_limits) != len(lanes):
+            raise ValueError('One starvation limit is expected for each lane below the first one, '
+                             'got {} for {} lanes'.format(list(starvation_limits), len(lanes) + 1))
+
+        self._lane_names = ['/'.join(names).lower() for names in lanes] + ['market', 'control']
+        self._lane_index_dict = {name: index for index, names in enumerate(lanes) for name in names}
+        self._event_lane_dict = {}
+
+        n_lane = len(self._lane_names)
+        self._control_index = n_lane - 1
+        self._starvation_limits = [0] + list(starvation_limits) + [0]
+        self._lanes = [deque() for _ in range(n_lane)]
+        self._skipped = [0] * n_lane
+        self._lane_statistics = [_LaneStatistics() for _ in range(n_lane)]
+        self._condition = threading.Condition()
+
+    def _lane_index(self, msg):
+        event_type = getattr(msg, 'EVENT_TYPE', None)
+        if event_type is None:
+            return self._control_index
+        try:
+            return self._event_lane_dict[event_type]
+        except KeyError:
+            name = getattr(event_type, 'name', str(event_type))
+            index = self._event_lane_dict[event_type] = self._lane_index_dict.get(name, self._control_index - 1)
+            return index
+
+    def put(self, msg):
+        index = self._lane_index(msg)
+        lane = self._lanes[index]
+        put_time = time.perf_counter()
+        with self._condition:
+            if index == self._control_index:
+                # served counts each event lane has to reach first, the messages queued until now
+                lane.append((put_time, msg, [lane_stats.served + len(event_lane) for lane_stats, event_lane in
+                                             zip(self._lane_statistics, self._lanes[:index])]))
+            else:
+                lane.append((put_time, msg))
+            self._condition.notify()
+
+    def get(self):
+        return self.get_many(1)[0]
+
+    def _select_lane(self):
+        lanes = self._lanes
+        control_index = self._control_index
+        control_lane = lanes[control_index]
+        if control_lane and all(lane_stats.served >= served for lane_stats, served in
+                                zip(self._lane_statistics, control_lane[0][2])):
+            return control_index
+        for index in range(1, control_index):
+            if lanes[index] and self._skipped[index] >= self._starvation_limits[index]:
+                return index
+        for index in range(control_index):
+            if lanes[index]:
+                return index
+        return control_index if control_lane else -1
+
+    def _pop(self, now):
+        index = self._select_lane()
+        if index < 0:
+            return None, False
+        lanes = self._lanes
+        skipped = self._skipped
+        skipped[index] = 0
+        for lower_index in range(index + 1, len(lanes)):
+            if lanes[lower_index]:
+                skipped[lower_index] += 1
+        item = lanes[index].popleft()
+        self._lane_statistics[index].on_served(now - item[0])
+        return item[1], True
+
+    def get_many(self, max_count=None) -> list:
+        if max_count is None:
+            max_count = self.batch_size
+        msg_list = []
+        with self._condition:
+            while not any(self._lanes):
+                self._condition.wait()
+            now = time.perf_counter()
+            while len(msg_list) < max_count:
+                msg, found = self._pop(now)
+                if not found:
+                    break
+                msg_list.append(msg)
+        return msg_list
+
+    def drain(self) -> list:
+        msg_list = []
+        with self._condition:
+            now = time.perf_counter()
+            while True:
+                msg, found = self._pop(now)
+                if not found:
+                    break
+                msg_list.append(msg)
+        return msg_list
+
+    def qsize(self):
+        return sum(len(lane) for lane in self._lanes)
+
+    def statistics(self) -> dict:
+        stats = super(PriorityMailbox, self).statistics()
+        for name, lane, lane_stats in zip(self._lane_names, self._lanes, self._lane_statistics):
+            stats['%s_queued' % name] = len(lane)
+            stats['%s_served' % name] = lane_stats.served
+            stats['%s_mean_wait' % name] = lane_stats.mean_wait
+            stats['%s_max_wait' % name] = lane_stats.max_wait
+        return stats
+
+
+class RingBufferMailbox(Mailbox):
+    """
+    Mailbox backed by a preallocated RingBuffer instead of queue.Queue.
+
+    The backpressure policy only applies to market data, control messages without EVENT_TYPE
+    (such as the exit sentinel of an Actor) always wait for a free slot. A handler sending to the full
+    mailbox of its own actor can not wait, its put raises ChannelFull.
+    """
+    TAG = 'ring'
+
+    def __init__(self, batch_size=64, capacity=65536, multi_producer=True, wait_strategy='spin',
+                 backpressure='block', spin_count=64):
+        super(RingBufferMailbox, self).__init__(batch_size)
+        self._queue = None
+        self._channel = RingBuffer(capacity, multi_producer, wait_strategy, backpressure, spin_count)
+
+    @property
+    def channel(self):
+        return self._channel
+
+    def put(self, msg):
+        self._channel.put(msg, True if getattr(msg, 'EVENT_TYPE', None) is None else None)
+
+    def put_many(self, msg_list):
+        self._channel.put_many(msg_list)
+
+    def get(self):
+        return self._channel.get()
+
+    def get_many(self, max_count=None) -> list:
+        if max_count is None:
+            max_count = self.batch_size
+        return self._channel.get_many(max_count)
+
+    def drain(self) -> list:
+        return self._channel.drain()
+
+    def qsize(self):
+        return self._channel.qsize()
+
+    def statistics(self) -> dict:
+        return self._channel.statistics()
+
+
+class MailboxFactory(object):
+    def __new__(cls, name, **kwargs) -> Mailbox:
+        _instance = Mailbox.factory_create(name, **kwargs)
+        return _instance
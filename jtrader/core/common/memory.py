@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+import gc
+
+from jtrader.core.common.metrics import Histogram
+
+__all__ = [
+    'GcMonitor',
+    'GC_MONITOR',
+    'freeze_heap',
+]
+
+
+class GcMonitor(object):
+    """
+    Pause of every cyclic garbage collection, one ns Histogram per generation, timed through ``gc.callbacks``.
+    """
+
+    def __init__(self, significant_bits=7):
+        super(GcMonitor, self).__init__()
+        self.enabled = False
+        self.significant_bits = significant_bits
+        self._lock = threading.Lock()
+        self._histogram_list = [Histogram(significant_bits) for _ in range(3)]
+        self._collected_list = [0, 0, 0]
+        self._start = 0
+
+    def enable(self):
+        if not self.enabled:
+            gc.callbacks.append(self._on_gc)
+            self.enabled = True
+
+    def disable(self):
+        if self.enabled:
+            gc.callbacks.remove(self._on_gc)
+            self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._histogram_list = [Histogram(self.significant_bits) for _ in range(3)]
+            self._collected_list = [0, 0, 0]
+
+    def _on_gc(self, phase, info):
+        # collections run in the thread that triggered them, one at a time
+        if phase == 'start':
+            self._start = time.perf_counter_ns()
+        else:
+            elapsed = time.perf_counter_ns() - self._start
+            generation = info['generation']
+            with self._lock:
+                self._histogram_list[generation].record(elapsed)
+                self._collected_list[generation] += info['collected']
+
+    def statistics(self, percentiles=(50, 99, 99.9)) -> dict:
+        """
+        Per generation pause summary in microseconds, with the number of objects collected.
+        """
+        stats = {}
+        with self._lock:
+            for generation, histogram in enumerate(self._histogram_list):
+                summary = histogram.summary(percentiles, scale=1e3)
+                summary['total_ms'] = histogram.total / 1e6
+                summary['collected'] = self._collected_list[generation]
+                stats['gen%d' % generation] = summary
+        stats['frozen'] = {'count': gc.get_freeze_count()} if hasattr(gc, 'get_freeze_count') else {}
+        return stats
+
+
+GC_MONITOR = GcMonitor()
+
+
+def freeze_heap() -> int:
+    """
+    Collect once, then move every surviving object to the permanent generation so later collections no
+    longer traverse the modules, contracts and configuration loaded at startup (python 3.7+, a plain
+    collection otherwise). Returns the number of frozen objects.
+    """
+    gc.collect()
+    if not hasattr(gc, 'freeze'):
+        return 0
+    gc.freeze()
+    return gc.get_freeze_count()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from collections import Counter
+import threading
+
+__all__ = [
+    'Histogram',
+    'HandlerProfiler',
+]
+
+
+class Histogram(object):
+    """
+    HDR-style histogram of non-negative integers, e.g. nanosecond latencies.
+
+    Values below ``2 ** significant_bits`` are counted exactly, larger ones fall into log-linear buckets
+    of relative width ``2 ** (1 - significant_bits)``, so memory stays bounded while percentiles keep a
+    fixed relative precision (about 1.6% with the default 7 bits).
+    """
+
+    def __init__(self, significant_bits=7):
+        super(Histogram, self).__init__()
+        if significant_bits < 2:
+            raise ValueError('At least 2 significant bits are required, got {}'.format(significant_bits))
+        self.significant_bits = significant_bits
+        self._half = 1 << (significant_bits - 1)
+        self._counts = Counter()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _bucket_index(self, value):
+        shift = value.bit_length() - self.significant_bits
+        if shift <= 0:
+            return value
+        return shift * self._half + (value >> shift)
+
+    def _bucket_range(self, index):
+        if index < 2 * self._half:
+            return index, index
+        shift = index // self._half - 1
+        mantissa = index - shift * self._half
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value, count=1):
+        value = int(value)
+        if value < 0:
+            value = 0
+        self._counts[self._bucket_index(value)] += count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        """
+        Value at percentile q (0-100), reported as the middle of the bucket holding it.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                lower, upper = self._bucket_range(index)
+                return min(max((lower + upper) // 2, self.min), self.max)
+        return self.max
+
+    def merge(self, other: "Histogram"):
+        if other.significant_bits != self.significant_bits:
+            raise ValueError('Histograms with different precision can not be merged')
+        self._counts.update(other._counts)
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def reset(self):
+        self._counts.clear()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def summary(self, percentiles=(50, 90, 99, 99.9), scale=1.0) -> dict:
+        """
+        count, min, mean, percentiles and max, values divided by ``scale`` (1e3 turns ns into us).
+        """
+        summary = {'count': self.count, 'min': (self.min or 0) / scale, 'mean': self.mean / scale}
+        for q in percentiles:
+            summary['p%s' % q] = self.percentile(q) / scale
+        summary['max'] = (self.max or 0) / scale
+        return summary
+
+    def to_dict(self) -> dict:
+        buckets = {}
+        for index, count in sorted(self._counts.items()):
+            buckets[self._bucket_range(index)[0]] = count
+        return {
+            'significant_bits': self.significant_bits,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'buckets': buckets,
+        }
+
+
+def _format_topic(topic):
+    if isinstance(topic, tuple):
+        return '.'.join(_format_topic(part) for part in topic)
+    return getattr(topic, 'name', str(topic))
+
+
+def _handler_key(handler):
+    # class, name and subscriber id of a handler: bounded by the code and the strategies, and keeping
+    # neither the handler nor its subscriber alive
+    owner = getattr(handler, '__self__', None)
+    if owner is None or not hasattr(handler, '__func__'):
+        # functions, builtins and callable objects
+        return getattr(handler, '__qualname__', None) or type(handler).__qualname__, '', getattr(handler, 'id_', '')
+    return type(owner).__qualname__, handler.__name__, getattr(owner, 'id_', '')
+
+
+def _format_handler(key):
+    class_name, name, id_ = key
+    handler_name = '%s.%s' % (class_name, name) if name else class_name
+    return '%s[%s]' % (handler_name, id_) if id_ else handler_name
+
+
+class HandlerProfiler(object):
+    """
+    Wall time of the handlers notified by a Subject, one ns Histogram per event type and handler.
+
+    Composite topics count under their event type, and handlers under their class, method and subscriber id,
+    so per-order topics and the algorithms of one strategy share their rows.
+    """
+
+    def __init__(self, significant_bits=7):
+        super(HandlerProfiler, self).__init__()
+        self.significant_bits = significant_bits
+        self._lock = threading.Lock()
+        self._histogram_dict = {}
+
+    def record(self, topic, handler, elapsed_ns):
+        key = (topic[0] if isinstance(topic, tuple) else topic, _handler_key(handler))
+        with self._lock:
+            try:
+                histogram = self._histogram_dict[key]
+            except KeyError:
+                histogram = self._histogram_dict[key] = Histogram(self.significant_bits)
+            histogram.record(elapsed_ns)
+
+    def reset(self):
+        with self._lock:
+            self._histogram_dict = {}
+
+    def report(self, n_top=None) -> list:
+        """
+        Rows of event, handler, count, total_ms, mean_us and p99_us, slowest total first.
+        """
+        with self._lock:
+            row_list = [{
+                'event': _format_topic(event_type),
+                'handler': _format_handler(handler_key),
+                'count': histogram.count,
+                'total_ms': histogram.total / 1e6,
+                'mean_us': histogram.mean / 1e3,
+                'p99_us': histogram.percentile(99) / 1e3,
+            } for (event_type, handler_key), histogram in self._histogram_dict.items()]
+        row_list.sort(key=lambda row: row['total_ms'], reverse=True)
+        return row_list[:n_top] if n_top else row_list
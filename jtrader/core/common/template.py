@@ -1,19 +1,22 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from queue import Queue
+from queue import Queue, Empty
 from threading import Thread
-from collections import defaultdict
+from time import perf_counter_ns
 import warnings
 import typing
 import ast
 from sklearn.base import BaseEstimator as _BaseEstimator
 
 from jtrader.core.common.log import logger
+from jtrader.core.common.metrics import HandlerProfiler
+from jtrader.core.common.trace import TRACER, TraceStage
 from jtrader.core.common.utils import parse_file
 
 
 __all__ = [
     'Actor',
+    'Mailbox',
     'Subject',
     'Subscriber',
     'Observable',
@@ -64,23 +67,31 @@ class Actor(object):
     def __init__(self):
         super(Actor, self).__init__()
         self._thread = Thread()
-        self._queue = Queue()
+        self._mailbox: Mailbox = Mailbox()
+
+    @property
+    def mailbox(self):
+        return self._mailbox
+
+    def set_mailbox(self, mailbox: "Mailbox"):
+        if self._thread.is_alive():
+            raise RuntimeError('Mailbox of %s can not be replaced while running' % self.__class__.__name__)
+        for msg in self._mailbox.drain():
+            mailbox.put(msg)
+        self._mailbox = mailbox
 
     def send(self, msg):
-        self._queue.put(msg)
+        self._mailbox.put(msg)
 
     def _receive(self):
-        msg = self._queue.get()
-        if msg is ActorExit:
-            raise ActorExit()
-        return msg
+        return self._mailbox.get_many()
 
     def handle_message(self, msg):
         pass
 
     def stop(self):
         if self._thread.is_alive():
-            self._queue.put(ActorExit)
+            self._mailbox.put(ActorExit)
             self._thread.join()
             logger.debug('%s stopped', self.__class__.__name__)
 
@@ -98,32 +109,85 @@ class Actor(object):
 
     def run(self):
         while True:
-            msg = self._receive()
-            self.handle_message(msg)
+            for msg in self._receive():
+                if msg is ActorExit:
+                    raise ActorExit()
+                self.handle_message(msg)
 
 
 class Subject(object):
     def __init__(self):
         super(Subject, self).__init__()
-        self._handler_dict = defaultdict(list)
+        # topic -> immutable handler tuple, rebuilt only when registration changes
+        self._handler_dict: typing.Dict[typing.Hashable, typing.Tuple[typing.Callable, ...]] = {}
+        self._profiler: HandlerProfiler = None
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    def set_profiling(self, enabled: bool):
+        """
+        Time every handler call per event type and handler, a fresh profiler is started each time it is enabled.
+        """
+        self._profiler = HandlerProfiler() if enabled else None
 
     def register(self, topic: typing.Hashable, handler: typing.Callable):
         if not callable(handler):
             raise ValueError('Handler should be a callable object')
-        if handler not in self._handler_dict[topic]:
-            self._handler_dict[topic].append(handler)
+        handlers = self._handler_dict.get(topic, ())
+        if handler not in handlers:
+            self._handler_dict[topic] = handlers + (handler,)
 
     def unregister(self, topic: typing.Hashable, handler: typing.Callable):
-        if handler in self._handler_dict[topic]:
-            self._handler_dict[topic].remove(handler)
-            if not self._handler_dict[topic]:
+        handlers = self._handler_dict.get(topic, ())
+        if handler in handlers:
+            handlers = tuple(h for h in handlers if h != handler)
+            if handlers:
+                self._handler_dict[topic] = handlers
+            else:
                 del self._handler_dict[topic]
 
     def notify(self, topic: typing.Hashable, msg):
-        if topic in self._handler_dict:
-            for handler in self._handler_dict[topic]:
+        if TRACER.enabled or self._profiler is not None:
+            return self._notify_instrumented((topic,), msg)
+        handlers = self._handler_dict.get(topic)
+        if handlers is not None:
+            for handler in handlers:
                 handler(msg)
 
+    def notify_many(self, topics: typing.Iterable[typing.Hashable], msg):
+        if TRACER.enabled or self._profiler is not None:
+            return self._notify_instrumented(topics, msg)
+        handler_dict = self._handler_dict
+        for topic in topics:
+            handlers = handler_dict.get(topic)
+            if handlers is not None:
+                for handler in handlers:
+                    handler(msg)
+
+    def _notify_instrumented(self, topics, msg):
+        handler_dict = self._handler_dict
+        for topic in topics:
+            handlers = handler_dict.get(topic)
+            if handlers is not None:
+                self._call_instrumented(topic, handlers, msg)
+
+    def _call_instrumented(self, topic, handlers, msg):
+        profiler = self._profiler
+        tracing = TRACER.enabled
+        for handler in handlers:
+            if tracing:
+                TRACER.stamp(TraceStage.HANDLER_ENTER)
+            start = perf_counter_ns()
+            try:
+                handler(msg)
+            finally:
+                if profiler is not None:
+                    profiler.record(topic, handler, perf_counter_ns() - start)
+                if tracing:
+                    TRACER.stamp(TraceStage.HANDLER_EXIT)
+
 
 class Subscriber(object):
     
@@ -169,7 +233,17 @@ class SubjectDecorator(Subject):
     
     def notify(self, topic, msg):
         self._subject.notify(topic, msg)
-        
+
+    def notify_many(self, topics, msg):
+        self._subject.notify_many(topics, msg)
+
+    @property
+    def profiler(self):
+        return self._subject.profiler
+
+    def set_profiling(self, enabled: bool):
+        self._subject.set_profiling(enabled)
+
     def register(self, topic, handler):
         self._subject.register(topic, handler)
     
@@ -250,6 +324,58 @@ class Registered(object):
         return '%s(%s)' % (self.__class__.__name__, self.TAG)
 
 
+class Mailbox(Registered):
+    """
+    FIFO mailbox of an Actor, messages are handed out in batches of at most batch_size.
+    """
+    TAG = 'fifo'
+
+    def __init__(self, batch_size=64):
+        super(Mailbox, self).__init__()
+        self.batch_size = batch_size
+        self._queue = Queue()
+
+    def put(self, msg):
+        self._queue.put(msg)
+
+    def put_many(self, msg_list):
+        for msg in msg_list:
+            self.put(msg)
+
+    def get(self):
+        return self._queue.get()
+
+    def get_many(self, max_count=None) -> list:
+        # block for the first message, then take whatever is already queued
+        if max_count is None:
+            max_count = self.batch_size
+        msg_list = [self._queue.get()]
+        try:
+            while len(msg_list) < max_count:
+                msg_list.append(self._queue.get_nowait())
+        except Empty:
+            pass
+        return msg_list
+
+    def drain(self) -> list:
+        msg_list = []
+        try:
+            while True:
+                msg_list.append(self._queue.get_nowait())
+        except Empty:
+            pass
+        return msg_list
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def statistics(self) -> dict:
+        return {'queued': self.qsize()}
+
+
+Mailbox.subclass_dict[Mailbox.TAG] = Mailbox
+
+
 class Engine(object):
 
     def __init__(self, target=None):
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import json
+import time
+
+from jtrader.core.common.metrics import Histogram
+
+__all__ = [
+    'TraceStage',
+    'Trace',
+    'Tracer',
+    'TRACER',
+]
+
+
+class TraceStage(object):
+    GATEWAY_RECEIVE = 'gateway_receive'
+    PARSE = 'parse'
+    ENQUEUE = 'enqueue'
+    DISPATCH = 'dispatch'
+    HANDLER_ENTER = 'handler_enter'
+    HANDLER_EXIT = 'handler_exit'
+    ALGO_SEND = 'algo_send'
+    ORDER_SEND = 'order_send'
+    GATEWAY_SEND = 'gateway_send'
+    END_TO_END = 'end_to_end'
+
+    ALL = (GATEWAY_RECEIVE, PARSE, ENQUEUE, DISPATCH, HANDLER_ENTER, HANDLER_EXIT, ALGO_SEND, ORDER_SEND,
+           GATEWAY_SEND, END_TO_END)
+
+
+class Trace(object):
+    """
+    Monotonic-ns stamps of one event on its way through the system.
+    """
+    __slots__ = ('stamps', 'n_recorded')
+
+    def __init__(self, stamps=None, n_recorded=0):
+        self.stamps = [] if stamps is None else stamps
+        self.n_recorded = n_recorded
+
+    def __repr__(self):
+        return 'Trace({})'.format(self.stamps)
+
+    def stamp(self, stage):
+        self.stamps.append((stage, time.perf_counter_ns()))
+
+    def fork(self):
+        # stamps inherited from the parent are recorded when the parent finishes
+        return Trace(list(self.stamps), len(self.stamps))
+
+
+class Tracer(object):
+    """
+    Aggregates traces into one histogram per stage, holding the ns elapsed since the previous stamp.
+
+    Events get a trace in ``_trace`` when they are enqueued into the broker, forked from the trace current
+    in the thread (the packet being parsed, the event being dispatched) so an order keeps the stamps of the
+    market data it was created from. Call sites check ``enabled`` first, so a disabled tracer costs a single
+    attribute lookup per event.
+    """
+
+    def __init__(self, significant_bits=7):
+        super(Tracer, self).__init__()
+        self.enabled = False
+        self.significant_bits = significant_bits
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._histogram_dict = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self._local = threading.local()
+
+    def reset(self):
+        with self._lock:
+            self._histogram_dict = {}
+
+    # -------------------- stamping --------------------------
+    def current(self) -> Trace:
+        return getattr(self._local, 'trace', None)
+
+    def begin(self, stage=TraceStage.GATEWAY_RECEIVE) -> Trace:
+        trace = Trace()
+        trace.stamp(stage)
+        self._local.trace = trace
+        return trace
+
+    def release(self):
+        trace = getattr(self._local, 'trace', None)
+        self._local.trace = None
+        if trace is not None:
+            self.finish(trace)
+
+    def stamp(self, stage):
+        trace = getattr(self._local, 'trace', None)
+        if trace is not None:
+            trace.stamp(stage)
+
+    def attach(self, obj, stage) -> Trace:
+        current = getattr(self._local, 'trace', None)
+        trace = Trace() if current is None else current.fork()
+        trace.stamp(stage)
+        obj._trace = trace
+        return trace
+
+    def extend(self, obj, stage) -> Trace:
+        """
+        Stamp the trace of obj, attaching one first if it has none.
+        """
+        trace = getattr(obj, '_trace', None)
+        if trace is None:
+            return self.attach(obj, stage)
+        trace.stamp(stage)
+        return trace
+
+    def activate(self, obj, stage) -> Trace:
+        """
+        Make the trace of obj current, returns the previous one to be restored by deactivate.
+        """
+        previous = getattr(self._local, 'trace', None)
+        trace = self._local.trace = getattr(obj, '_trace', None)
+        if trace is not None:
+            trace.stamp(stage)
+        return previous
+
+    def deactivate(self, previous=None):
+        trace = getattr(self._local, 'trace', None)
+        self._local.trace = previous
+        if trace is not None:
+            self.finish(trace)
+
+    def complete(self, obj, stage):
+        trace = getattr(obj, '_trace', None)
+        if trace is not None:
+            trace.stamp(stage)
+            self.finish(trace, end_to_end=True)
+
+    # -------------------- aggregation --------------------------
+    def _histogram(self, stage):
+        try:
+            return self._histogram_dict[stage]
+        except KeyError:
+            histogram = self._histogram_dict[stage] = Histogram(self.significant_bits)
+            return histogram
+
+    def finish(self, trace: Trace, end_to_end=False):
+        stamps = trace.stamps
+        start = max(trace.n_recorded, 1)
+        with self._lock:
+            for index in range(start, len(stamps)):
+                stage, ns = stamps[index]
+                self._histogram(stage).record(ns - stamps[index - 1][1])
+            if end_to_end and len(stamps) > 1:
+                self._histogram(TraceStage.END_TO_END).record(stamps[-1][1] - stamps[0][1])
+        trace.n_recorded = len(stamps)
+
+    def histograms(self) -> dict:
+        with self._lock:
+            return dict(self._histogram_dict)
+
+    def statistics(self, percentiles=(50, 90, 99, 99.9)) -> dict:
+        """
+        Per stage summary in microseconds.
+        """
+        with self._lock:
+            return {stage: self._histogram_dict[stage].summary(percentiles, scale=1e3)
+                    for stage in TraceStage.ALL if stage in self._histogram_dict}
+
+    def dump(self, file_name):
+        with self._lock:
+            stage_dict = {stage: histogram.to_dict() for stage, histogram in self._histogram_dict.items()}
+        with open(file_name, 'w') as f:
+            json.dump({'unit': 'ns', 'stages': stage_dict}, f, indent=2)
+
+
+TRACER = Tracer()
@@ -4,6 +4,7 @@ import sys
 import traceback
 import requests
 
+from concurrent.futures import Future
 from datetime import datetime
 from enum import Enum
 from multiprocessing.dummy import Pool
@@ -20,7 +21,19 @@ class RequestStatus(Enum):
     error = 3  # Exception raised
 
 
-pool: multiprocessing.pool.Pool = Pool(os.cpu_count() * 20)
+_pool: multiprocessing.pool.Pool = None
+_pool_lock = Lock()
+
+
+def get_pool() -> multiprocessing.pool.Pool:
+    """
+    Shared request pool, created on first use so clients driven by an event loop never spawn it.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = Pool(os.cpu_count() * 20)
+    return _pool
 
 
 class Request(object):
@@ -112,9 +125,10 @@ class RestClient(object):
         self.proxies = None
 
         self._tasks_lock = Lock()
-        self._tasks: List[multiprocessing.pool.AsyncResult] = []
+        self._tasks: List[Union[multiprocessing.pool.AsyncResult, Future]] = []
         self._sessions_lock = Lock()
         self._sessions: List[requests.Session] = []
+        self._event_loop = None
 
     def init(self, url_base: str, proxy_host: str = "", proxy_port: int = 0):
         """
@@ -127,6 +141,12 @@ class RestClient(object):
             proxy = f"{proxy_host}:{proxy_port}"
             self.proxies = {"http": proxy, "https": proxy}
 
+    def set_event_loop(self, event_loop):
+        """
+        Run requests on the executor of an EventLoop instead of the shared pool.
+        """
+        self._event_loop = event_loop
+
     def _create_session(self):
         """"""
         return requests.session()
@@ -150,7 +170,10 @@ class RestClient(object):
         Wait till all requests are processed.
         """
         for task in self._tasks:
-            task.wait()
+            if isinstance(task, Future):
+                task.exception()
+            else:
+                task.wait()
 
     def add_request(
         self,
@@ -188,12 +211,16 @@ class RestClient(object):
             on_error=on_error,
             extra=extra,
         )
-        task = pool.apply_async(
-            self._process_request,
-            args=[request, ],
-            callback=self._clean_finished_tasks,
-            # error_callback=lambda e: self.on_error(type(e), e, e.__traceback__, request),
-        )
+        if self._event_loop is not None:
+            task = self._event_loop.run_in_executor(self._process_request, request)
+            task.add_done_callback(self._clean_finished_tasks)
+        else:
+            task = get_pool().apply_async(
+                self._process_request,
+                args=[request, ],
+                callback=self._clean_finished_tasks,
+                # error_callback=lambda e: self.on_error(type(e), e, e.__traceback__, request),
+            )
         self._push_task(task)
         return request
 
@@ -203,7 +230,7 @@ class RestClient(object):
 
     def _clean_finished_tasks(self, result: None):
         with self._tasks_lock:
-            not_finished_tasks = [i for i in self._tasks if not i.ready()]
+            not_finished_tasks = [i for i in self._tasks if not (i.done() if isinstance(i, Future) else i.ready())]
             self._tasks = not_finished_tasks
 
     def _get_session(self):
@@ -1,13 +1,15 @@
+import asyncio
 import json
 import ssl
 import socket
 from datetime import datetime
 from threading import Lock, Thread
-from time import sleep
+from time import sleep, perf_counter
 
 import websocket
 
 from scikit_backtest.core import logger
+from jtrader.core.common.trace import TRACER
 
 
 class WebsocketClient(object):
@@ -28,8 +30,27 @@ class WebsocketClient(object):
 
         self._ping_interval = 60     # seconds
 
+        # set by set_event_loop, reads and pings are then driven by the loop instead of threads
+        self._event_loop = None
+        self._loop_future = None
+        self._reader_fd = None
+        self._disconnected = None
+        # the socket is non-blocking on the loop: bytes read until whole frames are in, payloads of a
+        # fragmented message, and bytes left to write once the socket is writable again
+        self._read_buffer = bytearray()
+        self._fragments = []
+        self._write_buffer = bytearray()
+        self._writing = False
+
+    def set_event_loop(self, event_loop):
+        self._event_loop = event_loop
+
     def start(self):
         self._active = True
+        if self._event_loop is not None:
+            self._loop_future = self._event_loop.submit(self._run_async())
+            return
+
         self._worker_thread = Thread(target=self._run)
         self._worker_thread.start()
 
@@ -38,9 +59,15 @@ class WebsocketClient(object):
 
     def stop(self):
         self._active = False
-        self._disconnect()
+        if self._loop_future is not None:
+            self._event_loop.call_soon(self._disconnect_async)
+        else:
+            self._disconnect()
 
     def join(self):
+        if self._loop_future is not None:
+            self._loop_future.result()
+            return
         self._ping_thread.join()
         self._worker_thread.join()
 
@@ -51,7 +78,10 @@ class WebsocketClient(object):
     def _send_text(self, text: str):
         ws = self._ws
         if ws:
-            ws.send(text, opcode=websocket.ABNF.OPCODE_TEXT)
+            if self._reader_fd is not None:
+                self._send_async(text, websocket.ABNF.OPCODE_TEXT)
+            else:
+                ws.send(text, opcode=websocket.ABNF.OPCODE_TEXT)
 
     def _ensure_connection(self):
         triggered = False
@@ -88,6 +118,8 @@ class WebsocketClient(object):
                     ws = self._ws
                     if ws:
                         text = ws.recv()
+                        if TRACER.enabled:
+                            TRACER.begin()
 
                         # ws object is closed when recv function is blocking
                         if not text:
@@ -101,6 +133,8 @@ class WebsocketClient(object):
                             raise e
 
                         self.on_packet(data)
+                        if TRACER.enabled:
+                            TRACER.release()
                 # ws is closed before recv function is called
                 # For socket.error, see Issue #1608
                 except (websocket.WebSocketConnectionClosedException, socket.error):
@@ -114,6 +148,168 @@ class WebsocketClient(object):
             logger.exception(e)
         self._disconnect()
 
+    async def _run_async(self):
+        loop = asyncio.get_event_loop()
+        ping_task = loop.create_task(self._run_ping_async())
+        try:
+            while self._active:
+                try:
+                    # connecting and the subscriptions sent by on_connected block, so they run on the executor
+                    await asyncio.wrap_future(self._event_loop.run_in_executor(self._ensure_connection))
+                except Exception as e:  # noqa
+                    logger.exception(e)
+                    self._disconnect()
+                    await asyncio.sleep(1)
+                    continue
+                ws = self._ws
+                if not ws or not ws.connected:
+                    self._disconnect()
+                    continue
+                self._disconnected = loop.create_future()
+                # reads must never wait for the rest of a frame, or of a tls record, on the loop thread
+                ws.sock.setblocking(False)
+                self._read_buffer.clear()
+                self._write_buffer.clear()
+                self._fragments = []
+                self._reader_fd = ws.sock.fileno()
+                loop.add_reader(self._reader_fd, self._on_readable, ws)
+                await self._disconnected
+        finally:
+            ping_task.cancel()
+            self._disconnect_async()
+
+    def _on_readable(self, ws: websocket.WebSocket):
+        start = perf_counter()
+        try:
+            sock = ws.sock
+            while True:
+                try:
+                    data = sock.recv(65536)
+                except (BlockingIOError, ssl.SSLWantReadError, ssl.SSLWantWriteError):
+                    break
+                if not data:
+                    raise websocket.WebSocketConnectionClosedException('Connection closed by peer')
+                self._read_buffer += data
+            self._on_frames()
+        except (websocket.WebSocketConnectionClosedException, socket.error):
+            self._disconnect_async()
+        except Exception as e:  # noqa
+            logger.exception(e)
+            self._disconnect_async()
+        self._event_loop.record('websocket.' + self.__class__.__name__, perf_counter() - start)
+
+    def _on_frames(self):
+        # handles the whole frames of the read buffer, a partial one is left for the next read
+        buffer = self._read_buffer
+        offset = 0
+        size = len(buffer)
+        while self._reader_fd is not None and size - offset >= 2:
+            first, second = buffer[offset], buffer[offset + 1]
+            position = offset + 2
+            length = second & 0x7f
+            if length >= 126:
+                n_bytes = 2 if length == 126 else 8
+                if size < position + n_bytes:
+                    break
+                length = int.from_bytes(buffer[position:position + n_bytes], 'big')
+                position += n_bytes
+            mask_key = None
+            if second & 0x80:
+                if size < position + 4:
+                    break
+                mask_key = bytes(buffer[position:position + 4])
+                position += 4
+            if size < position + length:
+                break
+            payload = bytes(buffer[position:position + length])
+            if mask_key is not None:
+                payload = websocket.ABNF.mask(mask_key, payload)
+            offset = position + length
+            if TRACER.enabled:
+                TRACER.begin()
+            self._on_frame(first & 0x80, first & 0x0f, payload)
+            if TRACER.enabled:
+                TRACER.release()
+        del buffer[:offset]
+
+    def _on_frame(self, fin, opcode, payload: bytes):
+        if opcode == websocket.ABNF.OPCODE_PING:
+            self._send_async(payload, websocket.ABNF.OPCODE_PONG)
+            return
+        if opcode == websocket.ABNF.OPCODE_CLOSE:
+            self._disconnect_async()
+            return
+        if opcode == websocket.ABNF.OPCODE_PONG:
+            return
+        if opcode == websocket.ABNF.OPCODE_CONT:
+            if not self._fragments:
+                return
+            self._fragments.append(payload)
+        elif opcode in (websocket.ABNF.OPCODE_TEXT, websocket.ABNF.OPCODE_BINARY):
+            self._fragments = [opcode, payload]
+        else:
+            return
+        if not fin:
+            return
+        opcode = self._fragments[0]
+        data = b''.join(self._fragments[1:])
+        self._fragments = []
+        if opcode == websocket.ABNF.OPCODE_TEXT:
+            self.on_packet(self.unpack_data(data.decode('utf-8')))
+        else:
+            self.on_packet(self.unpack_data(data))
+
+    def _send_async(self, payload, opcode):
+        # frames are written by the loop thread only, whichever thread sends them
+        data = websocket.ABNF.create_frame(payload, opcode).format()
+        if self._event_loop.in_loop_thread():
+            self._write(data)
+        else:
+            self._event_loop.call_soon(self._write, data)
+
+    def _write(self, data=b''):
+        ws = self._ws
+        if ws is None or self._reader_fd is None:
+            return
+        self._write_buffer += data
+        try:
+            while self._write_buffer:
+                # tls retries must be given the same bytes, which stay first in the buffer
+                sent = ws.sock.send(self._write_buffer)
+                del self._write_buffer[:sent]
+        except (BlockingIOError, ssl.SSLWantReadError, ssl.SSLWantWriteError):
+            pass
+        except (websocket.WebSocketConnectionClosedException, socket.error):
+            self._disconnect_async()
+            return
+        loop = self._event_loop.loop
+        if self._write_buffer and not self._writing:
+            loop.add_writer(self._reader_fd, self._write)
+            self._writing = True
+        elif not self._write_buffer and self._writing:
+            loop.remove_writer(self._reader_fd)
+            self._writing = False
+
+    def _disconnect_async(self):
+        # runs in the loop thread, the reader is removed before the socket is closed
+        if self._reader_fd is not None:
+            self._event_loop.loop.remove_reader(self._reader_fd)
+            if self._writing:
+                self._event_loop.loop.remove_writer(self._reader_fd)
+                self._writing = False
+            self._reader_fd = None
+        self._disconnect()
+        if self._disconnected is not None and not self._disconnected.done():
+            self._disconnected.set_result(None)
+
+    async def _run_ping_async(self):
+        while self._active:
+            await asyncio.sleep(self._ping_interval)
+            try:
+                self._ping()
+            except Exception as e:
+                logger.exception(e)
+
     @staticmethod
     def unpack_data(data: str):
         return json.loads(data)
@@ -136,7 +332,10 @@ class WebsocketClient(object):
         """"""
         ws = self._ws
         if ws:
-            ws.send("ping", websocket.ABNF.OPCODE_PING)
+            if self._reader_fd is not None:
+                self._send_async("ping", websocket.ABNF.OPCODE_PING)
+            else:
+                ws.send("ping", websocket.ABNF.OPCODE_PING)
 
     def on_connected(self):
         pass
@@ -7,6 +7,14 @@ import pandas as pd
 from jtrader.core.common import logger, format_function
 
 
+NS_PER_DAY = 86400 * 1000000000
+
+
+def _local_ns(dt: datetime.datetime) -> int:
+    # naive datetimes of the scheduler are local wall clock times
+    return int(dt.timestamp()) * 1000000000 + dt.microsecond * 1000
+
+
 class CancelJob(object):
     pass
 
@@ -25,18 +33,19 @@ class Job(object):
     def next_run_time(self):
         return self._next_run
 
-    def should_run(self, dt):
-        return dt >= self._next_run
+    def should_run(self, timestamp):
+        return timestamp >= self._next_run
 
     def run(self):
         ret = self._job_func(*self._args, **self._kwargs)
         return ret
 
-    def schedule_next_run(self, dt):
+    def schedule_next_run(self, timestamp):
         raise NotImplementedError
 
     def __init__(self, job_func, *args, **kwargs):
-        self._next_run: datetime = None
+        # epoch nanoseconds
+        self._next_run: int = None
         self._job_func = job_func
         self._args = args
         self._kwargs = kwargs
@@ -48,22 +57,23 @@ class OnTimeJob(Job):
         if isinstance(schedule_time, (list, tuple)):
             if len(schedule_time) == 0:
                 raise TypeError("Empty list is not allowed")
-            dts = pd.to_datetime(schedule_time).sort_values()
+            # times of the local day, as python datetimes: Timestamp.timestamp() would take them as UTC
+            dts = [_local_ns(dt) for dt in pd.to_datetime(schedule_time).sort_values().to_pydatetime()]
         elif isinstance(schedule_time, str):
-            freq = pd.to_timedelta(schedule_time)
-            n = int(datetime.timedelta(days=1).total_seconds() / freq.total_seconds())
-            today_time = datetime.datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+            freq = pd.to_timedelta(schedule_time).value
+            n = NS_PER_DAY // freq
+            today_time = _local_ns(datetime.datetime.today().replace(hour=0, minute=0, second=0, microsecond=0))
             dts = [today_time + i * freq for i in range(n)]
         else:
             raise TypeError("Expect string or list of string, got %s instead", type(schedule_time))
         self._time_deque = collections.deque(maxlen=len(dts))
         self._time_deque.extend(dts)
 
-    def schedule_next_run(self, dt):
-        delta = datetime.timedelta(days=1)
+    def schedule_next_run(self, timestamp):
+        delta = NS_PER_DAY
         while True:
             self._next_run = self._time_deque[0]
-            if self._next_run <= dt:
+            if self._next_run <= timestamp:
                 self._time_deque.append(self._next_run + delta)
             else:
                 break
@@ -72,10 +82,10 @@ class OnTimeJob(Job):
 class DelayJob(Job):
     def __init__(self, freq, job_func, *args, **kwargs):
         super(DelayJob, self).__init__(job_func, *args, **kwargs)
-        self._delay_time = pd.to_timedelta(freq)
+        self._delay_time = pd.to_timedelta(freq).value
 
-    def schedule_next_run(self, dt):
-        self._next_run = dt + self._delay_time
+    def schedule_next_run(self, timestamp):
+        self._next_run = timestamp + self._delay_time
 
 
 class OneOffJob(DelayJob):
@@ -6,7 +6,8 @@ from jtrader.core.common import logger, Engine
 
 
 class Scheduler(Engine):
-    clock_func = datetime.datetime.now
+    # epoch nanoseconds, jobs compare integers
+    clock_func = time.time_ns
 
     def __init__(self):
         super(Scheduler, self).__init__()
@@ -22,11 +23,11 @@ class Scheduler(Engine):
     def set_clock_func(self, clock_func):
         self.clock_func = clock_func
 
-    def run_pending(self, dt=None):
+    def run_pending(self, timestamp=None):
         if len(self._jobs):
-            if dt is None:
-                dt = self.clock_func()
-            runnable_jobs = (job for job in self._jobs if job.should_run(dt))
+            if timestamp is None:
+                timestamp = self.clock_func()
+            runnable_jobs = (job for job in self._jobs if job.should_run(timestamp))
             for job in runnable_jobs:
                 self._run_job(job)
 
@@ -42,7 +43,7 @@ class Scheduler(Engine):
         next_run_time = min(job.next_run_time() for job in self._jobs)
         now = self.clock_func()
         if next_run_time < now:
-            return now - next_run_time
+            return datetime.timedelta(microseconds=(now - next_run_time) // 1000)
         else:
             return datetime.timedelta(0)
 
@@ -77,6 +78,10 @@ class BusyScheduler(Scheduler):
         super(BusyScheduler, self).__init__()
         self._interval_time = interval_time
 
+    @property
+    def interval_time(self):
+        return self._interval_time
+
     def _process_jobs(self):
         self.run_pending()
         time.sleep(self._interval_time)
@@ -2,10 +2,18 @@
 # -*- coding: utf-8 -*-
 
 from .trades import TradeData, OrderData, FundingData, generate_id
-from .markets import HeartBeatData, DepthData, BarData, ContractData, FundingRateData
+from .markets import HeartBeatData, DepthData, ArrayDepthData, BarData, ContractData, FundingRateData
 from .positions import PositionData, PositionFactory, PnLData, BalanceData
 
 from .base import *
+from .symbols import *
+from .ids import *
+from .timestamps import *
 from .enums import *
 from .constants import *
 
+from .codec import *
+from .pool import *
+from .fixed_point import *
+from .rules import *
+from .contracts import *
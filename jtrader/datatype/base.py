@@ -1,12 +1,18 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from dataclasses import dataclass, asdict, astuple, fields, field
+from dataclasses import dataclass as _dataclass, asdict, astuple, fields, field, MISSING, FrozenInstanceError
 import datetime as dt
 import pandas as pd
 import typing
+import warnings
 import copy
 from collections import OrderedDict
+from itertools import starmap
+from operator import attrgetter
+import numpy as np
 from jtrader.datatype.enums import EnumEventType
+from jtrader.datatype.symbols import SYMBOL_REGISTRY
+from jtrader.datatype.timestamps import Timestamp, now_ns, to_ns, from_ns
 
 EMPTY_FLOAT = 0.0
 EMPTY_INT = 0
@@ -24,43 +30,323 @@ __all__ = [
 ]
 
 
-@dataclass
+def _slot_names(cls):
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    return [name for name in names if name not in ('__dict__', '__weakref__')]
+
+
+def _add_slots(cls, extra_slots=()):
+    # a class can not gain __slots__ once created, so it is rebuilt with the same namespace
+    field_names = [f.name for f in fields(cls)]
+    inherited = set(_slot_names(cls))
+    own_slots = tuple(name for name in field_names + list(extra_slots) if name not in inherited)
+
+    cls_dict = dict(cls.__dict__)
+    for name in own_slots:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    cls_dict['__slots__'] = own_slots
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
+
+def dataclass(_cls=None, *, slots=False, extra_slots=(), **kwargs):
+    """
+    dataclasses.dataclass with a ``slots`` option available on every python version.
+
+    A slotted class stores its own fields (and ``extra_slots``) in ``__slots__``, it has no instance
+    ``__dict__`` only if every base class is slotted too. Subclasses decorated without ``slots`` get a
+    ``__dict__`` back and keep working as plain dataclasses.
+    """
+
+    def wrap(cls):
+        cls = _dataclass(cls, **kwargs)
+        if slots:
+            cls = _add_slots(cls, extra_slots)
+        return cls
+
+    if _cls is None:
+        return wrap
+    return wrap(_cls)
+
+
+def _build_copier(cls):
+    # generated like the dataclass __init__, a slotted copy is then as fast as a __dict__ update
+    field_names = [f.name for f in fields(cls)]
+    lines = ['def __copy__(self):', '    new = _new(_cls)']
+    for name in _slot_names(cls):
+        if name in field_names:
+            lines.append('    new.{0} = self.{0}'.format(name))
+        else:
+            lines.append('    new.{0} = getattr(self, {0!r}, None)'.format(name))
+    if any('__slots__' not in klass.__dict__ for klass in cls.__mro__[:-1]):
+        lines.append('    new.__dict__.update(self.__dict__)')
+    lines.append('    return new')
+    namespace = {'_new': object.__new__, '_cls': cls}
+    exec('\n'.join(lines), namespace)
+    return namespace['__copy__']
+
+
+_copier_dict = {}
+_frozen_dict = {}
+_symbol_list = SYMBOL_REGISTRY.symbol_list
+_maker_dict = {}
+
+
+def _build_maker(cls, names):
+    # the dataclass __init__ unrolled for one set of columns, missing fields get their defaults
+    lines = ['def make({}):'.format(', '.join('_%d' % index for index in range(len(names)))),
+             '    new = _new(_cls)']
+    namespace = {'_new': object.__new__, '_cls': cls}
+    for f in fields(cls):
+        if f.name in names:
+            lines.append('    new.{} = _{}'.format(f.name, names.index(f.name)))
+        elif f.default_factory is not MISSING:
+            namespace['_factory_' + f.name] = f.default_factory
+            lines.append('    new.{0} = _factory_{0}()'.format(f.name))
+        else:
+            namespace['_default_' + f.name] = f.default
+            lines.append('    new.{0} = _default_{0}'.format(f.name))
+    lines.append('    return new')
+    exec('\n'.join(lines), namespace)
+    return namespace['make']
+
+
+def _frozen_setattr(self, name, value):
+    # private slots (_trace, _symbol_id) are bookkeeping and stay writable
+    if name in self.__dataclass_fields__:
+        raise FrozenInstanceError('cannot assign to field %r of a frozen %s, use evolve()' % (
+            name, self.__class__.__name__))
+    object.__setattr__(self, name, value)
+
+
+def _frozen_delattr(self, name):
+    if name in self.__dataclass_fields__:
+        raise FrozenInstanceError('cannot delete field %r of a frozen %s' % (name, self.__class__.__name__))
+    object.__delattr__(self, name)
+
+
+def _frozen_copy(self):
+    return self
+
+
+def _frozen_reduce(self, protocol):
+    return _restore_frozen, (self.evolve(),)
+
+
+def _restore_frozen(data):
+    return data.freeze()
+
+
+def _build_frozen(cls):
+    # a read-only twin with the same layout, so freezing is a __class__ swap and not a copy
+    namespace = {
+        '__slots__': (),
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+        'frozen': True,
+        '_thawed': cls,
+        '__setattr__': _frozen_setattr,
+        '__delattr__': _frozen_delattr,
+        '__copy__': _frozen_copy,
+        '__reduce_ex__': _frozen_reduce,
+    }
+    subclass_dict = getattr(cls, 'subclass_dict', None)
+    with warnings.catch_warnings():
+        # Registered classes see the twin as a subclass reusing their tag, it must not replace them
+        warnings.simplefilter('ignore')
+        frozen_cls = type(cls)(cls.__name__, (cls,), namespace)
+    if subclass_dict is not None and subclass_dict.get(getattr(cls, 'TAG', None)) is frozen_cls:
+        subclass_dict[cls.TAG] = cls
+    return frozen_cls
+
+
+def _to_array(values):
+    first = values[0]
+    if isinstance(first, dt.datetime) and first.tzinfo is None:
+        return pd.DatetimeIndex(values).values
+    if isinstance(first, (str, int, float, bool, np.generic)):
+        return np.asarray(values)
+    # lists, dicts and enums are kept as python objects
+    array = np.empty(len(values), dtype=object)
+    for index, value in enumerate(values):
+        array[index] = value
+    return array
+
+
+def _with_datetime(columns):
+    # timestamps shown as datetime64 under the name of the datetime they stand for
+    if 'timestamp' not in columns:
+        return columns
+    return OrderedDict(
+        ('datetime', np.asarray(values, dtype=np.int64).view('datetime64[ns]')) if name == 'timestamp' else
+        (name, values) for name, values in columns.items())
+
+
+def _to_timestamps(values):
+    dtype = getattr(values, 'dtype', None)
+    if isinstance(dtype, np.dtype) and dtype.kind == 'M':
+        return np.asarray(values).astype('datetime64[ns]').view(np.int64)
+    # datetimes, strings or time zone aware series
+    return pd.DatetimeIndex(values).asi8
+
+
+def _column_names(data_list):
+    # column order of the first type holding each field, like a DataFrame built from dicts
+    names = OrderedDict()
+    for data_type in OrderedDict.fromkeys(type(data) for data in data_list):
+        names.update((f.name, None) for f in fields(data_type))
+    return list(names)
+
+
+@dataclass(slots=True, extra_slots=('_trace', '_symbol_id'))
 class BaseData(object):
     EVENT_TYPE = EnumEventType
 
-    datetime: dt.datetime = field(default_factory=dt.datetime.utcnow)
+    frozen = False
+    _thawed = None
+
+    timestamp: Timestamp = field(default_factory=now_ns)
+
+    @property
+    def datetime(self) -> dt.datetime:
+        """
+        Naive UTC datetime of ``timestamp``, derived on access. Dicts and data frames show it in place of the
+        timestamp, which is what events are compared and ordered by.
+        """
+        return from_ns(self.timestamp)
+
+    @datetime.setter
+    def datetime(self, value):
+        self.timestamp = to_ns(value)
+
+    @property
+    def symbol_id(self) -> int:
+        """
+        Id of ``symbol`` in SYMBOL_REGISTRY, cached on the object.
+        """
+        symbol = self.symbol
+        try:
+            symbol_id = self._symbol_id
+            # symbols are often set after construction, a cached id is only used while it still matches
+            if _symbol_list[symbol_id] == symbol:
+                return symbol_id
+        except (AttributeError, TypeError):
+            pass
+        symbol_id = self._symbol_id = SYMBOL_REGISTRY.intern(symbol)
+        return symbol_id
 
     def to_dict(self, dict_factory: typing.Type[dict] = dict) -> dict:
-        return asdict(self, dict_factory=dict_factory)
+        result = asdict(self, dict_factory=dict_factory)
+        return dict_factory((('datetime', from_ns(value)) if key == 'timestamp' else (key, value))
+                            for key, value in result.items())
 
     def to_tuple(self, tuple_factory: typing.Type[tuple] = tuple) -> tuple:
         return astuple(self, tuple_factory=tuple_factory)
 
     @classmethod
-    def to_df(cls, data_list):
-        record_list = []
-        for data in data_list:
-            record_list.append(data.to_dict(OrderedDict))
-        data_df = pd.DataFrame(record_list)
-        return data_df
+    def to_columns(cls, data_list) -> OrderedDict:
+        """
+        Field name -> list of values, read with attribute getters instead of a dict per object.
+
+        Enums listed in COLUMN_ENUM are turned into their names and list/dict values are copied,
+        as ``to_dict`` does. Fields missing on some types of a mixed list are filled with NaN.
+        """
+        data_list = list(data_list)
+        columns = OrderedDict()
+        if not data_list:
+            return columns
+        data_type = type(data_list[0])
+        names = _column_names(data_list)
+        if all(type(data) is data_type for data in data_list):
+            for name in names:
+                columns[name] = list(map(attrgetter(name), data_list))
+        else:
+            for name in names:
+                columns[name] = [getattr(data, name, np.nan) for data in data_list]
+
+        get_name = attrgetter('name')
+        for name, values in columns.items():
+            first = values[0]
+            if name in getattr(data_type, 'COLUMN_ENUM', ()) and hasattr(first, 'name'):
+                columns[name] = list(map(get_name, values))
+            elif isinstance(first, (list, dict, np.ndarray)):
+                columns[name] = [copy.copy(value) for value in values]
+        return columns
+
+    @classmethod
+    def to_df(cls, data_list) -> pd.DataFrame:
+        """
+        Data frame of to_columns, with the timestamps as a datetime64 column ``datetime``.
+        """
+        columns = _with_datetime(cls.to_columns(data_list))
+        for name, values in columns.items():
+            if not isinstance(values, np.ndarray) and isinstance(values[0], dt.datetime) and \
+                    values[0].tzinfo is None:
+                # parsed in bulk, inferring the dtype of a list of datetimes is much slower
+                columns[name] = pd.DatetimeIndex(values)
+        return pd.DataFrame(columns)
+
+    @classmethod
+    def to_records(cls, data_list) -> np.recarray:
+        columns = _with_datetime(cls.to_columns(data_list))
+        if not columns:
+            return np.rec.array(np.empty(0))
+        return np.rec.fromarrays([_to_array(values) for values in columns.values()], names=list(columns))
 
     @classmethod
     def from_dict(cls, data_dict: dict):
         data = cls()
         field_dict = cls.__dict__['__dataclass_fields__']
         for key, value in data_dict.items():
-            if key in field_dict:
+            if key in field_dict or key == 'datetime':
                 setattr(data, key, value)
         return data
 
+    @classmethod
+    def from_columns(cls, column_dict: dict) -> list:
+        """
+        Build objects from field name -> sequence of values, names of COLUMN_ENUM are turned back into enums.
+        A ``datetime`` column (as written by to_df) fills the timestamps.
+        """
+        field_dict = cls.__dict__['__dataclass_fields__']
+        if 'datetime' in column_dict and 'timestamp' not in column_dict:
+            column_dict = dict(column_dict)
+            column_dict['timestamp'] = _to_timestamps(column_dict.pop('datetime'))
+        names = tuple(name for name in column_dict if name in field_dict)
+        if not names:
+            n_rows = len(next(iter(column_dict.values()))) if column_dict else 0
+            return [cls() for _ in range(n_rows)]
+
+        column_list = []
+        for name in names:
+            values = column_dict[name]
+            dtype = getattr(values, 'dtype', None)
+            if isinstance(dtype, np.dtype) and dtype.kind == 'M':
+                # datetime64 -> datetime in numpy, Series.tolist would create a Timestamp per row
+                values = np.asarray(values).astype('datetime64[us]').astype(object)
+            values = values.tolist() if hasattr(values, 'tolist') else list(values)
+            if name in getattr(cls, 'COLUMN_ENUM', ()):
+                enum_type = field_dict[name].type
+                enum_map = {member.name: member for member in enum_type}
+                enum_map.update((member, member) for member in enum_type)
+                values = [enum_map.get(value, value) for value in values]
+            column_list.append(values)
+
+        try:
+            make = _maker_dict[(cls, names)]
+        except KeyError:
+            make = _maker_dict[(cls, names)] = _build_maker(cls, names)
+        return list(starmap(make, zip(*column_list)))
+
     @classmethod
     def from_df(cls, df: pd.DataFrame):
-        data_list = [None] * len(df)
-        records = df.to_dict('records')
-        for index, record in enumerate(records):
-            data = cls.from_dict(record)
-            data_list[index] = data
-        return data_list
+        return cls.from_columns({name: df[name] for name in df.columns})
 
     @classmethod
     def fields(cls):
@@ -75,3 +361,50 @@ class BaseData(object):
 
     def copy(self):
         return copy.copy(self)
+
+    # -------------------- ownership --------------------------
+    def freeze(self):
+        """
+        Make the fields read-only in place and return self.
+
+        Published events are frozen, so every subscriber can share one object without a defensive copy;
+        copying a frozen object returns it as is.
+        """
+        cls = self.__class__
+        if not cls.frozen:
+            try:
+                frozen_cls = _frozen_dict[cls]
+            except KeyError:
+                frozen_cls = _frozen_dict[cls] = _build_frozen(cls)
+            self.__class__ = frozen_cls
+        return self
+
+    def snapshot(self):
+        """
+        Frozen view of the current state: self if already frozen, a frozen copy otherwise.
+        """
+        if self.frozen:
+            return self
+        return copy.copy(self).freeze()
+
+    def evolve(self, **changes):
+        """
+        Mutable copy with ``changes`` applied, the only way to derive a modified object from a frozen one.
+        """
+        cls = self._thawed or self.__class__
+        new = cls.__copy__(self)
+        field_dict = cls.__dataclass_fields__
+        for name, value in changes.items():
+            if name not in field_dict and name != 'datetime':
+                raise TypeError('%s has no field %r' % (cls.__name__, name))
+            setattr(new, name, value)
+        return new
+
+    def __copy__(self):
+        cls = self.__class__
+        cls = cls._thawed or cls
+        try:
+            copier = _copier_dict[cls]
+        except KeyError:
+            copier = _copier_dict[cls] = _build_copier(cls)
+        return copier(self)
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from enum import IntEnum
+import datetime as dt
+import typing
+import struct
+import json
+import zlib
+
+import numpy as np
+
+from jtrader.datatype.base import BaseData, fields, _build_maker
+from jtrader.datatype.timestamps import Timestamp, to_ns, from_ns
+from jtrader.datatype.markets import HeartBeatData, FundingRateData, DepthData, ArrayDepthData, MarketTradeData, \
+    BarData, ContractData
+from jtrader.datatype.trades import OrderData, TradeData, FundingData
+from jtrader.datatype.positions import PnLData, BalanceData, SpotPositionData, SwapPositionData, \
+    FuturesPositionData
+
+__all__ = [
+    'RecordSchema',
+    'BinaryCodec',
+    'CODEC',
+]
+
+
+def _to_bytes(value: str, size, name):
+    data = value.encode('utf-8')
+    if len(data) > size:
+        raise ValueError('%r does not fit the %d bytes of field %s' % (value, size, name))
+    return data
+
+
+def _from_bytes(data: bytes):
+    return data.rstrip(b'\0').decode('utf-8')
+
+
+def _to_json(value, size, name):
+    # empty dicts, the usual case, are left blank and skip json both ways
+    return _to_bytes(json.dumps(value), size, name) if value else b''
+
+
+def _from_json(data: bytes):
+    text = _from_bytes(data)
+    return json.loads(text) if text else {}
+
+
+def _to_floats(value, size, name):
+    value = np.ravel(value)
+    if len(value) != size:
+        raise ValueError('%d values given for the %d of field %s' % (len(value), size, name))
+    return value.tolist()
+
+
+def _array_to_floats(value, shape, name):
+    if np.shape(value) != shape:
+        raise ValueError('Array of shape %s given for the %s of field %s' % (np.shape(value), shape, name))
+    return np.ravel(value).tolist()
+
+
+class RecordSchema(object):
+    """
+    Fixed size little endian record of one BaseData class: a (tag, version) header then the fields in
+    declaration order, without padding so numpy can view a buffer of records in place.
+
+    floats, ints, bools and timestamps are packed as is, enums as int32, datetimes as int64 ns since the epoch
+    (NaT for None), strings as null padded utf-8 of ``STR_SIZE`` bytes, dicts as json of ``JSON_SIZE`` bytes and float
+    lists with the size of their default. Sizes can be overridden per field with a class attribute
+    ``CODEC_SIZE = {field name: size}``; values not fitting raise ValueError. The version is a checksum of the
+    layout, so records written with another definition of the class are refused.
+
+    Arrays may take any shape, as the books of ArrayDepthData.with_depth: their dims are packed as int32 right
+    after the header and every shape has its own fixed size schema, see ``of`` and ``at``.
+    """
+
+    HEADER = struct.Struct('<HH')
+    STR_SIZE = 40
+    JSON_SIZE = 128
+
+    def __init__(self, cls, tag, shapes=None):
+        super(RecordSchema, self).__init__()
+        self.cls = cls
+        self.tag = tag
+        self.field_names = tuple(f.name for f in fields(cls))
+
+        format_list = ['<HH']
+        dtype_list = [('_tag', '<u2'), ('_version', '<u2')]
+        # python expressions reading every packed value from obj and building every field from the unpacked v
+        pack_list = ['_tag', '_version']
+        field_list = []
+        namespace = {'_to_ns': to_ns, '_from_ns': from_ns, '_to_bytes': _to_bytes, '_from_bytes': _from_bytes,
+                     '_to_json': _to_json, '_from_json': _from_json, '_to_floats': _to_floats,
+                     '_array_to_floats': _array_to_floats, '_np': np}
+        size_dict = getattr(cls, 'CODEC_SIZE', {})
+        index = 2
+
+        # shapes of the array fields, the defaults unless given, packed after the header
+        shape_dict = dict(shapes or {})
+        for f in fields(cls):
+            default = f.default_factory() if callable(f.default_factory) else f.default
+            if isinstance(default, np.ndarray):
+                shape = shape_dict.setdefault(f.name, np.shape(default))
+                format_list.append('%di' % len(shape))
+                dtype_list.append(('_shape_' + f.name, '<i4', (len(shape),)))
+                pack_list.extend(str(n) for n in shape)
+                index += len(shape)
+        self.array_names = tuple(shape_dict)
+        self.shapes = tuple(tuple(shape_dict[name]) for name in self.array_names)
+        self._shape_struct = struct.Struct(''.join(format_list)) if self.array_names else None
+        self._variants = {self.shapes: self}
+
+        for f in fields(cls):
+            name = f.name
+            field_type = f.type
+            default = f.default_factory() if callable(f.default_factory) else f.default
+            size = size_dict.get(name)
+            if isinstance(field_type, type) and issubclass(field_type, IntEnum):
+                namespace['_enum_' + name] = field_type
+                format_list.append('i')
+                dtype_list.append((name, '<i4'))
+                pack_list.append('obj.%s' % name)
+                field_list.append('_enum_%s(v[%d])' % (name, index))
+            elif field_type is bool:
+                format_list.append('?')
+                dtype_list.append((name, '?'))
+                pack_list.append('obj.%s' % name)
+                field_list.append('v[%d]' % index)
+            elif field_type is int:
+                format_list.append('q')
+                dtype_list.append((name, '<i8'))
+                pack_list.append('obj.%s' % name)
+                field_list.append('v[%d]' % index)
+            elif field_type is float:
+                format_list.append('d')
+                dtype_list.append((name, '<f8'))
+                pack_list.append('obj.%s' % name)
+                field_list.append('v[%d]' % index)
+            elif field_type is Timestamp:
+                format_list.append('q')
+                dtype_list.append((name, '<M8[ns]'))
+                pack_list.append('obj.%s' % name)
+                field_list.append('v[%d]' % index)
+            elif field_type is dt.datetime:
+                format_list.append('q')
+                dtype_list.append((name, '<M8[ns]'))
+                pack_list.append('_to_ns(obj.%s)' % name)
+                field_list.append('_from_ns(v[%d])' % index)
+            elif field_type is str:
+                size = size or self.STR_SIZE
+                format_list.append('%ds' % size)
+                dtype_list.append((name, 'S%d' % size))
+                pack_list.append('_to_bytes(obj.%s, %d, %r)' % (name, size, name))
+                field_list.append('_from_bytes(v[%d])' % index)
+            elif field_type is dict:
+                size = size or self.JSON_SIZE
+                format_list.append('%ds' % size)
+                dtype_list.append((name, 'S%d' % size))
+                pack_list.append('_to_json(obj.%s, %d, %r)' % (name, size, name))
+                field_list.append('_from_json(v[%d])' % index)
+            elif isinstance(default, np.ndarray):
+                shape = shape_dict[name]
+                size = int(np.prod(shape))
+                format_list.append('%dd' % size)
+                dtype_list.append((name, '<f8', shape))
+                pack_list.append('*_array_to_floats(obj.%s, %r, %r)' % (name, shape, name))
+                field_list.append('_np.array(v[%d:%d]).reshape(%r)' % (index, index + size, shape))
+                index += size
+                continue
+            elif isinstance(default, list):
+                size = len(default)
+                format_list.append('%dd' % size)
+                dtype_list.append((name, '<f8', (size,)))
+                pack_list.append('*_to_floats(obj.%s, %d, %r)' % (name, size, name))
+                field_list.append('list(v[%d:%d])' % (index, index + size))
+                index += size
+                continue
+            else:
+                raise TypeError('Field %s of %s has no binary encoding for %s' % (name, cls.__name__, field_type))
+            index += 1
+
+        self.format = ''.join(format_list)
+        self.version = zlib.crc32(repr((self.format, self.field_names)).encode()) & 0xFFFF
+        self.struct = struct.Struct(self.format)
+        self.size = self.struct.size
+        self.dtype = np.dtype(dtype_list)
+        assert self.dtype.itemsize == self.size
+
+        namespace.update({'_tag': tag, '_version': self.version, '_pack': self.struct.pack,
+                          '_pack_into': self.struct.pack_into, '_unpack_from': self.struct.unpack_from,
+                          '_make': _build_maker(cls, self.field_names)})
+        values = ', '.join(pack_list)
+        source = '\n'.join([
+            'def encode(obj):',
+            '    return _pack(%s)' % values,
+            'def encode_into(buffer, offset, obj):',
+            '    _pack_into(buffer, offset, %s)' % values,
+            'def decode(buffer, offset):',
+            '    v = _unpack_from(buffer, offset)',
+            '    return _make(%s)' % ', '.join(field_list),
+        ])
+        exec(source, namespace)
+        self.encode = namespace['encode']
+        self.encode_into = namespace['encode_into']
+        self._decode = namespace['decode']
+
+    def __repr__(self):
+        return '%s(%s, tag=%d, version=%d, size=%d)' % (
+            self.__class__.__name__, self.cls.__name__, self.tag, self.version, self.size)
+
+    def _variant(self, shapes):
+        try:
+            return self._variants[shapes]
+        except KeyError:
+            schema = RecordSchema(self.cls, self.tag, dict(zip(self.array_names, shapes)))
+            # variants share the cache, whichever of them is asked
+            schema._variants = self._variants
+            self._variants[shapes] = schema
+            return schema
+
+    def of(self, obj) -> 'RecordSchema':
+        """
+        Schema of the shapes of the arrays of obj, self when they are the ones of this schema.
+        """
+        if self._shape_struct is None:
+            return self
+        shapes = tuple(np.shape(getattr(obj, name)) for name in self.array_names)
+        return self if shapes == self.shapes else self._variant(shapes)
+
+    def at(self, buffer, offset=0) -> 'RecordSchema':
+        """
+        Schema of the shapes packed in the record at offset.
+        """
+        if self._shape_struct is None:
+            return self
+        dims = iter(self._shape_struct.unpack_from(buffer, offset)[2:])
+        shapes = tuple(tuple(next(dims) for _ in shape) for shape in self.shapes)
+        return self if shapes == self.shapes else self._variant(shapes)
+
+    def decode(self, buffer, offset=0):
+        tag, version = self.HEADER.unpack_from(buffer, offset)
+        if tag != self.tag or version != self.version:
+            raise ValueError('Record (%d, %d) at %d is not a %r' % (tag, version, offset, self))
+        return self._decode(buffer, offset)
+
+
+class BinaryCodec(object):
+    """
+    Schema driven binary format of BaseData, one RecordSchema per registered class.
+
+    encode/decode handle single records and concatenated records of any registered types, decode_array views
+    a buffer of records of one type as a numpy structured array without copying.
+    """
+
+    def __init__(self):
+        super(BinaryCodec, self).__init__()
+        self._class_dict: typing.Dict[type, RecordSchema] = {}
+        self._tag_dict: typing.Dict[int, RecordSchema] = {}
+
+    def register(self, cls, tag) -> RecordSchema:
+        if tag in self._tag_dict and self._tag_dict[tag].cls is not cls:
+            raise ValueError('Tag %d already assigned to %s' % (tag, self._tag_dict[tag].cls.__name__))
+        schema = RecordSchema(cls, tag)
+        self._class_dict[cls] = schema
+        self._tag_dict[tag] = schema
+        return schema
+
+    def schema(self, cls) -> RecordSchema:
+        try:
+            return self._class_dict[cls]
+        except KeyError:
+            # frozen snapshots share the schema of their class
+            thawed = getattr(cls, '_thawed', None)
+            if thawed in self._class_dict:
+                schema = self._class_dict[cls] = self._class_dict[thawed]
+                return schema
+            raise KeyError('%s is not registered in %s' % (cls.__name__, self.__class__.__name__))
+
+    def encode(self, data: BaseData) -> bytes:
+        return self.schema(type(data)).of(data).encode(data)
+
+    def encode_many(self, data_list) -> bytearray:
+        """
+        Records of data_list packed one after the other into a single buffer.
+        """
+        schema_list = [self.schema(type(data)).of(data) for data in data_list]
+        buffer = bytearray(sum(schema.size for schema in schema_list))
+        offset = 0
+        for schema, data in zip(schema_list, data_list):
+            schema.encode_into(buffer, offset, data)
+            offset += schema.size
+        return buffer
+
+    def decode(self, buffer, offset=0) -> BaseData:
+        tag, _ = RecordSchema.HEADER.unpack_from(buffer, offset)
+        try:
+            schema = self._tag_dict[tag]
+        except KeyError:
+            raise ValueError('Unknown record tag %d at %d' % (tag, offset))
+        return schema.at(buffer, offset).decode(buffer, offset)
+
+    def decode_many(self, buffer) -> list:
+        data_list = []
+        offset = 0
+        end = len(buffer)
+        tag_dict = self._tag_dict
+        while offset < end:
+            tag, _ = RecordSchema.HEADER.unpack_from(buffer, offset)
+            try:
+                schema = tag_dict[tag]
+            except KeyError:
+                raise ValueError('Unknown record tag %d at %d' % (tag, offset))
+            schema = schema.at(buffer, offset)
+            data_list.append(schema.decode(buffer, offset))
+            offset += schema.size
+        return data_list
+
+    def decode_array(self, buffer, cls) -> np.ndarray:
+        """
+        Structured array viewing buffer, which must hold records of cls only, with arrays of one shape.
+        """
+        schema = self.schema(cls)
+        if len(buffer):
+            schema = schema.at(buffer)
+        array = np.frombuffer(buffer, dtype=schema.dtype)
+        if len(array) and ((array['_tag'] != schema.tag).any() or (array['_version'] != schema.version).any()):
+            raise ValueError('Buffer holds records other than %r' % schema)
+        return array
+
+
+CODEC = BinaryCodec()
+
+# tags are part of the wire format, new classes get new tags and existing ones are never reassigned
+for _tag, _cls in enumerate([HeartBeatData, FundingRateData, DepthData, ArrayDepthData, MarketTradeData, BarData,
+                             ContractData, OrderData, TradeData, FundingData, PnLData, BalanceData,
+                             SpotPositionData, SwapPositionData, FuturesPositionData], 1):
+    CODEC.register(_cls, _tag)
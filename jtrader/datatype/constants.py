@@ -11,6 +11,8 @@ TIME_INTERVAL_MAP = {
     ['1s', '15s', '1m', '5m', '10m', '15m', '20m', '30m', '45m',
      '1h', '2h', '3h', '4h', '1d']
 }
+# the same intervals in nanoseconds, for timestamps
+INTERVAL_NS_MAP = {frequency: delta.value for frequency, delta in TIME_INTERVAL_MAP.items()}
 
 
 class ContractTypeAbbr(object):
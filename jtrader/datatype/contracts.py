@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import typing
+import time
+import os
+
+import numpy as np
+import pandas as pd
+
+from jtrader.datatype.base import _to_array
+from jtrader.datatype.markets import ContractData
+from jtrader.datatype.symbols import SYMBOL_REGISTRY
+from jtrader.datatype.timestamps import now_ns, NS_PER_SECOND
+from jtrader.datatype.constants import ContractTypeAbbr
+from jtrader.datatype.enums import EnumOrderCheck
+from jtrader.datatype.fixed_point import EPSILON, STRETCH, multiplier_of
+from jtrader.datatype.rules import ContractRule, BasketCheck
+from jtrader.core.common import logger
+
+__all__ = [
+    'ContractRegistry',
+    'CONTRACTS',
+]
+
+_DATA_DIR = os.path.dirname(__file__)
+
+
+class ContractRegistry(object):
+    """
+    Contracts by symbol and by symbol id, plus their numeric fields as numpy columns indexed by symbol id
+    (NaN where a symbol has no contract) for vectorized checks over many orders. ``rule`` gives the compiled
+    order checks of one contract, ``check_orders`` runs the same checks over a basket of orders.
+
+    ``load`` reads the binary cache written by ``save`` (one numpy column per field, loaded without pickle)
+    while it is younger than ``ttl`` seconds, the csv file otherwise. Exchange apis refetch only when
+    ``exchange_contracts`` finds no fresh contract of their exchange, and ``update`` the registry with what
+    they fetched.
+    """
+
+    COLUMN_FIELDS = ('multiplier', 'lot_size', 'tick_size', 'max_price', 'min_price', 'max_quantity',
+                     'min_quantity', 'max_notional', 'min_notional')
+    # columns read by check_orders, gathered as one row per order
+    RULE_COLUMNS = ('tick_multiplier', 'tick_size', 'lot_multiplier', 'lot_size', 'is_spot', 'multiplier',
+                    'min_price', 'max_notional', 'max_quantity', 'min_notional', 'min_quantity')
+
+    def __init__(self, csv_path=None, cache_path=None, ttl=24 * 3600):
+        super(ContractRegistry, self).__init__()
+        self.csv_path = csv_path or os.path.join(_DATA_DIR, 'contracts.csv')
+        self.cache_path = cache_path or os.path.join(_DATA_DIR, 'contracts.bin')
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        # shared with ContractData, whose lookups read them directly
+        self._contract_dict: typing.Dict[str, ContractData] = ContractData._contracts
+        self._contract_list: typing.List[typing.Optional[ContractData]] = ContractData._contract_list
+        self._column_dict: typing.Dict[str, np.ndarray] = {}
+        self._rule_dict: typing.Dict[str, ContractRule] = {}
+        self._rule_table = np.full((1, len(self.RULE_COLUMNS)), np.nan)
+
+    def __repr__(self):
+        return '%s(%d contracts)' % (self.__class__.__name__, len(self._contract_dict))
+
+    def __len__(self):
+        return len(self._contract_dict)
+
+    def __contains__(self, symbol):
+        return symbol in self._contract_dict
+
+    def __getitem__(self, symbol) -> ContractData:
+        return self._contract_dict[symbol]
+
+    def configure(self, contract_config: dict):
+        self.csv_path = contract_config.get('csv_path', self.csv_path)
+        self.cache_path = contract_config.get('cache_path', self.cache_path)
+        self.ttl = contract_config.get('ttl', self.ttl)
+
+    @property
+    def contracts(self) -> typing.Dict[str, ContractData]:
+        return self._contract_dict
+
+    # -------------------- loading --------------------------
+    def load(self, force_csv=False) -> typing.Dict[str, ContractData]:
+        """
+        Fill the registry from the binary cache if fresh, from the csv file otherwise (the cache is then
+        rewritten). Returns the contracts by symbol.
+        """
+        with self._lock:
+            if force_csv or not self.load_cache():
+                self.load_csv()
+                if self._contract_dict:
+                    self.save()
+            return self._contract_dict
+
+    def cache_age(self) -> float:
+        """
+        Seconds since the cache was written, inf without cache.
+        """
+        try:
+            return time.time() - os.path.getmtime(self.cache_path)
+        except OSError:
+            return float('inf')
+
+    def load_cache(self) -> bool:
+        if self.cache_age() > self.ttl:
+            return False
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as cache:
+                if set(cache.files) != set(ContractData.fields()):
+                    raise ValueError('fields %s' % ', '.join(sorted(cache.files)))
+                contract_list = ContractData.from_columns({name: cache[name] for name in cache.files})
+        except (OSError, ValueError, KeyError) as e:
+            # unreadable or written with another ContractData layout
+            logger.info('%s ignores contract cache %s: %s', self, self.cache_path, e)
+            return False
+        self.update(contract_list)
+        return True
+
+    def load_csv(self) -> bool:
+        if not os.path.exists(self.csv_path):
+            return False
+        self.reset(pd.read_csv(self.csv_path, index_col=False))
+        return True
+
+    def save(self, cache_path=None):
+        cache_path = cache_path or self.cache_path
+        with self._lock:
+            column_dict = ContractData.to_columns(list(self._contract_dict.values()))
+        try:
+            array_dict = {name: _to_array(values) for name, values in column_dict.items()}
+            # written through a file object, np.savez would append .npz to a path
+            with open(cache_path + '.tmp', 'wb') as f:
+                np.savez(f, **array_dict)
+            os.replace(cache_path + '.tmp', cache_path)
+        except (OSError, ValueError) as e:
+            logger.info('%s could not write contract cache %s: %s', self, cache_path, e)
+
+    def reset(self, contract_df: pd.DataFrame):
+        self.update(ContractData.from_df(contract_df))
+
+    def update(self, contracts: typing.Iterable[ContractData]):
+        """
+        Add or replace contracts, their columns are rebuilt once for the whole batch.
+        """
+        with self._lock:
+            contract_list = self._contract_list
+            for contract in contracts:
+                self._contract_dict[contract.symbol] = contract
+                symbol_id = SYMBOL_REGISTRY.intern(contract.symbol)
+                if symbol_id >= len(contract_list):
+                    contract_list.extend([None] * (symbol_id + 1 - len(contract_list)))
+                contract_list[symbol_id] = contract
+            self._build_columns()
+            self._rule_dict = {}
+
+    def clear(self):
+        with self._lock:
+            self._contract_dict.clear()
+            del self._contract_list[:]
+            self._column_dict = {}
+            self._rule_dict = {}
+            self._rule_table = np.full((1, len(self.RULE_COLUMNS)), np.nan)
+
+    def _build_columns(self):
+        contract_list = self._contract_list
+        present = np.array([contract is not None for contract in contract_list], dtype=bool)
+        column_dict = {}
+        for name in self.COLUMN_FIELDS:
+            column = np.full(len(contract_list), np.nan)
+            column[present] = [getattr(contract, name) for contract in contract_list if contract is not None]
+            column_dict[name] = column
+        for name in ('tick', 'lot'):
+            column_dict[name + '_multiplier'] = np.array([multiplier_of(size) for size in column_dict[name + '_size']])
+        column_dict['is_spot'] = np.array([
+            contract is not None and contract.contract_type == ContractTypeAbbr.SPOT for contract in contract_list
+        ], dtype=bool)
+        # a last row of NaN for symbol ids without a contract
+        rule_table = np.full((len(contract_list) + 1, len(self.RULE_COLUMNS)), np.nan)
+        for index, name in enumerate(self.RULE_COLUMNS):
+            rule_table[:-1, index] = column_dict[name]
+        # swapped in one assignment each, readers never see a half built set of columns
+        self._column_dict = column_dict
+        self._rule_table = rule_table
+
+    # -------------------- lookups --------------------------
+    def get(self, symbol) -> ContractData:
+        return self._contract_dict[symbol]
+
+    def get_by_id(self, symbol_id) -> ContractData:
+        contract_list = self._contract_list
+        contract = contract_list[symbol_id] if symbol_id < len(contract_list) else None
+        if contract is None:
+            raise KeyError(SYMBOL_REGISTRY.get_symbol(symbol_id))
+        return contract
+
+    def rule(self, symbol) -> ContractRule:
+        """
+        Compiled order checks of the contract of symbol, rebuilt after contracts are updated.
+        """
+        try:
+            return self._rule_dict[symbol]
+        except KeyError:
+            rule = self._rule_dict[symbol] = ContractRule(ContractData.get_contract(symbol))
+            return rule
+
+    def exchange_contracts(self, exchange, max_age=None) -> typing.Dict[str, ContractData]:
+        """
+        Contracts of one exchange, none unless all of them were fetched less than ``max_age`` seconds ago
+        (``ttl`` by default).
+        """
+        max_age = self.ttl if max_age is None else max_age
+        oldest = now_ns() - max_age * NS_PER_SECOND
+        with self._lock:
+            contract_dict = {symbol: contract for symbol, contract in self._contract_dict.items()
+                             if contract.exchange == exchange}
+        if any(contract.timestamp < oldest for contract in contract_dict.values()):
+            return {}
+        return contract_dict
+
+    def column(self, name) -> np.ndarray:
+        """
+        Values of a numeric field indexed by symbol id, the array is replaced (never modified) on updates.
+        """
+        # contracts are loaded on first use, as for single symbol lookups
+        ContractData.contracts()
+        return self._column_dict[name]
+
+    def symbol_ids(self, symbols) -> np.ndarray:
+        intern = SYMBOL_REGISTRY.intern
+        return np.fromiter((intern(symbol) for symbol in symbols), dtype=np.intp, count=len(symbols))
+
+    def _column_of(self, name, symbol_ids):
+        column = self.column(name)
+        symbol_ids = np.asarray(symbol_ids, dtype=np.intp)
+        if len(symbol_ids) and symbol_ids.max() >= len(column):
+            raise KeyError(SYMBOL_REGISTRY.get_symbol(int(symbol_ids.max())))
+        return column[symbol_ids]
+
+    @staticmethod
+    def _to_float(units, multiplier, size):
+        # FixedPoint.to_float
+        return np.where(multiplier >= 1.0, units / multiplier, units * size)
+
+    @classmethod
+    def _round(cls, prices, tick_multiplier, tick_size):
+        ticks = prices * (tick_multiplier * STRETCH)
+        ticks = np.trunc(ticks + np.copysign(0.5 + EPSILON, ticks))
+        return np.where(tick_multiplier > 0, cls._to_float(ticks, tick_multiplier, tick_size), prices)
+
+    @classmethod
+    def _floor(cls, volumes, lot_multiplier, lot_size):
+        lots = volumes * (lot_multiplier * STRETCH)
+        lots = np.trunc(lots + np.copysign(EPSILON, lots))
+        return np.where(lot_multiplier > 0, cls._to_float(lots, lot_multiplier, lot_size), volumes)
+
+    def round_prices(self, symbol_ids, prices) -> np.ndarray:
+        """
+        Prices rounded to a whole number of ticks of their contract, as ContractRule does, unchanged where the
+        tick size is 0 or unknown.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        return self._round(prices, self._column_of('tick_multiplier', symbol_ids),
+                           self._column_of('tick_size', symbol_ids))
+
+    def floor_volumes(self, symbol_ids, volumes) -> np.ndarray:
+        """
+        Volumes floored to a whole number of lots of their contract, as ContractRule does, unchanged where the
+        lot size is 0 or unknown.
+        """
+        volumes = np.asarray(volumes, dtype=np.float64)
+        return self._floor(volumes, self._column_of('lot_multiplier', symbol_ids),
+                           self._column_of('lot_size', symbol_ids))
+
+    def check_orders(self, symbols, prices, volumes) -> BasketCheck:
+        """
+        ContractRule checks of a basket of orders at once, by symbols or symbol ids. Orders are not modified,
+        the rounded prices and volumes are returned with the first broken EnumOrderCheck of each order;
+        symbols without a contract are NO_CONTRACT.
+        """
+        if len(symbols) and isinstance(symbols[0], str):
+            symbol_ids = self.symbol_ids(symbols)
+        else:
+            symbol_ids = np.asarray(symbols, dtype=np.intp)
+        ContractData.contracts()
+        rule_table = self._rule_table
+        rows = rule_table[np.minimum(symbol_ids, len(rule_table) - 1)]
+        tick_multiplier, tick_size, lot_multiplier, lot_size, is_spot, multiplier, min_price, max_notional, \
+            max_quantity, min_notional, min_quantity = rows.T
+        prices = self._round(np.asarray(prices, dtype=np.float64), tick_multiplier, tick_size)
+        volumes = self._floor(np.asarray(volumes, dtype=np.float64), lot_multiplier, lot_size)
+
+        quantities = np.abs(volumes)
+        notionals = np.where(is_spot > 0, quantities * prices, quantities)
+        reasons = np.zeros(len(symbol_ids), dtype=np.int8)
+        # the first broken limit wins, as in ContractRule: assigned from the last check to the first,
+        # comparisons with NaN (no limit) are all False
+        reasons[prices < min_price] = EnumOrderCheck.MIN_PRICE
+        reasons[notionals > max_notional] = EnumOrderCheck.MAX_NOTIONAL
+        reasons[quantities > max_quantity] = EnumOrderCheck.MAX_QUANTITY
+        reasons[notionals < min_notional] = EnumOrderCheck.MIN_NOTIONAL
+        reasons[quantities < min_quantity] = EnumOrderCheck.MIN_QUANTITY
+        reasons[np.isnan(multiplier)] = EnumOrderCheck.NO_CONTRACT
+        return BasketCheck(prices, volumes, reasons)
+
+CONTRACTS = ContractRegistry()
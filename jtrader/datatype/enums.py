@@ -2,10 +2,32 @@
 # -*- coding: utf-8 -*-
 from enum import auto, unique, IntEnum as _IntEnum
 
+# composite topics per enum member are interned until the cache reaches this size
+MAX_INTERNED_TOPICS = 10000
+
 
 class IntEnum(_IntEnum):
     def __add__(self, other):
-        return self, other
+        # interned, for bounded key spaces only: symbols, strategy ids, frequencies
+        try:
+            topic_cache = self._composite_topics
+        except AttributeError:
+            topic_cache = self._composite_topics = {}
+        try:
+            return topic_cache[other]
+        except KeyError:
+            if len(topic_cache) >= MAX_INTERNED_TOPICS:
+                topic_cache.clear()
+            topic = topic_cache[other] = (self, other)
+            return topic
+        except TypeError:
+            return self, other
+
+    def composite(self, key):
+        """
+        Composite topic equal to ``self + key`` but not interned, for unbounded keys like client order ids.
+        """
+        return self, key
 
     @classmethod
     def int_enum_map(cls, reverse=False):
@@ -115,6 +137,16 @@ class EnumContractType(IntEnum):
     FX = auto()
 
 
+class EnumOrderCheck(IntEnum):
+    PASSED = 0
+    MIN_QUANTITY = auto()
+    MIN_NOTIONAL = auto()
+    MAX_QUANTITY = auto()
+    MAX_NOTIONAL = auto()
+    MIN_PRICE = auto()
+    NO_CONTRACT = auto()
+
+
 class EnumBookDirection(IntEnum):
     BID = auto()
     ASK = auto()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import typing
+import math
+
+__all__ = [
+    'FixedPoint',
+    'DEFAULT_SIZE',
+    'multiplier_of',
+]
+
+# scale of prices and volumes whose contract sets no tick or lot size
+DEFAULT_SIZE = 1e-8
+
+# tolerance, in units, for products a float left just under a whole number of units (4.35 * 100 is
+# 434.99999999999994), plus a relative one for large numbers of units (1000.0 of a 1e-08 lot)
+EPSILON = 1e-7
+STRETCH = 1.0 + 1e-14
+
+
+def multiplier_of(size) -> float:
+    """
+    Units per 1.0 of a size, a whole number for the decimal sizes of exchanges (1 / 1e-05 is 99999.99999999999);
+    NaN for sizes not set.
+    """
+    size = float(size)
+    if not size > 0:
+        return float('nan')
+    multiplier = 1.0 / size
+    whole = round(multiplier)
+    if whole and abs(multiplier - whole) < EPSILON:
+        return float(whole)
+    return multiplier
+
+
+class FixedPoint(object):
+    """
+    A tick or lot size as a scale of integer units. ``floor``, ``ceil`` and ``round`` turn a float into a whole
+    number of units, ``to_float`` turns units back into the float nearest to their decimal value: on a 0.1 tick,
+    0.1 + 0.2 rounds to 3 ticks and 3 ticks are 0.3.
+
+    Units compare and add exactly, values only become floats again at the edges (orders, trades, logs).
+    """
+    __slots__ = ('size', 'multiplier', '_stretched', '_shrunk', '_divide')
+
+    _SCALES: typing.Dict[float, 'FixedPoint'] = {}
+
+    def __init__(self, size):
+        super(FixedPoint, self).__init__()
+        size = float(size)
+        if not size > 0:
+            raise ValueError('Size of a fixed point scale should be positive, got %s' % size)
+        self.size = size
+        self.multiplier = multiplier_of(size)
+        self._stretched = self.multiplier * STRETCH
+        self._shrunk = self.multiplier / STRETCH
+        # a whole multiplier divides exactly into the nearest float, 3 / 10.0 is 0.3 when 3 * 0.1 is not
+        self._divide = self.multiplier >= 1.0
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.size)
+
+    @classmethod
+    def of(cls, size) -> 'FixedPoint':
+        """
+        Shared scale of a size, DEFAULT_SIZE for sizes not set.
+        """
+        size = float(size)
+        if not size > 0:
+            size = DEFAULT_SIZE
+        scale = cls._SCALES.get(size)
+        if scale is None:
+            scale = cls._SCALES[size] = cls(size)
+        return scale
+
+    def floor(self, value) -> int:
+        """
+        Whole units of value, towards zero.
+        """
+        units = value * self._stretched
+        return int(units + EPSILON) if units >= 0 else int(units - EPSILON)
+
+    def ceil(self, value) -> int:
+        """
+        Whole units of value, away from zero.
+        """
+        units = value * self._shrunk
+        return math.ceil(units - EPSILON) if units >= 0 else math.floor(units + EPSILON)
+
+    def round(self, value) -> int:
+        """
+        Nearest whole units of value, halves away from zero.
+        """
+        units = value * self._stretched
+        return int(units + 0.5 + EPSILON) if units >= 0 else int(units - 0.5 - EPSILON)
+
+    def to_float(self, units) -> float:
+        if self._divide:
+            return units / self.multiplier
+        return units * self.size
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from itertools import count
+import threading
+import time
+import uuid
+import os
+
+from jtrader.core.common.template import Registered
+
+__all__ = [
+    'IdGenerator',
+    'UuidGenerator',
+    'CounterGenerator',
+    'IdGeneratorFactory',
+    'generate_id',
+    'get_id_generator',
+    'set_id_generator',
+]
+
+
+class IdGenerator(Registered):
+    """
+    Source of the string ids given to orders, trades and fundings.
+    """
+
+    def __call__(self) -> str:
+        return self.next_id()
+
+    def next_id(self) -> str:
+        raise NotImplementedError
+
+
+class UuidGenerator(IdGenerator):
+    TAG = 'uuid'
+
+    def next_id(self) -> str:
+        return uuid.uuid1().hex
+
+
+class CounterGenerator(IdGenerator):
+    """
+    Process prefix plus a monotonic counter, an order of magnitude cheaper than uuid1 and lock free.
+
+    The prefix keeps ids unique across restarts: an epoch persisted in ``seed_file`` and bumped at every
+    start when given, the start time and pid of the process otherwise.
+    """
+    TAG = 'counter'
+
+    _file_lock = threading.Lock()
+
+    def __init__(self, prefix=None, seed_file=None):
+        super(CounterGenerator, self).__init__()
+        if prefix is None:
+            if seed_file is not None:
+                prefix = '%x' % self._bump_epoch(seed_file)
+            else:
+                prefix = '%x%x' % (time.time_ns() // 1000, os.getpid())
+        self.prefix = prefix + '-'
+        # next() on itertools.count is atomic under the GIL
+        self._counter = count(1)
+
+    @classmethod
+    def _bump_epoch(cls, seed_file) -> int:
+        with cls._file_lock:
+            epoch = 0
+            if os.path.exists(seed_file):
+                with open(seed_file) as f:
+                    content = f.read().strip()
+                    epoch = int(content) if content else 0
+            epoch += 1
+            with open(seed_file, 'w') as f:
+                f.write(str(epoch))
+            return epoch
+
+    def next_id(self) -> str:
+        return self.prefix + str(next(self._counter))
+
+
+class IdGeneratorFactory(object):
+    def __new__(cls, name, **kwargs) -> IdGenerator:
+        _instance = IdGenerator.factory_create(name, **kwargs)
+        return _instance
+
+
+_generator: IdGenerator = UuidGenerator()
+
+
+def generate_id() -> str:
+    return _generator.next_id()
+
+
+def get_id_generator() -> IdGenerator:
+    return _generator
+
+
+def set_id_generator(generator, **kwargs) -> IdGenerator:
+    """
+    Replace the process wide generator behind generate_id, by tag ('uuid', 'counter') or instance.
+    """
+    global _generator
+    if isinstance(generator, str):
+        generator = IdGeneratorFactory(generator, **kwargs)
+    _generator = generator
+    return generator
@@ -2,25 +2,26 @@
 # -*- coding: utf-8 -*-
 from jtrader.datatype.base import *
 from jtrader.datatype.enums import EnumEventType
-from jtrader.datatype.constants import TIME_INTERVAL_MAP
+from jtrader.datatype.constants import INTERVAL_NS_MAP
+from jtrader.datatype.timestamps import from_ns
+from jtrader.datatype.symbols import SYMBOL_REGISTRY
 import datetime as dt
 import typing
-import pandas as pd
-import os
+import numpy as np
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketBaseData(BaseData):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class HeartBeatData(MarketBaseData):
     EVENT_TYPE = EnumEventType.HEARTBEAT
     frequency: str = '1s'
 
 
-@dataclass
+@dataclass(slots=True)
 class FundingRateData(MarketBaseData):
     EVENT_TYPE = EnumEventType.FUNDING_RATE
 
@@ -30,29 +31,66 @@ class FundingRateData(MarketBaseData):
 
 _n_depth = 5
 
+# axes of the (side, field, level) array of ArrayDepthData
+BID, ASK = 0, 1
+PRICE, VOLUME = 0, 1
+
 
 def _depth_initialize():
     return [0.0] * _n_depth
 
 
-@dataclass
-class DepthData(MarketBaseData):
-    EVENT_TYPE = EnumEventType.DEPTH
-    N_DEPTH = _n_depth
+def _book_initialize():
+    return np.zeros((2, 2, _n_depth))
 
-    symbol: str = EMPTY_STRING
-    ask_prices: typing.List[float] = field(default_factory=_depth_initialize)
-    ask_volumes: typing.List[float] = field(default_factory=_depth_initialize)
-    bid_prices: typing.List[float] = field(default_factory=_depth_initialize)
-    bid_volumes: typing.List[float] = field(default_factory=_depth_initialize)
+
+def _fill_levels(prices, volumes, levels):
+    # levels may carry more fields than price and volume, e.g. ccxt [price, amount, count]
+    n_levels = 0
+    for level in levels[:len(prices)]:
+        prices[n_levels] = float(level[0])
+        volumes[n_levels] = float(level[1])
+        n_levels += 1
+    for index in range(n_levels, len(prices)):
+        prices[index] = 0.0
+        volumes[index] = 0.0
+
+
+class _DepthMixin(object):
+    """
+    Book accessors shared by the depth types, top of book values are only computed when read.
+    """
+    __slots__ = ()
+
+    def conflation_key(self):
+        return self.EVENT_TYPE, self.symbol
+
+    @property
+    def mid(self):
+        return (self.ask_prices[0] + self.bid_prices[0]) * 0.5
+
+    @property
+    def spread(self):
+        return self.ask_prices[0] - self.bid_prices[0]
+
+    @property
+    def microprice(self):
+        # mid weighted by the opposite side volume, leaning towards the side about to be taken
+        bid_volume = self.bid_volumes[0]
+        ask_volume = self.ask_volumes[0]
+        total_volume = bid_volume + ask_volume
+        if not total_volume:
+            return self.mid
+        return (self.bid_prices[0] * ask_volume + self.ask_prices[0] * bid_volume) / total_volume
 
     def pretty_string(self):
         level_format = "%12.6f   %12.6f"
+        n_depth = self.n_depth
         bid_level_str_list = []
         ask_level_str_list = []
-        for i in range(self.N_DEPTH):
+        for i in range(n_depth):
             ask_level_str = level_format % (
-                self.ask_prices[self.N_DEPTH - 1 - i], self.ask_volumes[self.N_DEPTH - 1 - i])
+                self.ask_prices[n_depth - 1 - i], self.ask_volumes[n_depth - 1 - i])
             bid_level_str = level_format % (self.bid_prices[i], self.bid_volumes[i])
             bid_level_str_list.append(bid_level_str)
             ask_level_str_list.append(ask_level_str)
@@ -70,7 +108,109 @@ class DepthData(MarketBaseData):
         return depth_str
 
 
-@dataclass()
+@dataclass(slots=True)
+class DepthData(_DepthMixin, MarketBaseData):
+    EVENT_TYPE = EnumEventType.DEPTH
+    N_DEPTH = _n_depth
+
+    symbol: str = EMPTY_STRING
+    ask_prices: typing.List[float] = field(default_factory=_depth_initialize)
+    ask_volumes: typing.List[float] = field(default_factory=_depth_initialize)
+    bid_prices: typing.List[float] = field(default_factory=_depth_initialize)
+    bid_volumes: typing.List[float] = field(default_factory=_depth_initialize)
+
+    @property
+    def n_depth(self):
+        return len(self.bid_prices)
+
+    def set_levels(self, bids, asks):
+        """
+        Fill the book from (price, volume) pairs, best first, levels not given are cleared.
+        """
+        _fill_levels(self.bid_prices, self.bid_volumes, bids)
+        _fill_levels(self.ask_prices, self.ask_volumes, asks)
+
+    def __copy__(self):
+        # gateways parse into one depth per symbol, the levels of a snapshot must not follow later updates
+        new = super(DepthData, self).__copy__()
+        new.ask_prices = self.ask_prices[:]
+        new.ask_volumes = self.ask_volumes[:]
+        new.bid_prices = self.bid_prices[:]
+        new.bid_volumes = self.bid_volumes[:]
+        return new
+
+
+@dataclass(slots=True)
+class ArrayDepthData(_DepthMixin, MarketBaseData):
+    """
+    Depth backed by one contiguous (side, price/volume, level) float64 array, the number of levels is set
+    per subscription. The price and volume attributes are views into the array so code reading DepthData
+    works unchanged.
+    """
+    EVENT_TYPE = EnumEventType.DEPTH
+
+    symbol: str = EMPTY_STRING
+    book: np.ndarray = field(default_factory=_book_initialize)
+
+    @classmethod
+    def with_depth(cls, n_depth, **kwargs):
+        return cls(book=np.zeros((2, 2, n_depth)), **kwargs)
+
+    @property
+    def n_depth(self):
+        return self.book.shape[2]
+
+    @property
+    def ask_prices(self):
+        return self.book[ASK, PRICE]
+
+    @property
+    def ask_volumes(self):
+        return self.book[ASK, VOLUME]
+
+    @property
+    def bid_prices(self):
+        return self.book[BID, PRICE]
+
+    @property
+    def bid_volumes(self):
+        return self.book[BID, VOLUME]
+
+    @property
+    def mid(self):
+        book = self.book
+        return float(book[ASK, PRICE, 0] + book[BID, PRICE, 0]) * 0.5
+
+    @property
+    def spread(self):
+        book = self.book
+        return float(book[ASK, PRICE, 0] - book[BID, PRICE, 0])
+
+    def set_levels(self, bids, asks):
+        """
+        Fill the book from (price, volume) arrays, best first, levels not given are cleared.
+        """
+        book = self.book
+        n_depth = book.shape[2]
+        for side, levels in ((BID, bids), (ASK, asks)):
+            levels = np.asarray(levels[:n_depth], dtype=np.float64)
+            n_levels = len(levels)
+            if n_levels:
+                book[side, :, :n_levels] = levels.T
+            book[side, :, n_levels:] = 0.0
+
+    def freeze(self):
+        # the book is shared by every subscriber of the snapshot, so it is made read-only too
+        self.book.flags.writeable = False
+        return super(ArrayDepthData, self).freeze()
+
+    def __copy__(self):
+        new = super(ArrayDepthData, self).__copy__()
+        new.book = self.book.copy()
+        return new
+
+
+@dataclass(slots=True)
 class MarketTradeData(MarketBaseData):
     EVENT_TYPE = EnumEventType.TRADE
     COLUMN_ENUM = ['direction']
@@ -84,7 +224,7 @@ class MarketTradeData(MarketBaseData):
     volume: float = EMPTY_FLOAT
 
 
-@dataclass
+@dataclass(slots=True)
 class BarData(MarketBaseData):
     EVENT_TYPE = EnumEventType.BAR
 
@@ -96,11 +236,18 @@ class BarData(MarketBaseData):
     close: float = EMPTY_FLOAT
     volume: float = EMPTY_FLOAT
 
+    def conflation_key(self):
+        # only revisions of the same bar are conflated, distinct bars (e.g. back fill) are all kept
+        return self.EVENT_TYPE, self.symbol, self.frequency, self.timestamp
+
+    def settle_timestamp(self) -> int:
+        return self.timestamp + INTERVAL_NS_MAP[self.frequency]
+
     def settle_time(self):
-        return self.datetime + TIME_INTERVAL_MAP[self.frequency]
+        return from_ns(self.settle_timestamp())
 
 
-@dataclass
+@dataclass(slots=True)
 class ContractData(MarketBaseData):
     EVENT_TYPE = EnumEventType.CONTRACT
 
@@ -129,26 +276,40 @@ class ContractData(MarketBaseData):
     min_notional: float = EMPTY_FLOAT
 
     _contracts = {}
+    # indexed by symbol id, None for symbols without a contract
+    _contract_list = []
+
+    # both are filled by CONTRACTS (datatype.contracts), loaded on first use
 
     @classmethod
     def contracts(cls) -> typing.Dict[str, "ContractData"]:
         if not cls._contracts:
-            file_path = os.path.join(os.path.dirname(__file__), 'contracts.csv')
-            contract_df = pd.read_csv(file_path, index_col=False)
-            cls.reset_contracts(contract_df)
+            from jtrader.datatype.contracts import CONTRACTS
+            CONTRACTS.load()
         return cls._contracts
 
     @classmethod
     def reset_contracts(cls, contract_df):
-        contract_docs = contract_df.to_dict('records')
-        for doc in contract_docs:
-            contract = ContractData.from_dict(doc)
-            cls._contracts[contract.symbol] = contract
+        from jtrader.datatype.contracts import CONTRACTS
+        CONTRACTS.reset(contract_df)
         return cls._contracts
 
     @classmethod
     def get_contract(cls, symbol):
-        contract: cls = cls.contracts()[symbol]
+        try:
+            return cls._contracts[symbol]
+        except KeyError:
+            return cls.contracts()[symbol]
+
+    @classmethod
+    def get_contract_by_id(cls, symbol_id):
+        contract_list = cls._contract_list
+        contract = contract_list[symbol_id] if symbol_id < len(contract_list) else None
+        if contract is None:
+            cls.contracts()
+            contract = contract_list[symbol_id] if symbol_id < len(contract_list) else None
+            if contract is None:
+                raise KeyError(SYMBOL_REGISTRY.get_symbol(symbol_id))
         return contract
 
 
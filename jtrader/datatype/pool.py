@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from collections import deque
+import typing
+import sys
+
+import numpy as np
+
+from jtrader.datatype.base import BaseData, fields, MISSING, _slot_names
+
+__all__ = [
+    'ObjectPool',
+    'PoolRegistry',
+    'POOLS',
+]
+
+# sys.getrefcount of an object only referenced by a local variable, and of a container only referenced by
+# its attribute and a local variable
+_FREE_REFCOUNT = 2
+_FREE_FIELD_REFCOUNT = 3
+
+
+def _build_pool_functions(cls):
+    # reset (as built by cls()) and copy (as copy.copy, lists and arrays copied) unrolled per field,
+    # reusing the lists and arrays of the pooled object when nothing else holds them
+    field_list = fields(cls)
+    field_names = [f.name for f in field_list]
+    namespace = {'_refcount': sys.getrefcount, '_np': np, '_free': _FREE_FIELD_REFCOUNT}
+    reset_lines = ['def reset(obj):']
+    copy_lines = ['def copy_into(obj, src):']
+    for f in field_list:
+        name = f.name
+        if f.default_factory is not MISSING:
+            namespace['_factory_' + name] = f.default_factory
+            sample = f.default_factory()
+        else:
+            namespace['_default_' + name] = f.default
+            sample = f.default
+
+        if isinstance(sample, list):
+            namespace['_default_' + name] = tuple(sample)
+            reset_lines += [
+                '    v = obj.{0}'.format(name),
+                '    if _refcount(v) > _free: obj.{0} = _factory_{0}()'.format(name),
+                '    else: v[:] = _default_{0}'.format(name),
+            ]
+            copy_lines += [
+                '    v = obj.{0}'.format(name),
+                '    if _refcount(v) > _free: obj.{0} = src.{0}[:]'.format(name),
+                '    else: v[:] = src.{0}'.format(name),
+            ]
+        elif isinstance(sample, np.ndarray):
+            namespace['_default_' + name] = sample
+            for lines, source in ((reset_lines, '_default_{0}'), (copy_lines, 'src.{0}')):
+                lines += [
+                    '    v = obj.{0}'.format(name),
+                    ('    if _refcount(v) > _free or v.shape != %s.shape: obj.{0} = %s.copy()' % (
+                        source, source)).format(name),
+                    '    else:',
+                    '        v.flags.writeable = True',
+                    ('        v[...] = %s' % source).format(name),
+                ]
+        elif isinstance(sample, dict):
+            reset_lines += [
+                '    v = obj.{0}'.format(name),
+                '    if _refcount(v) > _free: obj.{0} = _factory_{0}()'.format(name),
+                '    else: v.clear()',
+            ]
+            copy_lines.append('    obj.{0} = src.{0}'.format(name))
+        else:
+            if f.default_factory is not MISSING:
+                reset_lines.append('    obj.{0} = _factory_{0}()'.format(name))
+            else:
+                reset_lines.append('    obj.{0} = _default_{0}'.format(name))
+            copy_lines.append('    obj.{0} = src.{0}'.format(name))
+
+    for name in _slot_names(cls):
+        if name not in field_names:
+            reset_lines.append('    obj.{0} = None'.format(name))
+            copy_lines.append('    obj.{0} = getattr(src, {0!r}, None)'.format(name))
+    exec('\n'.join(reset_lines + copy_lines), namespace)
+    return namespace['reset'], namespace['copy_into']
+
+
+class ObjectPool(object):
+    """
+    Recycles objects of one BaseData class to keep short lived events off the cyclic gc.
+
+    Objects handed back with ``release`` are only reused once nothing but the pool references them, checked
+    with ``sys.getrefcount`` when they are taken again: a subscriber keeping an event (the latest depth of a
+    symbol) simply delays its reuse. Lists and arrays of a pooled object are refilled in place unless held
+    elsewhere too.
+    """
+
+    def __init__(self, cls, capacity=1024):
+        super(ObjectPool, self).__init__()
+        self.cls = cls
+        self.capacity = capacity
+        self._pending = deque()
+        self._reset, self._copy_into = _build_pool_functions(cls)
+        self.n_created = 0
+        self.n_reused = 0
+        self.n_busy = 0
+        self.n_dropped = 0
+
+    def __repr__(self):
+        return '%s(%s, capacity=%d)' % (self.__class__.__name__, self.cls.__name__, self.capacity)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _take(self):
+        pending = self._pending
+        try:
+            data = pending.popleft()
+        except IndexError:
+            return None
+        if sys.getrefcount(data) > _FREE_REFCOUNT:
+            # still used, retried after the others
+            pending.append(data)
+            self.n_busy += 1
+            return None
+        if data.__class__ is not self.cls:
+            data.__class__ = self.cls
+        self.n_reused += 1
+        return data
+
+    def acquire(self) -> BaseData:
+        """
+        An object with the default values, like ``cls()``.
+        """
+        data = self._take()
+        if data is None:
+            self.n_created += 1
+            return self.cls()
+        self._reset(data)
+        return data
+
+    def snapshot(self, data: BaseData) -> BaseData:
+        """
+        Frozen copy of data, like ``data.snapshot()`` but built on a pooled object.
+        """
+        if data.frozen:
+            return data
+        target = self._take()
+        if target is None:
+            self.n_created += 1
+            return data.evolve().freeze()
+        self._copy_into(target, data)
+        return target.freeze()
+
+    def release(self, data: BaseData):
+        """
+        Hand data back once its consumer is done with it, it is not reused while referenced elsewhere.
+        """
+        if len(self._pending) < self.capacity:
+            self._pending.append(data)
+        else:
+            self.n_dropped += 1
+
+    def statistics(self) -> dict:
+        return {
+            'pending': len(self._pending),
+            'created': self.n_created,
+            'reused': self.n_reused,
+            'busy': self.n_busy,
+            'dropped': self.n_dropped,
+        }
+
+
+class PoolRegistry(object):
+    """
+    Opt-in pools by event class. Producers take objects with ``acquire``/``snapshot``, the broker gives
+    events back with ``release`` after they are dispatched; classes without a pool are left to the gc.
+    """
+
+    def __init__(self):
+        super(PoolRegistry, self).__init__()
+        self._pool_dict: typing.Dict[type, ObjectPool] = {}
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, ', '.join(cls.__name__ for cls in self._pool_dict))
+
+    def __bool__(self):
+        return bool(self._pool_dict)
+
+    def enable(self, cls, capacity=1024) -> ObjectPool:
+        if isinstance(cls, str):
+            cls = self.find_class(cls)
+        pool = self._pool_dict[cls] = ObjectPool(cls, capacity)
+        return pool
+
+    def disable(self, cls):
+        self._pool_dict.pop(cls, None)
+
+    def configure(self, pool_config: dict):
+        """
+        Class name -> capacity, e.g. {'DepthData': 1024, 'BarData': 256}.
+        """
+        for name, capacity in pool_config.items():
+            self.enable(name, capacity)
+
+    @staticmethod
+    def find_class(name) -> type:
+        # the package is complete by the time pools are configured
+        import jtrader.datatype
+        cls = getattr(jtrader.datatype, name, None)
+        if not (isinstance(cls, type) and issubclass(cls, BaseData)):
+            raise KeyError('No data class named %s' % name)
+        return cls
+
+    def get(self, cls) -> typing.Optional[ObjectPool]:
+        return self._pool_dict.get(cls._thawed or cls)
+
+    def acquire(self, cls) -> BaseData:
+        pool = self._pool_dict.get(cls)
+        return pool.acquire() if pool is not None else cls()
+
+    def snapshot(self, data: BaseData) -> BaseData:
+        pool = self._pool_dict.get(data.__class__)
+        return pool.snapshot(data) if pool is not None else data.snapshot()
+
+    def release(self, data: BaseData):
+        if self._pool_dict:
+            cls = data.__class__
+            pool = self._pool_dict.get(cls._thawed or cls)
+            if pool is not None:
+                pool.release(data)
+
+    def statistics(self) -> dict:
+        return {cls.__name__: pool.statistics() for cls, pool in self._pool_dict.items()}
+
+
+POOLS = PoolRegistry()
@@ -80,13 +80,13 @@ class Portfolio(object):
                     'Present positions is:\n%s',
                     self, asset, volume, balance.total_amount)
 
-    def _update_price(self, symbol, price, dt):
+    def _update_price(self, symbol, price, timestamp):
         position = self._get_position(symbol)
-        position.on_market(price, dt)
+        position.on_market(price, timestamp)
         contract = position.contract
         if contract.asset_quote == self._accounting_unit:
             balance = self._get_balance(contract.asset_base)
-            balance.on_market(price, dt)
+            balance.on_market(price, timestamp)
 
     def on_order_status(self, order: OrderData):
         client_order_id = order.client_order_id
@@ -121,22 +121,20 @@ class Portfolio(object):
         self.adjust_asset(contract.asset_base, base_change)
         self.adjust_asset(contract.asset_quote, quote_change)
 
-        self._update_price(symbol, trade.price, trade.datetime)
+        self._update_price(symbol, trade.price, trade.timestamp)
 
     def on_bar(self, bar: BarData):
         symbol = bar.symbol
         if symbol in self._position_dict:
-            dt = bar.settle_time()
             price = bar.close
-            self._update_price(symbol, price, dt)
+            self._update_price(symbol, price, bar.settle_timestamp())
 
     def on_depth(self, depth: DepthData):
         symbol = depth.symbol
         if symbol in self._position_dict:
-            dt = depth.datetime
             # price = (depth.bid_prices[0] + depth.ask_prices[0]) * 0.5
             price = depth.bid_prices[0]
-            self._update_price(symbol, price, dt)
+            self._update_price(symbol, price, depth.timestamp)
 
     def on_funding(self, funding: FundingData):
         asset = funding.symbol
@@ -6,7 +6,7 @@ from jtrader.datatype.markets import ContractData
 from jtrader.core.common.template import Registered
 
 
-@dataclass()
+@dataclass(slots=True)
 class PnLData(BaseData):
     strategy_id: str = EMPTY_STRING
     unrealized_pnl: float = EMPTY_FLOAT
@@ -15,7 +15,7 @@ class PnLData(BaseData):
     asset_value: float = EMPTY_FLOAT
 
 
-@dataclass()
+@dataclass(slots=True)
 class BalanceData(BaseData):
     strategy_id: str = EMPTY_STRING
     asset: str = EMPTY_STRING
@@ -23,9 +23,9 @@ class BalanceData(BaseData):
     total_amount: float = EMPTY_FLOAT
     frozen_amount: float = EMPTY_FLOAT
 
-    def on_market(self, price, dt):
+    def on_market(self, price, timestamp):
         self.price = price
-        self.datetime = dt
+        self.timestamp = timestamp
 
 
 @dataclass()
@@ -48,9 +48,9 @@ class PositionData(BaseData, Registered):
     def on_trade(self, trade: TradeData):
         pass
 
-    def on_market(self, price, dt):
+    def on_market(self, price, timestamp):
         self.last_price = price
-        self.datetime = dt
+        self.timestamp = timestamp
         self.calculate_unrealized_pnl()
 
     def calculate_unrealized_pnl(self):
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import typing
+import math
+
+import numpy as np
+
+from jtrader.datatype.markets import ContractData
+from jtrader.datatype.constants import ContractTypeAbbr
+from jtrader.datatype.enums import EnumOrderCheck
+from jtrader.datatype.fixed_point import FixedPoint, EPSILON, STRETCH, multiplier_of
+from jtrader.core.common import logger
+
+__all__ = [
+    'ContractRule',
+    'BasketCheck',
+]
+
+
+def _reject(reason, message, value, limit):
+    logger.debug(message, value, limit)
+    return reason
+
+
+def _to_float(scale: FixedPoint):
+    # the operation of FixedPoint.to_float, as source
+    return '/ %r' % scale.multiplier if scale.multiplier >= 1.0 else '* %r' % scale.size
+
+
+def _build_validators(contract: ContractData):
+    # the rounding and the limits of the contract inlined as constants, limits that can never be broken
+    # (unset min and max, NaN) are left out
+    namespace = {'_reject': _reject}
+    namespace.update(('_' + reason.name, reason) for reason in EnumOrderCheck)
+
+    # FixedPoint.floor and FixedPoint.round inlined, sizes not set round nothing
+    round_lines = []
+    if contract.lot_size > 0:
+        scale = FixedPoint.of(contract.lot_size)
+        round_lines += [
+            '    lots = volume * %r' % (scale.multiplier * STRETCH),
+            '    lots = int(lots + %r) if lots >= 0 else int(lots - %r)' % (EPSILON, EPSILON),
+            '    volume = lots %s' % _to_float(scale),
+        ]
+    if contract.tick_size > 0:
+        scale = FixedPoint.of(contract.tick_size)
+        round_lines += [
+            '    ticks = price * %r' % (scale.multiplier * STRETCH),
+            '    ticks = int(ticks + %r) if ticks >= 0 else int(ticks - %r)' % (0.5 + EPSILON, 0.5 + EPSILON),
+            '    price = ticks %s' % _to_float(scale),
+        ]
+
+    check_lines = ['    quantity = abs(volume)']
+    if contract.contract_type == ContractTypeAbbr.SPOT:
+        check_lines.append('    notional = quantity * price')
+    else:
+        check_lines.append('    notional = quantity')
+    for reason, value, operator, limit, message in (
+            ('MIN_QUANTITY', 'quantity', '<', contract.min_quantity,
+             'Order volume %s not reach the min requirement %s'),
+            ('MIN_NOTIONAL', 'notional', '<', contract.min_notional,
+             'Order notional %s not reach the min requirement %s'),
+            ('MAX_QUANTITY', 'quantity', '>', contract.max_quantity,
+             'Order volume %s break the max requirement %s'),
+            ('MAX_NOTIONAL', 'notional', '>', contract.max_notional,
+             'Order notional %s break the max requirement %s'),
+            ('MIN_PRICE', 'price', '<', contract.min_price,
+             'Order price %s not reach the min requirement %s'),
+    ):
+        limit = float(limit)
+        if math.isnan(limit) or math.isinf(limit) or (reason == 'MIN_QUANTITY' and limit <= 0):
+            continue
+        logged = 'volume' if value == 'quantity' else value
+        check_lines += [
+            '    if %s %s %r:' % (value, operator, limit),
+            '        return _reject(_%s, %r, %s, %r)' % (reason, message, logged, limit),
+        ]
+    check_lines.append('    return _PASSED')
+
+    value_lines = ['def validate_values(price, volume):'] + round_lines + check_lines
+    order_lines = ['def validate(order):', '    price = order.price', '    volume = order.volume'] + round_lines
+    if round_lines:
+        order_lines += ['    order.price = price', '    order.volume = volume']
+    source = '\n'.join(order_lines + check_lines + value_lines)
+    exec(source, namespace)
+    return namespace['validate'], namespace['validate_values'], source
+
+
+class ContractRule(object):
+    """
+    Order checks of one contract compiled into plain functions, with the multipliers of its tick and lot
+    sizes precomputed: prices are rounded to a whole number of ticks, volumes floored to a whole number of
+    lots, then checked against the quantity, notional and price limits. ``price_scale`` and ``volume_scale``
+    are the FixedPoint scales of the contract, for integer ticks and lots.
+
+    ``validate(order)`` rounds the order in place and returns the first broken EnumOrderCheck (PASSED
+    otherwise), ``validate_values(price, volume)`` checks values without an order.
+    """
+
+    def __init__(self, contract: ContractData):
+        super(ContractRule, self).__init__()
+        self.contract = contract
+        self.tick_multiplier = multiplier_of(contract.tick_size)
+        self.lot_multiplier = multiplier_of(contract.lot_size)
+        self.price_scale = FixedPoint.of(contract.tick_size)
+        self.volume_scale = FixedPoint.of(contract.lot_size)
+        self.validate, self.validate_values, self.source = _build_validators(contract)
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, self.contract.symbol)
+
+    def check(self, order) -> bool:
+        # PASSED is 0, the only false check
+        return not self.validate(order)
+
+
+class BasketCheck(typing.NamedTuple):
+    """
+    Result of CONTRACTS.check_orders: the rounded prices and volumes of a basket of orders and, per order,
+    the first broken EnumOrderCheck.
+    """
+    prices: np.ndarray
+    volumes: np.ndarray
+    reasons: np.ndarray
+
+    @property
+    def mask(self) -> np.ndarray:
+        return self.reasons == EnumOrderCheck.PASSED
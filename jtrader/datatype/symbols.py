@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import sys
+
+__all__ = [
+    'SymbolRegistry',
+    'SymbolTable',
+    'SYMBOL_REGISTRY',
+]
+
+
+class SymbolRegistry(object):
+    """
+    Interns symbols into dense integer ids, given in the order symbols are first seen and never reused,
+    so per symbol state can live in lists and arrays indexed by id.
+    """
+
+    def __init__(self):
+        super(SymbolRegistry, self).__init__()
+        self._lock = threading.Lock()
+        self._id_dict = {}
+        self._symbol_list = []
+
+    def __repr__(self):
+        return '%s(%d symbols)' % (self.__class__.__name__, len(self._symbol_list))
+
+    def __len__(self):
+        return len(self._symbol_list)
+
+    def __contains__(self, symbol):
+        return symbol in self._id_dict
+
+    def __iter__(self):
+        return iter(list(self._symbol_list))
+
+    def intern(self, symbol) -> int:
+        try:
+            return self._id_dict[symbol]
+        except KeyError:
+            with self._lock:
+                symbol_id = self._id_dict.get(symbol)
+                if symbol_id is None:
+                    symbol = sys.intern(symbol)
+                    symbol_id = len(self._symbol_list)
+                    self._symbol_list.append(symbol)
+                    self._id_dict[symbol] = symbol_id
+                return symbol_id
+
+    @property
+    def symbol_list(self) -> list:
+        # the live list, append only, for lookups by id on hot paths
+        return self._symbol_list
+
+    def get_id(self, symbol) -> int:
+        return self._id_dict[symbol]
+
+    def get_symbol(self, symbol_id) -> str:
+        return self._symbol_list[symbol_id]
+
+
+class SymbolTable(object):
+    """
+    List indexed by symbol id, the item of a symbol is created by ``factory`` on first access.
+    """
+
+    def __init__(self, factory):
+        super(SymbolTable, self).__init__()
+        self._factory = factory
+        self._item_list = []
+
+    def __getitem__(self, symbol_id):
+        item_list = self._item_list
+        if symbol_id >= len(item_list):
+            item_list.extend([None] * (symbol_id + 1 - len(item_list)))
+        item = item_list[symbol_id]
+        if item is None:
+            item = item_list[symbol_id] = self._factory()
+        return item
+
+    def __contains__(self, symbol_id):
+        return symbol_id < len(self._item_list) and self._item_list[symbol_id] is not None
+
+    def __iter__(self):
+        return (item for item in self._item_list if item is not None)
+
+    def items(self):
+        return ((symbol_id, item) for symbol_id, item in enumerate(self._item_list) if item is not None)
+
+    def clear(self):
+        self._item_list = []
+
+
+SYMBOL_REGISTRY = SymbolRegistry()
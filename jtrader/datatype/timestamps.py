@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime as dt
+import typing
+import time
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    'Timestamp',
+    'NAT',
+    'NS_PER_MS',
+    'NS_PER_SECOND',
+    'NS_PER_MINUTE',
+    'now_ns',
+    'to_ns',
+    'from_ns',
+    'ms_to_ns',
+    'iso_to_ns',
+    'floor_ns',
+]
+
+# int64 nanoseconds since the epoch, UTC like every naive datetime of the system
+Timestamp = typing.NewType('Timestamp', int)
+
+# numpy's NaT, the timestamp of a datetime set to None
+NAT = np.iinfo(np.int64).min
+
+NS_PER_US = 1000
+NS_PER_MS = 1000000
+NS_PER_SECOND = 1000000000
+NS_PER_MINUTE = 60 * NS_PER_SECOND
+
+_EPOCH = dt.datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=dt.timezone.utc)
+_ONE_US = dt.timedelta(microseconds=1)
+
+now_ns = time.time_ns
+_fromisoformat = dt.datetime.fromisoformat
+
+
+def to_ns(value) -> int:
+    """
+    Timestamp of a datetime (naive ones are UTC), a numpy datetime64, an ISO 8601 string or a timestamp,
+    NAT for None.
+    """
+    if value is None or value is pd.NaT:
+        return NAT
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return iso_to_ns(value)
+    if isinstance(value, np.datetime64):
+        return int(value.astype('datetime64[ns]').astype(np.int64))
+    if value.tzinfo is not None:
+        value = value.astimezone(dt.timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _ONE_US * NS_PER_US + getattr(value, 'nanosecond', 0)
+
+
+def from_ns(ns) -> typing.Optional[dt.datetime]:
+    """
+    Naive UTC datetime of a timestamp, to the microsecond; None for NAT.
+    """
+    if ns == NAT:
+        return None
+    return _EPOCH + dt.timedelta(microseconds=ns // NS_PER_US)
+
+
+def ms_to_ns(ms) -> int:
+    return int(ms) * NS_PER_MS
+
+
+def iso_to_ns(text: str) -> int:
+    """
+    Timestamp of an ISO 8601 string as sent by exchanges, '2021-01-01T00:00:00.123Z' or with a +hh:mm offset,
+    to the microsecond. Layouts datetime.fromisoformat does not read are left to pandas.
+    """
+    if text[-1:] == 'Z':
+        # naive datetimes are UTC
+        text = text[:-1]
+    try:
+        value = _fromisoformat(text)
+    except ValueError:
+        return to_ns(pd.Timestamp(text))
+    return (value - (_EPOCH if value.tzinfo is None else _EPOCH_UTC)) // _ONE_US * NS_PER_US
+
+
+def floor_ns(ns: int, interval_ns: int) -> int:
+    """
+    Start of the interval holding ns, intervals counted from the epoch.
+    """
+    return ns - ns % interval_ns
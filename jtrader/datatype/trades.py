@@ -1,19 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import typing
-import uuid
-import pandas as pd
-from jtrader.core.common import logger
 from jtrader.datatype.base import *
 from jtrader.datatype.enums import *
 from jtrader.datatype.markets import ContractData
+from jtrader.datatype.contracts import CONTRACTS
+from jtrader.datatype.fixed_point import FixedPoint
+from jtrader.datatype.ids import generate_id
 
 
-def generate_id():
-    return str(uuid.uuid1().hex)
-
-
-@dataclass()
+@dataclass(slots=True)
 class TradingBaseData(BaseData):
     strategy_id: str = EMPTY_STRING
     symbol: str = EMPTY_STRING
@@ -31,7 +27,7 @@ class TradingBaseData(BaseData):
         return result
 
 
-@dataclass()
+@dataclass(slots=True)
 class OrderData(TradingBaseData):
     EVENT_TYPE = EnumEventType.ORDER
     COLUMN_ENUM = ['direction', 'order_type', 'status']
@@ -56,7 +52,7 @@ class OrderData(TradingBaseData):
 
     def on_order(self, order):
         self.order_id = order.order_id
-        self.datetime = order.datetime
+        self.timestamp = order.timestamp
         self.executed_volume = order.executed_volume
         self.executed_notional = order.executed_notional
         if not self.is_closed():
@@ -64,53 +60,34 @@ class OrderData(TradingBaseData):
 
     @staticmethod
     def floor(value: float, decimal_size: float):
-        if pd.isna(decimal_size):
+        if not decimal_size > 0:
             return value
-        return int(value / decimal_size) * decimal_size
+        scale = FixedPoint.of(decimal_size)
+        return scale.to_float(scale.floor(value))
 
     @staticmethod
     def ceil(value: float, decimal_size: float):
-        if pd.isna(decimal_size):
+        if not decimal_size > 0:
             return value
-        return int((value + decimal_size) / decimal_size) * decimal_size
+        scale = FixedPoint.of(decimal_size)
+        return scale.to_float(scale.ceil(value))
 
     @staticmethod
     def round(value: float, decimal_size: float):
-        if pd.isna(decimal_size):
+        if not decimal_size > 0:
             return value
-        return int((value + decimal_size / 2.0) / decimal_size) * decimal_size
+        scale = FixedPoint.of(decimal_size)
+        return scale.to_float(scale.round(value))
 
     def contract_check(self):
-        contract = self.contract
-
-        volume = self.volume = self.floor(self.volume, contract.lot_size)
-        price = self.price = self.round(self.price, contract.tick_size)
-
-        if contract.contract_type == EnumContractType.SPOT:
-            notional = abs(volume) * price
-        else:
-            notional = abs(volume)
-
-        if abs(volume) < contract.min_quantity:
-            logger.debug(f'Order volume {volume} not reach the min requirement {contract.min_quantity}')
-            return False
-        if notional < contract.min_notional:
-            logger.debug(f'Order notional {notional} not reach the min requirement {contract.min_notional}')
-            return False
-        if abs(volume) > contract.max_quantity:
-            logger.debug(f'Order volume {volume} break the max requirement {contract.max_quantity}')
-            return False
-        if notional > contract.max_notional:
-            logger.debug(f'Order notional {notional} break the max requirement {contract.max_notional}')
-            return False
-        if price < contract.min_price:
-            logger.debug(f'Order price {price} not reach the min requirement {contract.min_price}')
-            return False
-
-        return True
-
-
-@dataclass()
+        """
+        Round price and volume to the contract of the order and check its limits, see ContractRule.
+        """
+        # PASSED is 0, the only false check
+        return not CONTRACTS.rule(self.symbol).validate(self)
+
+
+@dataclass(slots=True)
 class TradeData(TradingBaseData):
     EVENT_TYPE = EnumEventType.TRADE
     COLUMN_ENUM = ['direction']
@@ -129,7 +106,7 @@ class TradeData(TradingBaseData):
     @classmethod
     def from_order(cls, order: OrderData):
         trade = cls()
-        trade.datetime = order.datetime
+        trade.timestamp = order.timestamp
         trade.strategy_id = order.strategy_id
         trade.symbol = order.symbol
 
@@ -143,7 +120,7 @@ class TradeData(TradingBaseData):
         return trade
 
 
-@dataclass()
+@dataclass(slots=True)
 class FundingData(TradingBaseData):
     EVENT_TYPE = EnumEventType.FUNDING
 
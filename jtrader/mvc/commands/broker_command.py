@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import pandas as pd
+
+from jtrader.core.common import TRACER, GC_MONITOR, freeze_heap
 from jtrader.datatype import *
 from jtrader.mvc.commands.command import CommandBaseData
 from jtrader.broker import Broker as _Actor
@@ -69,6 +72,114 @@ class QueryCommand(BrokerCommand):
         print(actor.query_data(self.name, self.query, self.columns).to_string())
 
 
+@dataclass
+class ShowMailboxCommand(BrokerCommand):
+
+    def execute(self, actor: _Actor):
+        stats = actor.query_mailbox()
+        stats_str = '\n'.join('%s: %s' % (k, v) for k, v in stats.items())
+        self.render("Mailbox of {actor}: \n{stats}".format(actor=actor, stats=stats_str))
+
+
+@dataclass
+class TraceCommand(BrokerCommand):
+    action: str = EMPTY_STRING
+    file_name: str = 'trace.json'
+
+    def parse(self, cmd_str: str):
+        command_args = self.split(cmd_str)
+        if command_args:
+            self.action = command_args[0].lower()
+        if len(command_args) > 1:
+            self.file_name = command_args[1]
+
+    def execute(self, actor: _Actor):
+        if self.action == 'on':
+            TRACER.enable()
+            self.render('Latency tracing enabled')
+        elif self.action == 'off':
+            TRACER.disable()
+            self.render('Latency tracing disabled')
+        elif self.action == 'reset':
+            TRACER.reset()
+            self.render('Latency histograms cleared')
+        elif self.action == 'dump':
+            TRACER.dump(self.file_name)
+            self.render('Latency histograms dumped to {}'.format(self.file_name))
+        elif not self.action:
+            stats_df = pd.DataFrame.from_dict(TRACER.statistics(), orient='index')
+            self.render("Latency per stage in us (tracing {state}): \n{stats}".format(
+                state='on' if TRACER.enabled else 'off', stats=stats_df.to_string()))
+        else:
+            raise ValueError('Unknown trace action "{}", expected on/off/reset/dump'.format(self.action))
+
+
+@dataclass
+class ProfileCommand(BrokerCommand):
+    action: str = EMPTY_STRING
+    n_top: int = 20
+
+    def parse(self, cmd_str: str):
+        command_args = self.split(cmd_str)
+        if command_args:
+            if command_args[0].isdigit():
+                self.n_top = int(command_args[0])
+            else:
+                self.action = command_args[0].lower()
+
+    def execute(self, actor: _Actor):
+        if self.action == 'on':
+            actor.set_profiling(True)
+            self.render('Handler profiling enabled for {}'.format(actor))
+        elif self.action == 'off':
+            actor.set_profiling(False)
+            self.render('Handler profiling disabled for {}'.format(actor))
+        elif self.action == 'reset':
+            if actor.profiler is not None:
+                actor.profiler.reset()
+            self.render('Handler profiles cleared')
+        elif not self.action:
+            if actor.profiler is None:
+                self.render('Handler profiling is off, turn it on with "profile on"')
+                return
+            profile_df = pd.DataFrame(actor.profiler.report(self.n_top))
+            self.render("Slowest handlers of {actor}: \n{profile}".format(
+                actor=actor, profile=profile_df.to_string(index=False)))
+        else:
+            raise ValueError('Unknown profile action "{}", expected on/off/reset'.format(self.action))
+
+
+@dataclass
+class GcCommand(BrokerCommand):
+    action: str = EMPTY_STRING
+
+    def parse(self, cmd_str: str):
+        command_args = self.split(cmd_str)
+        if command_args:
+            self.action = command_args[0].lower()
+
+    def execute(self, actor: _Actor):
+        if self.action == 'on':
+            GC_MONITOR.enable()
+            self.render('GC pause monitoring enabled')
+        elif self.action == 'off':
+            GC_MONITOR.disable()
+            self.render('GC pause monitoring disabled')
+        elif self.action == 'reset':
+            GC_MONITOR.reset()
+            self.render('GC pause histograms cleared')
+        elif self.action == 'freeze':
+            self.render('{} objects moved to the permanent generation'.format(freeze_heap()))
+        elif not self.action:
+            stats_df = pd.DataFrame.from_dict(GC_MONITOR.statistics(), orient='index')
+            pool_df = pd.DataFrame.from_dict(POOLS.statistics(), orient='index')
+            self.render("GC pauses in us (monitoring {state}): \n{stats}\nObject pools: \n{pools}".format(
+                state='on' if GC_MONITOR.enabled else 'off', stats=stats_df.to_string(),
+                pools=pool_df.to_string() if len(pool_df) else 'none'))
+        else:
+            raise ValueError('Unknown gc action "{}", expected on/off/reset/freeze'.format(self.action))
+
+
 class CloseOpenPositionCommand(ShowBalanceCommand):
 
     def execute(self, actor: _Actor):
@@ -13,6 +13,7 @@ from jtrader.mvc.commands import *
 from jtrader.mvc.log_config import generate_log_config
 
 from jtrader.core.common.utils import parse_file
+from jtrader.core.common import logger, GC_MONITOR, freeze_heap
 
 
 def parse(arg):
@@ -52,6 +53,11 @@ class ControlShell(cmd.Cmd):
         self._trader.set_broker(broker)
         self._broker = broker
 
+        # everything loaded so far lives as long as the process, later collections skip it
+        n_frozen = freeze_heap()
+        GC_MONITOR.enable()
+        logger.info('%d objects moved to the permanent gc generation after configuration', n_frozen)
+
     def add_strategy(self, strategy):
         self._trader.add_strategy(strategy)
 
@@ -181,6 +187,47 @@ class ControlShell(cmd.Cmd):
         """
         self.send_command(ShowBalanceCommand, arg)
 
+    def do_mailbox(self, arg):
+        """
+        show queue depth and conflation counters of broker mailbox
+        :param arg:
+        :return:
+        example: mailbox
+        """
+        self.send_command(ShowMailboxCommand, arg)
+
+    def do_trace(self, arg):
+        """
+        latency tracing from gateway receive to gateway send, shows per stage histograms without argument
+        :param arg: on/off/reset/dump [file name]
+        :return:
+        example: trace on
+                 trace
+                 trace dump trace.json
+        """
+        self.send_command(TraceCommand, arg)
+
+    def do_profile(self, arg):
+        """
+        wall time per (topic, handler) notified by the broker, shows the slowest handlers without argument
+        :param arg: on/off/reset or the number of handlers to show
+        :return:
+        example: profile on
+                 profile
+                 profile 50
+        """
+        self.send_command(ProfileCommand, arg)
+
+    def do_gc(self, arg):
+        """
+        pause per gc generation and object pool counters, gc monitoring is on once configured
+        :param arg: on/off/reset/freeze
+        :return:
+        example: gc
+                 gc freeze
+        """
+        self.send_command(GcCommand, arg)
+
     def do_add_strategy(self, arg):
         """
         :param arg:
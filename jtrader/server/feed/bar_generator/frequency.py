@@ -2,8 +2,7 @@
 # -*- coding: utf-8 -*-
 
 from jtrader.core.common.log import logger
-from jtrader.datatype import BarData
-import copy
+from jtrader.datatype import BarData, NS_PER_MINUTE, floor_ns
 import pandas as pd
 
 
@@ -23,15 +22,16 @@ class FrequencyBarGenerator(object):
     def update_bar(self, bar: BarData):
         logger.debug('%s get bar %s', self, bar)
         if not self._n_min_bar:
-            self._n_min_bar = copy.copy(bar)
-            self._n_min_bar.datetime.replace(second=0, microsecond=0)
-            self._n_min_bar.freq = self._freq
+            self._n_min_bar = bar.evolve()
+            self._n_min_bar.timestamp = floor_ns(bar.timestamp, NS_PER_MINUTE)
+            self._n_min_bar.frequency = self._freq
         else:
             self._n_min_bar.close = bar.close
             self._n_min_bar.high = max(self._n_min_bar.high, bar.high)
             self._n_min_bar.low = min(self._n_min_bar.low, bar.low)
             self._n_min_bar.volume += bar.volume
 
-        if not (bar.datetime.minute + 1) % self._n_min:
+        # closed with the last minute of the n minutes window, windows counted from the epoch
+        if not (bar.timestamp // NS_PER_MINUTE + 1) % self._n_min:
             self._on_bar_func(self._n_min_bar)
             self._n_min_bar = None
@@ -3,8 +3,7 @@
 
 
 from jtrader.core.common.log import logger
-from jtrader.datatype import BarData
-import copy
+from jtrader.datatype import BarData, NS_PER_MINUTE, floor_ns
 import pandas as pd
 
 
@@ -22,8 +21,8 @@ class VolumeBarGenerator(object):
 
     def update_bar(self, bar: BarData):
         if not self._volume_bar:
-            self._volume_bar = copy.copy(bar)
-            self._volume_bar.datetime.replace(second=0, microsecond=0)
+            self._volume_bar = bar.evolve()
+            self._volume_bar.timestamp = floor_ns(bar.timestamp, NS_PER_MINUTE)
             # self._volume_bar.frequency = ''
         else:
             self._volume_bar.close = bar.close
@@ -6,33 +6,37 @@ from jtrader.core.common import Singleton, Subject
 from jtrader.datatype import *
 from jtrader.server.feed.line import KLineManager
 
-import typing
-
 
 class FeedServer(object, metaclass=Singleton):
 
-    def __init__(self, size=100):
+    def __init__(self, size=100, read_only=False):
         self._subject: Subject = None
         self._size = size
-        self._kline_dict: typing.Dict[typing.Tuple[str, str], KLineManager] = {}
+        # frames of the klines are shared by every strategy reading them
+        self._read_only = read_only
+        # symbol id -> frequency -> kline
+        self._kline_table: SymbolTable = SymbolTable(dict)
 
     def set_subject(self, subject):
         self._subject = subject
         self._subject.register(EnumEventType.BAR, self._on_bar)
 
     def get_kline(self, symbol, frequency):
-        key = (symbol, frequency)
-        if key not in self._kline_dict:
-            kline = KLineManager(self._size)
-            self._kline_dict[key] = kline
-        return self._kline_dict[key]
+        return self._get_kline(SYMBOL_REGISTRY.intern(symbol), frequency)
+
+    def _get_kline(self, symbol_id, frequency):
+        kline_dict = self._kline_table[symbol_id]
+        if frequency not in kline_dict:
+            kline = KLineManager(self._size, self._read_only)
+            kline_dict[frequency] = kline
+        return kline_dict[frequency]
 
     def _on_bar(self, bar: BarData):
-        kline = self.get_kline(bar.symbol, bar.frequency)
+        kline = self._get_kline(bar.symbol_id, bar.frequency)
         kline.on_bar(bar)
 
     def clear(self):
-        self._kline_dict.clear()
+        self._kline_table.clear()
 
     def get_cubic_data(self, symbol_list, frequency):
         kline_dict = {}
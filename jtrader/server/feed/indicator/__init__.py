@@ -1,5 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from .indicator import Indicator
-from .sma import SMA
+from .indicator import Indicator, StreamingIndicator
+from .sma import SMA, EMA
+from .variance import Variance, StdDev
+from .rsi import RSI
+from .atr import ATR
+from .macd import MACD
+from .extremum import RollingMax, RollingMin
+from .max_drawback import MaxDrawback, MaxGain
 
+from .graph import IndicatorGraph
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from jtrader.server.feed.indicator.indicator import StreamingIndicator
+from jtrader.server.feed.line import Line
+
+
+class ATR(StreamingIndicator):
+    """
+    Average true range of high, low and close lines as talib.ATR: mean of the first time_window true ranges,
+    then Wilder's smoothing. Values are folded once the three lines reached the same time.
+    """
+
+    def __init__(self, high: Line, low: Line, close: Line, time_window: int, period=10):
+        super(ATR, self).__init__([high, low, close], time_window, period)
+        self._last_close = None
+        self._atr = 0.0
+        self._count = 0
+
+    def _on_values(self, high, low, close):
+        last_close = self._last_close
+        self._last_close = close
+        if last_close is None:
+            return None
+        true_range = max(high - low, abs(high - last_close), abs(low - last_close))
+
+        n = self._time_window
+        if self._count < n:
+            # sum of the first true ranges, then their mean
+            self._count += 1
+            self._atr += true_range
+            if self._count < n:
+                return None
+            self._atr /= n
+        else:
+            self._atr = (self._atr * (n - 1) + true_range) / n
+        return self._atr
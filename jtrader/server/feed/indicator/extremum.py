@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from jtrader.server.feed.indicator.indicator import StreamingIndicator
+from jtrader.server.feed.line import Line
+from collections import deque
+
+
+class RollingMax(StreamingIndicator):
+    """
+    Highest of the last time_window values as talib.MAX, a monotonic deque of (count, value) pairs: values
+    are only kept while no later value is at least as high, each one is pushed and popped once.
+    """
+
+    def __init__(self, line: Line, time_window: int, period=10):
+        super(RollingMax, self).__init__([line], time_window, period)
+        self._line = line
+        self._deque = deque()
+        self._count = 0
+
+    def __repr__(self):
+        return '%s(time_window=%d, line=%s)' % (
+            self.__class__.__name__, self._time_window, self._line
+        )
+
+    def _dominates(self, kept, value):
+        # True when value makes kept useless
+        return kept <= value
+
+    def _on_values(self, value):
+        candidates = self._deque
+        dominates = self._dominates
+        while candidates and dominates(candidates[-1][1], value):
+            candidates.pop()
+        candidates.append((self._count, value))
+        self._count += 1
+        if candidates[0][0] <= self._count - 1 - self._time_window:
+            candidates.popleft()
+        if self._count < self._time_window:
+            return None
+        return candidates[0][1]
+
+
+class RollingMin(RollingMax):
+    """
+    Lowest of the last time_window values as talib.MIN.
+    """
+
+    def _dominates(self, kept, value):
+        return kept >= value
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from jtrader.server.feed.indicator.indicator import Indicator, StreamingIndicator
+from jtrader.server.feed.line import Line
+from jtrader.core.common.metrics import Histogram
+
+from contextlib import contextmanager
+import typing
+import time
+
+
+class _SourceObserver(object):
+    # observer of an input line of the graph, appends to it are ticks
+
+    def __init__(self, graph, source):
+        self._graph = graph
+        self._source = source
+
+    def update(self):
+        self._graph._on_source(self._source)
+
+
+class IndicatorGraph(object):
+    """
+    Runtime of the DAG of indicators feeding some output indicators, instead of their recursive
+    notify/update calls.
+
+    Nodes are sorted once in dependency order. An append to one of the input lines (the lines that are not
+    indicators) is a tick: every node depending on it is marked dirty, then eager nodes, and the lazy nodes
+    they depend on, are computed in dependency order, each exactly once, however many paths lead to it.
+    Lazy nodes nothing eager depends on stay dirty until read: reading their values computes them and their
+    dirty dependencies, once. Streaming indicators fold every value and are always eager, laziness fits
+    indicators recomputed from the windows of their lines. Ticks of several lines appended together can be
+    merged with ``batch``.
+
+    With ``profile`` the compute time of every node is kept, see ``report``.
+    """
+
+    def __init__(self, outputs: typing.Iterable[Indicator], lazy: typing.Iterable[Indicator] = (), profile=False):
+        super(IndicatorGraph, self).__init__()
+        self.profile = profile
+        self._nodes: typing.List[Indicator] = self._sort(list(outputs))
+        self._index = {node: index for index, node in enumerate(self._nodes)}
+        self._lazy = [False] * len(self._nodes)
+        self._sources: typing.List[Line] = []
+        # per source, indices of the nodes depending on it; per node, indices of the nodes it depends on and
+        # itself, both in dependency order
+        self._downstream: typing.Dict[Line, typing.List[int]] = {}
+        self._upstream: typing.List[typing.List[int]] = []
+        self._source_observers = []
+        self._dirty = set()
+        self._held = 0
+        self._histogram_list = [Histogram() for _ in self._nodes]
+
+        for index, node in enumerate(self._nodes):
+            upstream = {index}
+            for line in node._lines:
+                if line in self._index:
+                    upstream.update(self._upstream[self._index[line]])
+                elif line not in self._downstream:
+                    self._sources.append(line)
+                    self._downstream[line] = []
+            self._upstream.append(sorted(upstream))
+        for source in self._sources:
+            self._downstream[source] = [
+                index for index, node in enumerate(self._nodes) if self._depends_on(index, source)
+            ]
+        for node in lazy:
+            self._set_lazy(node, True)
+        self._update_needed()
+        # computed through the graph from now on
+        for node in self._nodes:
+            for line in node._lines:
+                line.unregister(node)
+            node._graph = self
+        for source in self._sources:
+            observer = _SourceObserver(self, source)
+            source.register(observer)
+            self._source_observers.append((source, observer))
+
+    def __repr__(self):
+        return '%s(%d nodes, %d sources)' % (self.__class__.__name__, len(self._nodes), len(self._sources))
+
+    def __len__(self):
+        return len(self._nodes)
+
+    @property
+    def nodes(self) -> typing.List[Indicator]:
+        return list(self._nodes)
+
+    @staticmethod
+    def _sort(outputs):
+        # every indicator upstream of the outputs, dependencies first (Kahn's algorithm)
+        node_list = []
+        stack = list(outputs)
+        while stack:
+            node = stack.pop()
+            if node in node_list:
+                continue
+            node_list.append(node)
+            stack.extend(line for line in node._lines if isinstance(line, Indicator))
+        n_inputs = {node: sum(line in node_list for line in node._lines) for node in node_list}
+        ready = [node for node in node_list if not n_inputs[node]]
+        order = []
+        while ready:
+            node = ready.pop(0)
+            order.append(node)
+            for other in node_list:
+                if node in other._lines:
+                    n_inputs[other] -= 1
+                    if not n_inputs[other]:
+                        ready.append(other)
+        if len(order) != len(node_list):
+            raise ValueError('Indicators depend on each other in a cycle')
+        return order
+
+    def _depends_on(self, index, source):
+        return any(source in self._nodes[upstream]._lines for upstream in self._upstream[index])
+
+    def _update_needed(self):
+        # nodes computed at every tick: eager ones and what they depend on
+        needed = [False] * len(self._nodes)
+        for index, lazy in enumerate(self._lazy):
+            if not lazy:
+                for upstream in self._upstream[index]:
+                    needed[upstream] = True
+        self._needed = needed
+
+    def _set_lazy(self, node, lazy):
+        if lazy and isinstance(node, StreamingIndicator):
+            raise ValueError('%s folds every value, it can not be lazy' % node)
+        self._lazy[self._index[node]] = lazy
+
+    def set_lazy(self, node: Indicator, lazy=True):
+        self._set_lazy(node, lazy)
+        self._update_needed()
+
+    def is_lazy(self, node: Indicator) -> bool:
+        return self._lazy[self._index[node]]
+
+    def _on_source(self, source):
+        dirty = self._dirty
+        nodes = self._nodes
+        for index in self._downstream[source]:
+            dirty.add(index)
+            nodes[index]._calculated = False
+        if not self._held:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """
+        Appends to input lines within the block are one tick, nodes are computed when it exits.
+        """
+        self._held += 1
+        try:
+            yield self
+        finally:
+            self._held -= 1
+            if not self._held:
+                self.flush()
+
+    def flush(self):
+        """
+        Compute the dirty eager nodes, and what they depend on, in dependency order.
+        """
+        needed = self._needed
+        while True:
+            pending = sorted(index for index in self._dirty if needed[index])
+            if not pending:
+                break
+            for index in pending:
+                if index in self._dirty:
+                    self._compute(index)
+
+    def pull(self, node: Indicator):
+        """
+        Compute a node and its dirty dependencies, in dependency order; Indicator.compute of the nodes.
+        """
+        dirty = self._dirty
+        for index in self._upstream[self._index[node]]:
+            if index in dirty:
+                self._compute(index)
+
+    def _compute(self, index):
+        node = self._nodes[index]
+        # clean first, the node may read its own values
+        self._dirty.discard(index)
+        node._calculated = True
+        if self.profile:
+            start = time.perf_counter_ns()
+            node._perform_computations()
+            self._histogram_list[index].record(time.perf_counter_ns() - start)
+        else:
+            node._perform_computations()
+
+    def reset(self):
+        self._histogram_list = [Histogram() for _ in self._nodes]
+
+    def report(self) -> list:
+        """
+        Rows of node, mode, count, total_ms, mean_us and p99_us of the profiled computations, in dependency
+        order.
+        """
+        return [{
+            'node': repr(node),
+            'mode': 'lazy' if self._lazy[index] else 'eager',
+            'count': histogram.count,
+            'total_ms': histogram.total / 1e6,
+            'mean_us': histogram.mean / 1e3,
+            'p99_us': histogram.percentile(99) / 1e3,
+        } for index, (node, histogram) in enumerate(zip(self._nodes, self._histogram_list))]
+
+    def close(self):
+        """
+        Hand the nodes back to their notify/update calls.
+        """
+        for source, observer in self._source_observers:
+            source.unregister(observer)
+        self._source_observers = []
+        for node in self._nodes:
+            node._graph = None
+            for line in node._lines:
+                line.register(node)
@@ -4,6 +4,8 @@ from jtrader.server.feed.line import Line
 
 
 class Indicator(Line):
+    # IndicatorGraph computing the indicator, if any
+    _graph = None
 
     def __init__(self, period):
         super(Indicator, self).__init__(period)
@@ -28,7 +30,60 @@ class Indicator(Line):
         raise NotImplementedError('Please implement method _perform_computations')
 
     def compute(self):
+        if self._graph is not None:
+            self._graph.pull(self)
+            return
         if not self.calculated:
             for line in self._lines:
                 line.compute()
         super(Indicator, self).compute()
+
+
+class StreamingIndicator(Indicator):
+    """
+    Indicator folding each new value of its input lines into running state, O(1) per update whatever the
+    time window: ``_on_values`` takes the latest value of every input line and returns the new output, None
+    while the indicator warms up. Lines are folded once per time, when they have all reached it.
+    """
+
+    def __init__(self, lines, time_window: int, period=10):
+        super(StreamingIndicator, self).__init__(period)
+        self._time_window = time_window
+        # last time folded, compute may run again for the same values
+        self._time = None
+        self.add_lines(lines)
+
+    def __repr__(self):
+        return '%s(time_window=%d, line=%s)' % (
+            self.__class__.__name__, self._time_window, ', '.join(repr(line) for line in self._lines)
+        )
+
+    def update(self):
+        super(StreamingIndicator, self).update()
+        self._perform_computations()
+
+    def _perform_computations(self):
+        lines = self._lines
+        last = lines[0].last
+        if last is None:
+            return
+        t = last[0]
+        if t == self._time:
+            return
+        if len(lines) == 1:
+            self._time = t
+            value = self._on_values(last[1])
+        else:
+            values = [last[1]]
+            for line in lines[1:]:
+                last = line.last
+                if last is None or last[0] != t:
+                    return
+                values.append(last[1])
+            self._time = t
+            value = self._on_values(*values)
+        if value is not None:
+            self.append((t, value))
+
+    def _on_values(self, *values):
+        raise NotImplementedError('Please implement method _on_values')
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from jtrader.server.feed.indicator.indicator import StreamingIndicator
+from jtrader.server.feed.indicator.sma import _ExponentialMean
+from jtrader.server.feed.line import Line
+
+
+class MACD(StreamingIndicator):
+    """
+    MACD of a line as talib.MACD, the difference of a fast and a slow EMA, both starting with the slow one.
+    The indicator holds the MACD values from the first time the signal EMA of them is known, ``signal`` and
+    ``hist`` are lines of the signal and of the difference of the two.
+    """
+
+    def __init__(self, line: Line, fast_period=12, slow_period=26, signal_period=9, period=10):
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+        super(MACD, self).__init__([line], slow_period, period)
+        self._line = line
+        self._fast_period = fast_period
+        self._signal_period = signal_period
+        self._fast_ema = _ExponentialMean(fast_period)
+        self._slow_ema = _ExponentialMean(slow_period)
+        self._signal_ema = _ExponentialMean(signal_period)
+        self._count = 0
+        self.signal = Line(period)
+        self.hist = Line(period)
+
+    def __repr__(self):
+        return '%s(fast_period=%d, slow_period=%d, signal_period=%d, line=%s)' % (
+            self.__class__.__name__, self._fast_period, self._time_window, self._signal_period, self._line
+        )
+
+    def _on_values(self, value):
+        self._count += 1
+        slow = self._slow_ema.update(value)
+        # the fast EMA starts from the mean of the fast_period values up to the first slow EMA
+        if self._count <= self._time_window - self._fast_period:
+            return None
+        fast = self._fast_ema.update(value)
+        if slow is None:
+            return None
+        macd = fast - slow
+        signal = self._signal_ema.update(macd)
+        if signal is None:
+            return None
+        t = self._line.last[0]
+        self.signal.append((t, signal))
+        self.hist.append((t, macd - signal))
+        return macd
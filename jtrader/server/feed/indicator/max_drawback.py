@@ -1,48 +1,94 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from jtrader.server.feed.indicator.indicator import Indicator
+from jtrader.server.feed.indicator.indicator import StreamingIndicator
 from jtrader.server.feed.line import Line
-import numpy as np
 
 
-class MaxDrawback(Indicator):
+def _combine(older, newer):
+    # (highest, lowest, largest drawdown, largest run up) of two consecutive runs of positive values: values
+    # of the newer run fall from the peak of the older one, or rise from its trough
+    return (
+        max(older[0], newer[0]),
+        min(older[1], newer[1]),
+        min(older[2], newer[2], newer[1] / older[0] - 1.0),
+        max(older[3], newer[3], newer[0] / older[1] - 1.0),
+    )
+
+
+class _RunWindow(object):
+    """
+    Sliding window of values aggregated with _combine in amortized O(1), as a queue of two stacks: values are
+    pushed on the back stack with the aggregate of that stack, and moved once, newest first, to the front
+    stack with the aggregate of each value up to the end of the front stack.
+    """
+
+    def __init__(self):
+        self._front = []
+        self._back = []
+        self._back_run = None
+
+    def __len__(self):
+        return len(self._front) + len(self._back)
+
+    def push(self, value):
+        run = (value, value, 0.0, 0.0)
+        self._back.append(value)
+        self._back_run = run if self._back_run is None else _combine(self._back_run, run)
+
+    def pop(self):
+        if not self._front:
+            run = None
+            for value in reversed(self._back):
+                single = (value, value, 0.0, 0.0)
+                run = single if run is None else _combine(single, run)
+                self._front.append(run)
+            self._back.clear()
+            self._back_run = None
+        self._front.pop()
+
+    def run(self):
+        if not self._front:
+            return self._back_run
+        if self._back_run is None:
+            return self._front[-1]
+        return _combine(self._front[-1], self._back_run)
+
+
+class MaxDrawback(StreamingIndicator):
+    """
+    Largest drawdown of a line of positive values over the last time_window values, the lowest
+    (value - peak) / peak with peaks counted from the start of the window.
+    """
+
     def __init__(self, line: Line, time_window: int, period=10):
-        super(MaxDrawback, self).__init__(period)
+        super(MaxDrawback, self).__init__([line], time_window, period)
         self._line = line
-        self._time_window = time_window
-        self.add_lines([line])
+        self._window = _RunWindow()
 
     def __repr__(self):
         return '%s(time_window=%d, line=%s)' % (
             self.__class__.__name__, self._time_window, self._line
         )
 
-    def update(self):
-        super(MaxDrawback, self).update()
-        self._perform_computations()
+    def _on_values(self, value):
+        window = self._window
+        window.push(value)
+        if len(window) > self._time_window:
+            window.pop()
+        if len(window) < self._time_window:
+            return None
+        return self._from_run(window.run())
 
-    def _perform_computations(self):
-        if len(self._line) < self._time_window:
-            pass
-        else:
-            array = self._line.values[-self._time_window:]
-            max_array = np.fmax.accumulate(array)
-            draw_down = (array - max_array) / max_array
-            md = min(draw_down)
-            t = self._line.times[-1]
-            self.append((t, md))
+    def _from_run(self, run):
+        return run[2]
 
 
 class MaxGain(MaxDrawback):
+    """
+    Largest run up of a line of positive values over the last time_window values, the highest
+    (value - trough) / trough with troughs counted from the start of the window.
+    """
 
-    def _perform_computations(self):
-        if len(self._line) < self._time_window:
-            pass
-        else:
-            array = self._line.values[-self._time_window:]
-            max_array = np.fmax.accumulate(array)
-            draw_down = (array - max_array) / max_array
-            md = max(draw_down)
-            t = self._line.times[-1]
-            self.append((t, md))
+    def _from_run(self, run):
+        return run[3]
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from jtrader.server.feed.indicator.indicator import StreamingIndicator
+from jtrader.server.feed.line import Line
+
+
+class RSI(StreamingIndicator):
+    """
+    Relative strength index as talib.RSI: mean gain and loss of the first time_window changes, then Wilder's
+    smoothing, mean = (mean * (time_window - 1) + change) / time_window.
+    """
+
+    def __init__(self, line: Line, time_window: int, period=10):
+        super(RSI, self).__init__([line], time_window, period)
+        self._line = line
+        self._last_value = None
+        self._gain = 0.0
+        self._loss = 0.0
+        self._count = 0
+
+    def __repr__(self):
+        return '%s(time_window=%d, line=%s)' % (
+            self.__class__.__name__, self._time_window, self._line
+        )
+
+    def _on_values(self, value):
+        last_value = self._last_value
+        self._last_value = value
+        if last_value is None:
+            return None
+        change = value - last_value
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        n = self._time_window
+        if self._count < n:
+            # sums of the first changes, then their means
+            self._count += 1
+            self._gain += gain
+            self._loss += loss
+            if self._count < n:
+                return None
+            self._gain /= n
+            self._loss /= n
+        else:
+            self._gain = (self._gain * (n - 1) + gain) / n
+            self._loss = (self._loss * (n - 1) + loss) / n
+
+        total = self._gain + self._loss
+        if total == 0:
+            return 0.0
+        return 100.0 * self._gain / total
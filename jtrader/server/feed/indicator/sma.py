@@ -1,31 +1,82 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from jtrader.server.feed.indicator.indicator import Indicator
+from jtrader.server.feed.indicator.indicator import StreamingIndicator
 from jtrader.server.feed.line import Line
-import numpy as np
+from collections import deque
+import math
 
 
-class SMA(Indicator):
+class SMA(StreamingIndicator):
+    """
+    Mean of the last time_window values, a running sum of the window; the sum is recomputed exactly once
+    per time_window values, so rounding errors do not pile up.
+    """
+
     def __init__(self, line: Line, time_window: int, period=10):
-        super(SMA, self).__init__(period)
+        super(SMA, self).__init__([line], time_window, period)
         self._line = line
-        self._time_window = time_window
-        self.add_lines([line])
+        self._window = deque(maxlen=time_window)
+        self._sum = 0.0
+        self._count = 0
 
     def __repr__(self):
         return '%s(time_window=%d, line=%s)' % (
             self.__class__.__name__, self._time_window, self._line
         )
 
-    def update(self):
-        super(SMA, self).update()
-        self._perform_computations()
+    def _on_values(self, value):
+        window = self._window
+        if len(window) == self._time_window:
+            self._sum -= window[0]
+        window.append(value)
+        self._sum += value
+        self._count += 1
+        if not self._count % self._time_window:
+            self._sum = math.fsum(window)
+        if len(window) < self._time_window:
+            return None
+        return self._sum / self._time_window
+
+
+class _ExponentialMean(object):
+    # running state of EMA, MACD keeps three of them
+    __slots__ = ('time_window', 'alpha', 'ema', '_sum', '_count')
+
+    def __init__(self, time_window):
+        self.time_window = time_window
+        self.alpha = 2.0 / (time_window + 1)
+        self.ema = None
+        self._sum = 0.0
+        self._count = 0
 
-    def _perform_computations(self):
-        if len(self._line) < self._time_window:
-            pass
+    def update(self, value):
+        if self.ema is None:
+            self._sum += value
+            self._count += 1
+            if self._count < self.time_window:
+                return None
+            self.ema = self._sum / self.time_window
         else:
-            ma = np.mean(list(self._line.values)[-self._time_window:])
-            t = self._line.times[-1]
-            self.append((t, ma))
+            self.ema += self.alpha * (value - self.ema)
+        return self.ema
+
+
+class EMA(StreamingIndicator):
+    """
+    Exponential mean with a smoothing of 2 / (time_window + 1), started from the mean of the first
+    time_window values as talib.EMA.
+    """
+
+    def __init__(self, line: Line, time_window: int, period=10):
+        super(EMA, self).__init__([line], time_window, period)
+        self._line = line
+        self._ema = _ExponentialMean(time_window)
+
+    def __repr__(self):
+        return '%s(time_window=%d, line=%s)' % (
+            self.__class__.__name__, self._time_window, self._line
+        )
+
+    def _on_values(self, value):
+        return self._ema.update(value)
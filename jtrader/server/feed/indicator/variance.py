@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from jtrader.server.feed.indicator.indicator import StreamingIndicator
+from jtrader.server.feed.line import Line
+from collections import deque
+import math
+
+
+class Variance(StreamingIndicator):
+    """
+    Population variance of the last time_window values as talib.VAR, Welford's update with the oldest value
+    of the window taken out as the new one comes in. Mean and sum of squares are recomputed exactly once per
+    time_window values.
+    """
+
+    def __init__(self, line: Line, time_window: int, period=10):
+        super(Variance, self).__init__([line], time_window, period)
+        self._line = line
+        self._window = deque(maxlen=time_window)
+        self._mean = 0.0
+        # sum of the squared deviations from the mean
+        self._m2 = 0.0
+        self._count = 0
+
+    def __repr__(self):
+        return '%s(time_window=%d, line=%s)' % (
+            self.__class__.__name__, self._time_window, self._line
+        )
+
+    def _on_values(self, value):
+        window = self._window
+        n = self._time_window
+        if len(window) == n:
+            old = window[0]
+            window.append(value)
+            mean = self._mean + (value - old) / n
+            self._m2 += (value - old) * (value - mean + old - self._mean)
+            self._mean = mean
+        else:
+            window.append(value)
+            delta = value - self._mean
+            self._mean += delta / len(window)
+            self._m2 += delta * (value - self._mean)
+        self._count += 1
+        if not self._count % n:
+            mean = self._mean = math.fsum(window) / n
+            self._m2 = math.fsum((x - mean) * (x - mean) for x in window)
+        if len(window) < n:
+            return None
+        return max(self._m2, 0.0) / n
+
+
+class StdDev(Variance):
+    """
+    Population standard deviation of the last time_window values as talib.STDDEV.
+    """
+
+    def _on_values(self, value):
+        variance = super(StdDev, self)._on_values(value)
+        if variance is None:
+            return None
+        return math.sqrt(variance)
@@ -2,12 +2,20 @@
 # -*- coding: utf-8 -*-
 from jtrader.core.common.template import LazyObject
 
-from collections import deque
 import numpy as np
 import pandas as pd
 
 
 class Line(LazyObject):
+    """
+    Float values with their int64 times (timestamps or counts), the last ``period`` of them in numpy ring
+    buffers, or all of them in buffers grown by doubling when period is None.
+
+    Items are appended at the end of the buffers, bounded lines have room for 2 * period items and move their
+    last items back to the start once full, so that items always sit contiguously: appending (amortized) and
+    updating the last value are O(1), and ``values``, ``times``, ``to_array`` and ``tail`` are views of the
+    buffers, valid until the next append.
+    """
 
     def __repr__(self):
         return "%s()" % (
@@ -17,26 +25,49 @@ class Line(LazyObject):
     def __init__(self, period=None):
         super(Line, self).__init__()
         self._period = period
-        self._values = deque(maxlen=self._period)
-        self._times = deque(maxlen=self._period)
+        capacity = 2 * period if period else 16
+        self._values = np.zeros(capacity)
+        self._times = np.zeros(capacity, dtype=np.int64)
+        # items appended, bounded lines keep the last period of them
+        self._appended = 0
+        # end of the items in the buffers
+        self._end = 0
+        # the last item as appended
+        self._last = None
 
     def to_array(self):
-        return np.array(self.values)
+        return self.values
 
     def to_series(self):
-        return pd.Series(self._values, index=self._times)
+        # copies, the buffers move on
+        return pd.Series(self.values.copy(), index=self.times.copy())
 
     def __len__(self):
-        return len(self.values)
+        return min(self._appended, self._period) if self._period else self._appended
 
     def append(self, item):
         t, v = item
-        if len(self._times) and t == self._times[-1]:
-            self._times[-1] = t
-            self._values[-1] = v
+        if self._last is not None and t == self._last[0]:
+            self._last = item
+            self._values[self._end - 1] = v
         else:
-            self._times.append(t)
-            self._values.append(v)
+            self._last = item
+            end = self._end
+            if end == len(self._values):
+                period = self._period
+                if period:
+                    # the last period - 1 items back to the start, once every period + 1 appends
+                    kept = period - 1
+                    self._values[:kept] = self._values[end - kept:end]
+                    self._times[:kept] = self._times[end - kept:end]
+                    end = kept
+                else:
+                    self._values = np.concatenate([self._values, np.zeros(end)])
+                    self._times = np.concatenate([self._times, np.zeros(end, dtype=np.int64)])
+            self._values[end] = v
+            self._times[end] = t
+            self._end = end + 1
+            self._appended += 1
             self.notify()
 
     @property
@@ -47,18 +78,32 @@ class Line(LazyObject):
     def values(self):
         if not self.calculated:
             self.compute()
-            return self.values
-        else:
-            return self._values
+        return self._values[self._end - len(self):self._end]
 
     @property
     def times(self):
         if not self.calculated:
             self.compute()
-            return self.times
-        else:
-            return self._times
-    
+        return self._times[self._end - len(self):self._end]
+
+    @property
+    def last(self):
+        """
+        The last (time, value) appended, None for an empty line.
+        """
+        if not self.calculated:
+            self.compute()
+        return self._last
+
+    def tail(self, k):
+        """
+        View of the last k values at most, without the rest of the line.
+        """
+        if not self.calculated:
+            self.compute()
+        return self._values[self._end - min(k, len(self)):self._end]
+
     def clear(self):
-        self._times.clear()
-        self._values.clear()
\ No newline at end of file
+        self._appended = 0
+        self._end = 0
+        self._last = None
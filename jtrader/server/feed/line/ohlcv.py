@@ -3,7 +3,6 @@
 from jtrader.datatype import BarData
 import numpy as np
 import pandas as pd
-from collections import deque
 
 try:
     import talib
@@ -12,79 +11,133 @@ except ImportError:
 
 
 class KLineManager(object):
-
-    def __init__(self, size=100):
+    """
+    The last ``size`` bars of a symbol and frequency as numpy arrays, oldest first, zeros before the first bars.
+
+    Bars go into ring buffers of twice the size, each bar written at its slot in both halves, so that the
+    last ``size`` bars always sit contiguously in the buffer: appending is O(1) and ``open``, ``high``, ``low``,
+    ``close``, ``volume`` and ``time`` are views into the buffers, sliced when read. Views are only valid
+    until the next bar, copy them to keep them.
+
+    ``to_df`` caches its frame until the next bar. Frames are built from buffers of 2 * size rows, to which
+    each refresh only appends the bars received since the last one. With ``read_only`` the frame is a
+    non-writable view of these buffers, no copy is made; otherwise it holds a copy of its values, so writes
+    to it stay in it.
+    """
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, size=100, read_only=False):
         self.count = 0
         self.size = size
         self.inited = False
-
-        self._open_array = np.zeros(size)
-        self._high_array = np.zeros(size)
-        self._low_array = np.zeros(size)
-        self._close_array = np.zeros(size)
-        self._volume_array = np.zeros(size)
-        self._time_deque = deque(maxlen=size)
-        self._bar_df = pd.DataFrame(
-            0.0,
-            index=pd.date_range('2010-01-01', periods=size),
-            columns=['open', 'high', 'low', 'close', 'volume']
-        )
+        self.read_only = read_only
+
+        # one row per field, rows are contiguous for talib
+        self._buffer = np.zeros((len(self.FIELDS), 2 * size))
+        self._open_buffer, self._high_buffer, self._low_buffer, self._close_buffer, self._volume_buffer = \
+            self._buffer
+        self._time_buffer = np.zeros(2 * size, dtype=np.int64)
+        self._last_timestamp = None
+        # start of the views, the slot after the last bar
+        self._start = 0
+        # frame of to_df and the count of bars it holds
+        self._bar_df: pd.DataFrame = None
+        self._df_count = 0
+        self._columns = pd.Index(self.FIELDS)
+        # buffers the frames view, bars are appended up to their end then new ones are allocated
+        self._frame_buffer: np.ndarray = None
+        self._frame_time_buffer: np.ndarray = None
+        self._frame_end = 0
 
     def on_bar(self, bar: BarData):
-        dt = bar.datetime
-        if len(self._time_deque) > 0 and dt <= self._time_deque[-1]:
+        timestamp = bar.timestamp
+        if self._last_timestamp is not None and timestamp <= self._last_timestamp:
             return
-
-        self._time_deque.append(dt)
-
-        self._open_array[:-1] = self._open_array[1:]
-        self._high_array[:-1] = self._high_array[1:]
-        self._low_array[:-1] = self._low_array[1:]
-        self._close_array[:-1] = self._close_array[1:]
-        self._volume_array[:-1] = self._volume_array[1:]
-
-        self._open_array[-1] = bar.open
-        self._high_array[-1] = bar.high
-        self._low_array[-1] = bar.low
-        self._close_array[-1] = bar.close
-        self._volume_array[-1] = bar.volume
-
-        if len(self._time_deque) >= self.size:
+        self._last_timestamp = timestamp
+
+        # scalar writes, cheaper than assigning a column of the buffer
+        slot = self.count % self.size
+        mirror = slot + self.size
+        self._open_buffer[slot] = self._open_buffer[mirror] = bar.open
+        self._high_buffer[slot] = self._high_buffer[mirror] = bar.high
+        self._low_buffer[slot] = self._low_buffer[mirror] = bar.low
+        self._close_buffer[slot] = self._close_buffer[mirror] = bar.close
+        self._volume_buffer[slot] = self._volume_buffer[mirror] = bar.volume
+        self._time_buffer[slot] = self._time_buffer[mirror] = timestamp
+        self._start = slot + 1
+        self.count += 1
+
+        if self.count >= self.size:
             self.inited = True
 
+    def _view(self, row):
+        start = self._start
+        return self._buffer[row, start:start + self.size]
+
     @property
     def open(self):
-        return self._open_array
+        return self._view(0)
 
     @property
     def high(self):
-        return self._high_array
+        return self._view(1)
 
     @property
     def low(self):
-        return self._low_array
+        return self._view(2)
 
     @property
     def close(self):
-        return self._close_array
+        return self._view(3)
 
     @property
     def volume(self):
-        return self._volume_array
+        return self._view(4)
 
     @property
     def time(self):
-        return self._time_deque
+        # bar timestamps, only those of bars received
+        start = self._start
+        return self._time_buffer[start + self.size - min(self.count, self.size):start + self.size]
+
+    def _append_frame(self):
+        size = self.size
+        n_new = min(self.count - self._df_count, size)
+        end = self._frame_end
+        if self._frame_buffer is None or end + n_new > 2 * size:
+            # rows of the last frame still in the window move to new buffers, frames of the old ones stay valid
+            frame_buffer = np.empty((len(self.FIELDS), 2 * size))
+            frame_time_buffer = np.empty(2 * size, dtype=np.int64)
+            kept = size - n_new
+            if kept:
+                frame_buffer[:, :kept] = self._frame_buffer[:, end - kept:end]
+                frame_time_buffer[:kept] = self._frame_time_buffer[end - kept:end]
+            self._frame_buffer = frame_buffer
+            self._frame_time_buffer = frame_time_buffer
+            end = kept
+        stop = self._start + size
+        self._frame_buffer[:, end:end + n_new] = self._buffer[:, stop - n_new:stop]
+        self._frame_time_buffer[end:end + n_new] = self._time_buffer[stop - n_new:stop]
+        self._frame_end = end + n_new
 
     def to_df(self):
         if not self.inited:
             raise RuntimeError('kline is not initialed yet')
-        self._bar_df['open'] = self.open
-        self._bar_df['high'] = self.high
-        self._bar_df['low'] = self.low
-        self._bar_df['close'] = self.close
-        self._bar_df['volume'] = self.volume
-        self._bar_df.index = list(self._time_deque)
+        if self._df_count != self.count:
+            self._append_frame()
+            end = self._frame_end
+            values = self._frame_buffer[:, end - self.size:end]
+            times = self._frame_time_buffer[end - self.size:end]
+            if self.read_only:
+                # on the view only, the buffer takes the next bars
+                values = values.view()
+                values.flags.writeable = False
+            else:
+                # later frames share the buffer, a writable frame gets its own values
+                values = values.copy()
+            self._bar_df = pd.DataFrame(values.T, index=pd.DatetimeIndex(times.view('datetime64[ns]'), copy=False),
+                                        columns=self._columns, copy=False)
+            self._df_count = self.count
         return self._bar_df
 
     def sma(self, n, array=False):
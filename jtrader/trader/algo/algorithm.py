@@ -15,7 +15,7 @@ class AlgorithmTemplate(TradingTemplate, Registered):
         self._target_order = order
         self._subject: BrokerInterface = BrokerInterface()
         self._sid = 0
-        self._datetime = order.datetime
+        self._timestamp = order.timestamp
         logger.info('New algorithm is added for order %s', order)
 
     @property
@@ -40,16 +40,16 @@ class AlgorithmTemplate(TradingTemplate, Registered):
             # }
             order.client_order_id = client_order_id
             self.target_order.order_id = client_order_id
-            self.subscribe(EnumEventType.ORDER + client_order_id, self.on_order_status)
-            self.subscribe(EnumEventType.TRADE + client_order_id, self.on_trade)
+            self.subscribe(EnumEventType.ORDER.composite(client_order_id), self.on_order_status)
+            self.subscribe(EnumEventType.TRADE.composite(client_order_id), self.on_trade)
             self._sid += 1
         return result
 
     def on_order_status(self, order: OrderData):
         super(AlgorithmTemplate, self).on_order_status(order)
         if order.is_closed():
-            self.unsubscribe(EnumEventType.ORDER + order.client_order_id, self.on_order_status)
-            self.unsubscribe(EnumEventType.TRADE + order.client_order_id, self.on_trade)
+            self.unsubscribe(EnumEventType.ORDER.composite(order.client_order_id), self.on_order_status)
+            self.unsubscribe(EnumEventType.TRADE.composite(order.client_order_id), self.on_trade)
 
     def on_trade(self, trade: TradeData):
         super(AlgorithmTemplate, self).on_trade(trade)
@@ -73,7 +73,7 @@ class AlgorithmTemplate(TradingTemplate, Registered):
         order = self._target_order
         if not order.is_closed():
             order.status = EnumOrderStatus.CANCELLED
-        self.broker.send(order)
+        self.broker.send(order.snapshot())
         self.detach()
         self.set_mode(EnumTradingMode.OFF)
 
@@ -1,6 +1,5 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-import pandas as pd
 from jtrader.trader.algo.algorithm import AlgorithmTemplate
 from jtrader.datatype import *
 from jtrader.core.common.log import logger
@@ -22,7 +21,7 @@ class BestLimitPriceAlgorithm(AlgorithmTemplate):
 
         self.duration = param_dict.get('duration', None)
         if self.duration is not None:
-            self._due_time = pd.to_timedelta(self.duration, unit='s') + order.datetime
+            self._due_time = order.timestamp + int(self.duration * NS_PER_SECOND)
 
     def _on_due(self):
         if self.due_action == EnumOrderStatus.NEW:
@@ -37,7 +36,7 @@ class BestLimitPriceAlgorithm(AlgorithmTemplate):
     def on_heartbeat(self, heartbeat: HeartBeatData):
         super(BestLimitPriceAlgorithm, self).on_heartbeat(heartbeat)
         if self._due_time is not None:
-            if heartbeat.datetime >= self._due_time:
+            if heartbeat.timestamp >= self._due_time:
                 if self._is_due:
                     return
                 self._is_due = True
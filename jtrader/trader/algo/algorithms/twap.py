@@ -3,7 +3,6 @@
 from jtrader.trader.algo.algorithm import AlgorithmTemplate
 from jtrader.datatype import *
 import pandas as pd
-import datetime
 
 
 class TWAPAlgorithm(AlgorithmTemplate):
@@ -14,7 +13,8 @@ class TWAPAlgorithm(AlgorithmTemplate):
         param_dict = order.parameter
         self.execute_interval = pd.to_timedelta(param_dict['execute_interval'])
         self.execute_times = param_dict['execute_times']
-        self._last_execute_time = datetime.datetime.fromtimestamp(0)
+        self._execute_interval_ns = self.execute_interval.value
+        self._last_execute_time = 0
         self._part_volume = self.target_order.volume / self.execute_times
         self._executed_times = 0
 
@@ -25,10 +25,10 @@ class TWAPAlgorithm(AlgorithmTemplate):
 
     def on_heartbeat(self, heartbeat: HeartBeatData):
         super(TWAPAlgorithm, self).on_heartbeat(heartbeat)
-        if self.datetime - self._last_execute_time > self.execute_interval:
+        if self.timestamp - self._last_execute_time > self._execute_interval_ns:
             if self._executed_times < self.execute_times:
                 self._executed_times += 1
-                self._last_execute_time = self.datetime
+                self._last_execute_time = self.timestamp
                 self._execute_part_order()
 
     def on_order_status(self, order: OrderData):
@@ -4,15 +4,18 @@ from jtrader.datatype import *
 from jtrader.core.common import Subscriber, logger
 from jtrader.broker import BrokerInterface
 import typing
-import copy
-import datetime
+import numpy as np
 
 
 class TradingTemplate(Subscriber):
 
     @property
     def datetime(self):
-        return self._datetime
+        return from_ns(self._timestamp)
+
+    @property
+    def timestamp(self):
+        return self._timestamp
 
     @property
     def trading_mode(self):
@@ -41,7 +44,7 @@ class TradingTemplate(Subscriber):
     def __init__(self):
         super(TradingTemplate, self).__init__()
         self._subject = BrokerInterface()
-        self._datetime = datetime.datetime.utcnow()
+        self._timestamp = now_ns()
         self._working_order_dict: typing.Dict[str, OrderData] = {}
         self._trading_mode = EnumTradingMode.OFF
 
@@ -69,14 +72,23 @@ class TradingTemplate(Subscriber):
         client_order_id = order.client_order_id
         status = order.status
         if client_order_id in self._working_order_dict:
-            self._working_order_dict[client_order_id].on_order(order)
+            working_order = self._working_order_dict[client_order_id]
+            if working_order.frozen:
+                # orders not created by this strategy are tracked by their latest snapshot
+                working_order = order
+            else:
+                working_order.on_order(order)
             if order.is_closed():
                 del self._working_order_dict[client_order_id]
-            elif status == EnumOrderStatus.CANCEL_ERROR:
-                order.status = EnumOrderStatus.PENDING
+            else:
+                if status == EnumOrderStatus.CANCEL_ERROR:
+                    # still alive in the exchange, it can be cancelled again
+                    working_order = working_order.evolve() if working_order.frozen else working_order
+                    working_order.status = EnumOrderStatus.PENDING
+                self._working_order_dict[client_order_id] = working_order
         else:
             if not order.is_closed():
-                self._working_order_dict[client_order_id] = copy.copy(order)
+                self._working_order_dict[client_order_id] = order
 
     def on_trade(self, trade: TradeData):
         pass
@@ -85,7 +97,7 @@ class TradingTemplate(Subscriber):
         pass
 
     def on_heartbeat(self, heartbeat: HeartBeatData):
-        self._datetime = heartbeat.datetime
+        self._timestamp = heartbeat.timestamp
 
     def choose_price(self, symbol: str, direction: EnumOrderDirection, price_level: int = 0):
         if price_level < 0:
@@ -144,8 +156,7 @@ class TradingTemplate(Subscriber):
                         client_order_id)
             return
 
-        cancel_req = copy.copy(working_order)
-        cancel_req.status = EnumOrderStatus.CANCELLING
+        cancel_req = working_order.evolve(status=EnumOrderStatus.CANCELLING)
         logger.debug('%s cancel order with client order id %s', self, client_order_id)
         self.broker.send_order(cancel_req)
 
@@ -165,8 +176,14 @@ class TradingTemplate(Subscriber):
 
     def check_notional(self, symbol, volume):
         price = self.choose_price(symbol, EnumOrderDirection.BUY, 0)
-        order = self._create_order_impl(symbol, price, volume)
-        return order.contract_check()
+        return not CONTRACTS.rule(symbol).validate_values(price, volume)
+
+    def check_notionals(self, symbol_list, volume_list) -> np.ndarray:
+        """
+        check_notional of many orders at once, a mask of the orders passing.
+        """
+        price_list = [self.choose_price(symbol, EnumOrderDirection.BUY, 0) for symbol in symbol_list]
+        return CONTRACTS.check_orders(symbol_list, price_list, volume_list).mask
 
     def _create_order_impl(self, symbol, price, volume,
                            direction=EnumOrderDirection.BUY,
@@ -180,7 +197,7 @@ class TradingTemplate(Subscriber):
         order.direction = direction
         order.order_type = order_type
         order.strategy_id = self.id_
-        order.datetime = self.datetime
+        order.timestamp = self._timestamp
         if requirement is not None:
             order.parameter = requirement
         return order
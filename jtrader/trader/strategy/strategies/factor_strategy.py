@@ -60,12 +60,21 @@ class FactorStrategy(StrategyTemplate):
         logger.info('{} plan to hold {}'.format(self, to_buy_set))
 
         available_cash = self.portfolio.get_cash_value()
+        sell_list = []
         for position in self.portfolio:
-            direction = EnumOrderDirection.SELL
-            symbol = position.symbol
             # volume = self.portfolio[symbol].amount
-            volume = self.portfolio.available_base_amount(symbol)
-            if volume > 0 and self.check_notional(symbol, volume):
+            volume = self.portfolio.available_base_amount(position.symbol)
+            if volume > 0:
+                sell_list.append((position, volume))
+        if sell_list:
+            # the whole basket checked at once
+            mask = self.check_notionals([position.symbol for position, _ in sell_list],
+                                        [volume for _, volume in sell_list])
+            direction = EnumOrderDirection.SELL
+            for (position, volume), passed in zip(sell_list, mask):
+                if not passed:
+                    continue
+                symbol = position.symbol
                 if symbol in to_buy_set:
                     to_buy_set.remove(symbol)
                 else:
@@ -76,11 +85,17 @@ class FactorStrategy(StrategyTemplate):
         if len(to_buy_set):
             value = available_cash / len(to_buy_set)
             direction = EnumOrderDirection.BUY
+            buy_list = []
             for symbol in to_buy_set:
                 price = self.choose_price(symbol, direction, self.price_level)
                 volume = value / price
-                if volume > 0 and self.check_notional(symbol, volume):
-                    self._trade(symbol, direction, volume)
+                if volume > 0:
+                    buy_list.append((symbol, volume))
+            if buy_list:
+                mask = self.check_notionals([symbol for symbol, _ in buy_list], [volume for _, volume in buy_list])
+                for (symbol, volume), passed in zip(buy_list, mask):
+                    if passed:
+                        self._trade(symbol, direction, volume)
 
     def _trade(self, symbol, direction, volume):
         price = self.choose_price(symbol, direction, 0)
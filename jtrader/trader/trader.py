@@ -10,24 +10,40 @@ from jtrader.trader.strategy import StrategyTemplate, StrategyConfigInfo, Strate
 from jtrader.trader.algo import AlgorithmEngine
 
 
+class _PortfolioPersister(object):
+    # heartbeat handler saving the portfolio of one strategy, its id_ keeps it on the shard of the strategy
+
+    def __init__(self, broker: Broker, strategy: StrategyTemplate):
+        super(_PortfolioPersister, self).__init__()
+        self._broker = broker
+        self._strategy = strategy
+
+    @property
+    def id_(self):
+        return self._strategy.id_
+
+    def __call__(self, heartbeat: HeartBeatData):
+        strategy = self._strategy
+        strategy.update_portfolio()
+        pnl = strategy.portfolio.pnl
+        pnl.timestamp = heartbeat.timestamp
+        self._broker.save_data(pnl)
+        for position in strategy.portfolio:
+            self._broker.save_data(position)
+        for balance in strategy.portfolio._balance_dict.values():
+            self._broker.save_data(balance)
+
+
 class Trader(object):
+    PERSIST_TOPIC = EnumEventType.HEARTBEAT + '30m'
+
     def __init__(self):
         super(Trader, self).__init__()
         self._broker: Broker = None
         self._strategy_dict: typing.Dict[str, StrategyTemplate] = {}
+        self._persister_dict: typing.Dict[str, _PortfolioPersister] = {}
         self._algorithm_engine = AlgorithmEngine()
 
-    def _persist_portfolio(self, heartbeat: HeartBeatData):
-        for id_, strategy in self.strategy_dict.items():
-            strategy.update_portfolio()
-            pnl = strategy.portfolio.pnl
-            pnl.datetime = heartbeat.datetime
-            self._broker.save_data(pnl)
-            for position in strategy.portfolio:
-                self._broker.save_data(position)
-            for balance in strategy.portfolio._balance_dict.values():
-                self._broker.save_data(balance)
-
     def configure(self, trader_config: dict):
         for strategy_config in trader_config['strategy']:
             strategy = self.create_strategy(strategy_config)
@@ -35,8 +51,6 @@ class Trader(object):
 
     def set_broker(self, broker: Broker):
         self._broker = broker
-        self._broker.register(EnumEventType.HEARTBEAT + '30m', self._persist_portfolio)
-
         self._algorithm_engine.set_broker(broker)
 
     def send_order(self, order: OrderData):
@@ -52,6 +66,8 @@ class Trader(object):
             self._strategy_dict[id_] = strategy
             strategy.attach_with(self._broker)
             strategy.algorithm_engine = self._algorithm_engine
+            persister = self._persister_dict[id_] = _PortfolioPersister(self._broker, strategy)
+            self._broker.register(self.PERSIST_TOPIC, persister)
             logger.info('%s was added to %s', strategy, self)
         else:
             logger.info('%s already exists in %s', strategy, self)
@@ -60,6 +76,7 @@ class Trader(object):
         if id_ in self._strategy_dict:
             strategy = self._strategy_dict[id_]
             strategy.detach()
+            self._broker.unregister(self.PERSIST_TOPIC, self._persister_dict.pop(id_))
             del self._strategy_dict[id_]
             logger.info('%s was removed from %s', strategy, self)
 